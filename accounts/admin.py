@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import IntegrationToken
+
+
+@admin.register(IntegrationToken)
+class IntegrationTokenAdmin(admin.ModelAdmin):
+    list_display = ["name", "scope", "prefix", "is_active", "last_used_at"]
+    readonly_fields = ["prefix", "created_at", "last_used_at", "created_by"]
+
+    def has_add_permission(self, request):
+        # Tokens are issued with `manage.py create_integration_token` so the secret is shown exactly once.
+        return False
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import IntegrationToken
+
+
+class Command(BaseCommand):
+    help = "Issue a bearer token for a machine client. The secret is printed once and only its hash is stored."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name")
+        parser.add_argument("--scope", choices=[choice for choice, _ in IntegrationToken.Scope.choices], default=IntegrationToken.Scope.DISCOVERY)
+
+    def handle(self, *args, **options):
+        token, raw = IntegrationToken.issue(name=options["name"], scope=options["scope"])
+        self.stdout.write(self.style.SUCCESS(f"Issued {token.get_scope_display()} token '{token.name}'"))
+        self.stdout.write(raw)
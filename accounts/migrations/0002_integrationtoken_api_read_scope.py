@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="integrationtoken",
+            name="scope",
+            field=models.CharField(choices=[("DISCOVERY", "Hardware discovery"), ("API_READ", "Read-only API")], max_length=20),
+        ),
+    ]
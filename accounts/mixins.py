@@ -1,5 +1,11 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
 
+from .models import IntegrationToken
 from .roles import can_manage_assets, can_view_assets, is_admin
 
 
@@ -16,3 +22,38 @@ class AssetViewRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
 class AssetManageRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     def test_func(self):
         return can_manage_assets(self.request.user)
+
+
+class AsyncAssetViewRequiredMixin:
+    """AssetViewRequiredMixin for views with async handlers, which cannot run the sync user lookup."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if not await sync_to_async(can_view_assets)(user):
+            raise PermissionDenied
+        # Templates and context processors read request.user; reuse the user already loaded.
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class IntegrationTokenRequiredMixin:
+    """Authenticate machine clients with `Authorization: Bearer <token>` instead of a session.
+
+    Views using it are CSRF-exempt because they never rely on cookies.
+    """
+
+    token_scope = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        header = request.headers.get("Authorization", "")
+        raw = header[7:].strip() if header.startswith("Bearer ") else ""
+        self.integration_token = IntegrationToken.authenticate(raw, self.token_scope)
+        if self.integration_token is None:
+            return JsonResponse({"error": "Invalid or missing bearer token."}, status=401)
+        return super().dispatch(request, *args, **kwargs)
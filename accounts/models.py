@@ -1 +1,50 @@
 # Django auth User model is used.
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class IntegrationToken(models.Model):
+    """Bearer token for machine clients (discovery agents, integrations). Only the SHA-256 digest is stored."""
+
+    class Scope(models.TextChoices):
+        DISCOVERY = "DISCOVERY", "Hardware discovery"
+        API_READ = "API_READ", "Read-only API"
+
+    name = models.CharField(max_length=120)
+    scope = models.CharField(max_length=20, choices=Scope.choices)
+    token_hash = models.CharField(max_length=64, unique=True, editable=False)
+    prefix = models.CharField(max_length=8, editable=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.prefix}…)"
+
+    @staticmethod
+    def hash_token(raw: str) -> str:
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, *, name: str, scope: str, created_by=None) -> tuple["IntegrationToken", str]:
+        """Create a token and return it with the raw secret, which is not recoverable afterwards."""
+        raw = secrets.token_urlsafe(32)
+        token = cls.objects.create(name=name, scope=scope, token_hash=cls.hash_token(raw), prefix=raw[:8], created_by=created_by)
+        return token, raw
+
+    @classmethod
+    def authenticate(cls, raw: str, scope: str) -> "IntegrationToken | None":
+        if not raw:
+            return None
+        token = cls.objects.filter(token_hash=cls.hash_token(raw), scope=scope, is_active=True).first()
+        if token:
+            cls.objects.filter(pk=token.pk).update(last_used_at=timezone.now())
+        return token
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import Group
 
+from core.invalidation import cached
+
 ADMIN = "ADMIN"
 TECHNICIAN = "TECHNICIAN"
 VIEWER = "VIEWER"
@@ -11,8 +13,14 @@ def bootstrap_roles() -> None:
         Group.objects.get_or_create(name=role)
 
 
+def user_roles(user) -> frozenset[str]:
+    if not user.is_authenticated:
+        return frozenset()
+    return cached("roles", str(user.pk), lambda: frozenset(user.groups.values_list("name", flat=True)))
+
+
 def has_role(user, role_name: str) -> bool:
-    return user.is_authenticated and user.groups.filter(name=role_name).exists()
+    return role_name in user_roles(user)
 
 
 def is_admin(user) -> bool:
@@ -0,0 +1,77 @@
+"""Incremental change feeds: records modified after a (timestamp, id) cursor, plus deletion tombstones."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from assets.models import ConsumableMovement, DeletionTombstone, MaintenanceRecord
+from core.pagination import encode_cursor, paginate_keyset
+
+from .resources import RESOURCES, Resource
+
+FEEDS = {
+    "assets": RESOURCES["assets"],
+    "assignments": RESOURCES["assignments"],
+    "maintenance": Resource(
+        "maintenance",
+        MaintenanceRecord.objects.all,
+        {
+            "id": "id",
+            "asset_id": "asset_id",
+            "maintenance_type": "maintenance_type",
+            "status": "status",
+            "description": "description",
+            "opened_at": "opened_at",
+            "closed_at": "closed_at",
+            "updated_at": "updated_at",
+        },
+    ),
+    "consumable_movements": Resource(
+        "consumable_movements",
+        ConsumableMovement.objects.all,
+        {
+            "id": "id",
+            "item_id": "item_id",
+            "sku": "item__sku",
+            "movement_type": "movement_type",
+            "quantity": "quantity",
+            "unit_cost": "unit_cost",
+            "reason": "reason",
+            "reference": "reference",
+            "updated_at": "created_at",
+        },
+    ),
+    "deletions": Resource(
+        "deletions",
+        DeletionTombstone.objects.all,
+        {
+            "id": "id",
+            "resource": "resource",
+            "object_id": "object_id",
+            "updated_at": "deleted_at",
+        },
+    ),
+}
+DEFAULT_FEED_PAGE = 500
+MAX_FEED_PAGE = 5000
+
+
+def read_changes(feed: str, *, cursor: str = "", limit: int = DEFAULT_FEED_PAGE, names=None) -> dict:
+    """Return the next page of `feed` after `cursor`.
+
+    The returned cursor is always resumable: when nothing changed it is the one passed in.
+    Rows younger than CHANGE_FEED_SAFETY_LAG_SECONDS are held back for a later call.
+    """
+    resource = FEEDS[feed]
+    names = names or list(resource.fields)
+    ts_path, id_path = resource.fields["updated_at"], resource.fields["id"]
+    horizon = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SAFETY_LAG_SECONDS)
+    queryset = resource.rows(resource.queryset().filter(**{f"{ts_path}__lt": horizon}), names)
+    rows, more = paginate_keyset(queryset, ordering=(ts_path, id_path), cursor=cursor, limit=min(limit, MAX_FEED_PAGE))
+    if rows:
+        cursor = encode_cursor([rows[-1][ts_path], rows[-1][id_path]])
+    return {
+        "results": [resource.serialize(row, names) for row in rows],
+        "cursor": cursor,
+        "has_more": more is not None,
+    }
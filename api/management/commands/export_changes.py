@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.changes import DEFAULT_FEED_PAGE, FEEDS, read_changes
+
+
+class Command(BaseCommand):
+    help = "Write records changed since the saved cursor as JSON lines, then save the new cursor."
+
+    def add_arguments(self, parser):
+        parser.add_argument("feed", choices=sorted(FEEDS))
+        parser.add_argument("--cursor-file", help="File holding the cursor between runs; read if present and rewritten at the end.")
+        parser.add_argument("--page-size", type=int, default=DEFAULT_FEED_PAGE)
+
+    def handle(self, *args, **options):
+        cursor_file = Path(options["cursor_file"]) if options["cursor_file"] else None
+        cursor = cursor_file.read_text().strip() if cursor_file and cursor_file.exists() else ""
+        total = 0
+        while True:
+            page = read_changes(options["feed"], cursor=cursor, limit=options["page_size"])
+            for row in page["results"]:
+                self.stdout.write(json.dumps(row, cls=DjangoJSONEncoder))
+            total += len(page["results"])
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        if cursor_file:
+            cursor_file.write_text(cursor)
+        self.stderr.write(f"{total} changes; cursor {cursor or '(start)'}")
@@ -0,0 +1,129 @@
+"""Read-only API resources, serialized straight from `values()` rows without model instances."""
+from django.db.models import Max
+from django.db.models.functions import Greatest
+
+from accounts.roles import can_view_assets, is_admin
+from assets.models import Asset, AssetAssignment, ConsumableItem
+from core.models import Location
+from employees.models import Employee
+
+
+class Resource:
+    """A named set of public fields, each mapped to an ORM path readable with `values()`.
+
+    `id` and `updated_at` are always fetched: they drive keyset pagination and the validators
+    (ETag / Last-Modified) even when the client does not ask for them.
+    """
+
+    def __init__(self, name, queryset, fields, *, permission=can_view_assets):
+        self.name = name
+        self._queryset = queryset
+        self.fields = fields
+        self.permission = permission
+
+    def queryset(self):
+        return self._queryset()
+
+    def select(self, names):
+        return {name: self.fields[name] for name in names}
+
+    def rows(self, queryset, names):
+        selected = self.select(names)
+        paths = {*selected.values(), self.fields["id"], self.fields["updated_at"]}
+        return queryset.values(*paths)
+
+    def serialize(self, row, names) -> dict:
+        return {name: row[path] for name, path in self.select(names).items()}
+
+
+def _consumables():
+    return ConsumableItem.objects.with_stock().annotate(last_modified=Greatest("updated_at", Max("movements__created_at")))
+
+
+RESOURCES = {
+    resource.name: resource
+    for resource in (
+        Resource(
+            "assets",
+            Asset.objects.all,
+            {
+                "id": "id",
+                "public_id": "public_id",
+                "asset_tag_internal": "asset_tag_internal",
+                "control_patrimonial": "control_patrimonial",
+                "serial": "serial",
+                "category": "category__name",
+                "status": "status__name",
+                "location_id": "location_id",
+                "location": "location__exact_name",
+                "responsible_employee_id": "responsible_employee_id",
+                "station_code": "station_code",
+                "ownership_type": "ownership_type",
+                "provider_name": "provider_name",
+                "acquisition_date": "acquisition_date",
+                "registered_at": "registered_at",
+                "attributes": "attributes",
+                "updated_at": "updated_at",
+            },
+        ),
+        Resource(
+            "assignments",
+            AssetAssignment.objects.all,
+            {
+                "id": "id",
+                "asset_id": "asset_id",
+                "asset_public_id": "asset__public_id",
+                "employee_id": "assigned_employee_id",
+                "employee_dni": "assigned_employee__dni",
+                "reason": "reason__name",
+                "start_at": "start_at",
+                "end_at": "end_at",
+                "is_current": "is_current",
+                "updated_at": "updated_at",
+            },
+        ),
+        Resource(
+            "employees",
+            Employee.objects.all,
+            {
+                "id": "id",
+                "dni": "dni",
+                "first_name": "first_name",
+                "last_name": "last_name",
+                "worker_type": "worker_type",
+                "email": "email",
+                "phone": "phone",
+                "is_active": "is_active",
+                "updated_at": "updated_at",
+            },
+            permission=is_admin,
+        ),
+        Resource(
+            "locations",
+            Location.objects.all,
+            {
+                "id": "id",
+                "site": "site",
+                "floor": "floor",
+                "type": "type",
+                "exact_name": "exact_name",
+                "is_active": "is_active",
+                "updated_at": "updated_at",
+            },
+        ),
+        Resource(
+            "consumables",
+            _consumables,
+            {
+                "id": "id",
+                "name": "name",
+                "sku": "sku",
+                "unit": "unit",
+                "min_stock": "min_stock",
+                "current_stock": "stock",
+                "is_active": "is_active",
+                "updated_at": "last_modified",
+            },
+        ),
+    )
+}
@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import IntegrationToken
+from assets.models import Asset, ConsumableItem, ConsumableMovement, DeletionTombstone, MaintenanceRecord
+from core.models import Category, Location, Status
+from core.pagination import encode_cursor
+from employees.models import Employee
+
+from .changes import read_changes
+
+
+class ResourceApiTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="CPU")
+        self.location = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Server Room")
+        self.status = Status.objects.create(name="Operational")
+        self.responsible = Employee.objects.create(dni="17171717", first_name="Luis", last_name="Vega", worker_type=Employee.WorkerType.NOMBRADO)
+        self.assets = [
+            Asset.objects.create(
+                category=self.category,
+                location=self.location,
+                status=self.status,
+                responsible_employee=self.responsible,
+                asset_tag_internal=f"INT-API-{index:03d}",
+            )
+            for index in range(5)
+        ]
+        self.token, self.raw_token = IntegrationToken.issue(name="helpdesk", scope=IntegrationToken.Scope.API_READ)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {self.raw_token}"}
+
+    def test_keyset_pages_with_sparse_fields(self):
+        resp = self.client.get("/api/v1/assets/?limit=2&fields=id,category,location", **self.auth)
+        self.assertEqual(resp.status_code, 200)
+        body = resp.json()
+        self.assertEqual(body["results"][0], {"id": self.assets[0].id, "category": "CPU", "location": "Server Room"})
+        seen = [row["id"] for row in body["results"]]
+        while body["next"]:
+            body = self.client.get(f"/api/v1/assets/?limit=2&fields=id&after={body['next']}", **self.auth).json()
+            seen += [row["id"] for row in body["results"]]
+        self.assertEqual(seen, [asset.id for asset in self.assets])
+        self.assertEqual(self.client.get("/api/v1/assets/?fields=secret", **self.auth).status_code, 400)
+        bad_type = self.client.get(f"/api/v1/assets/?after={encode_cursor(['abc'])}", **self.auth)
+        self.assertEqual((bad_type.status_code, bad_type.json()["error"]), (400, "Invalid cursor."))
+
+    def test_multi_get_reports_missing_ids(self):
+        ids = f"{self.assets[3].id},999999,{self.assets[1].id}"
+        body = self.client.get(f"/api/v1/assets/?ids={ids}&fields=asset_tag_internal", **self.auth).json()
+        self.assertEqual([row["asset_tag_internal"] for row in body["results"]], ["INT-API-003", "INT-API-001"])
+        self.assertEqual(body["missing"], [999999])
+
+    def test_unchanged_resource_returns_304(self):
+        url = f"/api/v1/assets/{self.assets[0].id}/"
+        first = self.client.get(url, **self.auth)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Last-Modified", first.headers)
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=first.headers["ETag"], **self.auth)
+        self.assertEqual(again.status_code, 304)
+        self.assets[0].observations = "Moved rack"
+        self.assets[0].save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first.headers["ETag"], **self.auth)
+        self.assertEqual(changed.status_code, 200)
+
+    def test_deletions_move_last_modified_of_collections(self):
+        url = "/api/v1/assets/"
+        first = self.client.get(url, **self.auth)
+        since = first.headers["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since, **self.auth).status_code, 304)
+        self.assets[1].delete()
+        DeletionTombstone.objects.update(deleted_at=timezone.now() + timedelta(seconds=2))
+        after = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since, **self.auth)
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(len(after.json()["results"]), 4)
+        self.assertNotIn("Last-Modified", self.client.get("/api/v1/locations/", **self.auth).headers)
+
+    def test_consumables_expose_stock_and_session_roles_apply(self):
+        item = ConsumableItem.objects.create(name="Toner", sku="TN-01")
+        ConsumableMovement.objects.create(item=item, movement_type=ConsumableMovement.MovementType.IN, quantity=10, reason="Purchase")
+        ConsumableMovement.objects.create(item=item, movement_type=ConsumableMovement.MovementType.OUT, quantity=3, reason="Issued")
+        body = self.client.get("/api/v1/consumables/?fields=sku,current_stock", **self.auth).json()
+        self.assertEqual(body["results"], [{"sku": "TN-01", "current_stock": 7}])
+
+        self.assertEqual(self.client.get("/api/v1/locations/").status_code, 401)
+        viewer = User.objects.create_user("viewer", password="x")
+        viewer.groups.add(Group.objects.create(name="VIEWER"))
+        self.client.force_login(viewer)
+        self.assertEqual(self.client.get("/api/v1/locations/").status_code, 200)
+        self.assertEqual(self.client.get("/api/v1/employees/").status_code, 403)
+
+
+@override_settings(CHANGE_FEED_SAFETY_LAG_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="CPU")
+        location = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Annex")
+        status = Status.objects.create(name="Operational")
+        responsible = Employee.objects.create(dni="18181818", first_name="Nora", last_name="Diaz", worker_type=Employee.WorkerType.CAS)
+        self.assets = [
+            Asset.objects.create(category=category, location=location, status=status, responsible_employee=responsible, asset_tag_internal=f"INT-CHG-{index}")
+            for index in range(3)
+        ]
+
+    def _drain(self, feed, cursor=""):
+        seen = []
+        while True:
+            page = read_changes(feed, cursor=cursor, limit=2, names=["id"])
+            seen += [row["id"] for row in page["results"]]
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                return seen, cursor
+
+    def test_cursor_returns_only_later_changes(self):
+        seen, cursor = self._drain("assets")
+        self.assertEqual(seen, [asset.id for asset in self.assets])
+        self.assertEqual(self._drain("assets", cursor)[0], [])
+        self.assets[0].observations = "Screen replaced"
+        self.assets[0].save()
+        self.assertEqual(self._drain("assets", cursor)[0], [self.assets[0].id])
+
+    def test_deletions_are_reported_as_tombstones(self):
+        record = MaintenanceRecord.objects.create(asset=self.assets[1], maintenance_type=MaintenanceRecord.MaintenanceType.CORRECTIVE, description="Fan")
+        _, cursor = self._drain("deletions")
+        asset_id = self.assets[1].id
+        self.assets[1].delete()
+        page = read_changes("deletions", cursor=cursor)
+        self.assertEqual(
+            {(row["resource"], row["object_id"]) for row in page["results"]},
+            {("assets", asset_id), ("maintenance", record.id)},
+        )
+
+    @override_settings(CHANGE_FEED_SAFETY_LAG_SECONDS=60)
+    def test_recent_rows_are_held_back_by_safety_lag(self):
+        self.assertEqual(read_changes("assets")["results"], [])
+        self.assertEqual(self.client.get("/api/v1/changes/unknown/").status_code, 404)
@@ -0,0 +1,14 @@
+from django.urls import path
+
+from .resources import RESOURCES
+from .views import ChangeFeedView, ResourceView
+
+urlpatterns = [
+    path("changes/<slug:feed>/", ChangeFeedView.as_view(), name="api_changes"),
+]
+for name in RESOURCES:
+    view = ResourceView.as_view(resource_name=name)
+    urlpatterns += [
+        path(f"{name}/", view, name=f"api_{name}"),
+        path(f"{name}/<int:pk>/", view, name=f"api_{name}_detail"),
+    ]
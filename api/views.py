@@ -0,0 +1,159 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views import View
+
+from accounts.models import IntegrationToken
+from assets.models import DeletionTombstone
+from assets.signals import TOMBSTONE_RESOURCES
+from core.pagination import paginate_keyset
+
+from .changes import DEFAULT_FEED_PAGE, FEEDS, read_changes
+from .resources import RESOURCES
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_MULTI_GET = 200
+
+
+def _error(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _parse_ids(raw: str) -> list[int]:
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError as exc:
+        raise ValidationError("ids must be a comma-separated list of integers.") from exc
+    if len(ids) > MAX_MULTI_GET:
+        raise ValidationError(f"At most {MAX_MULTI_GET} ids per request.")
+    return ids
+
+
+class ApiAccessMixin:
+    """Authenticate with an API_READ bearer token, or with a session whose role may read the resource."""
+
+    http_method_names = ["get", "head", "options"]
+
+    def get_resource(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        self.resource = self.get_resource()
+        if "Authorization" in request.headers:
+            header = request.headers["Authorization"]
+            raw = header[7:].strip() if header.startswith("Bearer ") else ""
+            if IntegrationToken.authenticate(raw, IntegrationToken.Scope.API_READ) is None:
+                return _error("Invalid or missing bearer token.", 401)
+        elif not request.user.is_authenticated:
+            return _error("Authentication required.", 401)
+        elif not self.resource.permission(request.user):
+            return _error("You do not have access to this resource.", 403)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ValidationError as exc:
+            return _error(exc.messages[0], 400)
+
+    def get_field_names(self) -> list[str]:
+        raw = self.request.GET.get("fields", "").strip()
+        if not raw:
+            return list(self.resource.fields)
+        names = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.resource.fields]
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}.")
+        return names
+
+
+class ResourceView(ApiAccessMixin, View):
+    """GET-only JSON endpoint for one entry of `RESOURCES`.
+
+    Every response carries an ETag and Last-Modified computed from the rows it contains,
+    so a matching If-None-Match / If-Modified-Since answers 304 without serializing the body.
+    """
+
+    resource_name = None
+
+    def get_resource(self):
+        return RESOURCES[self.resource_name]
+
+    def get(self, request, pk=None):
+        names = self.get_field_names()
+        rows = self.resource.rows(self.resource.queryset(), names)
+        id_path = self.resource.fields["id"]
+        payload = {}
+
+        if pk is not None:
+            rows = list(rows.filter(**{id_path: pk}))
+            if not rows:
+                return _error("Not found.", 404)
+        elif request.GET.get("ids"):
+            ids = _parse_ids(request.GET["ids"])
+            by_id = {row[id_path]: row for row in rows.filter(**{f"{id_path}__in": ids})}
+            rows = [by_id[i] for i in ids if i in by_id]
+            payload["missing"] = [i for i in ids if i not in by_id]
+        else:
+            try:
+                limit = min(max(int(request.GET.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+            except ValueError as exc:
+                raise ValidationError("limit must be an integer.") from exc
+            rows, next_cursor = paginate_keyset(rows, ordering=(id_path,), cursor=request.GET.get("after", ""), limit=limit)
+            payload["next"] = next_cursor
+
+        etag, last_modified = self.validators(rows, names, payload, single=pk is not None)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is None:
+            results = [self.resource.serialize(row, names) for row in rows]
+            body = results[0] if pk is not None else {"results": results, **payload}
+            response = JsonResponse(body, encoder=DjangoJSONEncoder, safe=False)
+        else:
+            response = not_modified
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def validators(self, rows, names, payload, *, single=False):
+        """ETag over the rows returned, and Last-Modified when a deletion is bound to move it.
+
+        A deleted row does not change the newest `updated_at` of a collection, so collections
+        include the resource's latest deletion tombstone; resources whose deletions leave no
+        tombstone get no Last-Modified and are revalidated by ETag alone.
+        """
+        id_path = self.resource.fields["id"]
+        updated_path = self.resource.fields["updated_at"]
+        digest = hashlib.md5(f"{self.resource.name}|{','.join(names)}|{payload}".encode(), usedforsecurity=False)
+        timestamps = []
+        for row in rows:
+            timestamps.append(row[updated_path].timestamp())
+            digest.update(f"|{row[id_path]}:{timestamps[-1]}".encode())
+        if not single:
+            if self.resource.name not in TOMBSTONE_RESOURCES.values():
+                return quote_etag(digest.hexdigest()), None
+            deleted_at = DeletionTombstone.objects.filter(resource=self.resource.name).order_by("-deleted_at").values_list("deleted_at", flat=True).first()
+            if deleted_at is not None:
+                timestamps.append(deleted_at.timestamp())
+        last_modified = int(max(timestamps)) if timestamps else None
+        return quote_etag(digest.hexdigest()), last_modified
+
+
+class ChangeFeedView(ApiAccessMixin, View):
+    """Records of one feed changed after `?cursor=`; store the returned cursor for the next call."""
+
+    def get_resource(self):
+        if self.kwargs["feed"] not in FEEDS:
+            raise Http404
+        return FEEDS[self.kwargs["feed"]]
+
+    def get(self, request, feed):
+        try:
+            limit = max(int(request.GET.get("limit", DEFAULT_FEED_PAGE)), 1)
+        except ValueError as exc:
+            raise ValidationError("limit must be an integer.") from exc
+        page = read_changes(feed, cursor=request.GET.get("cursor", ""), limit=limit, names=self.get_field_names())
+        return JsonResponse(page, encoder=DjangoJSONEncoder)
@@ -11,12 +11,20 @@ from .models import (
     ConsumableItem,
     ConsumableMovement,
     DecommissionRecord,
+    MaintenancePlan,
     MaintenanceRecord,
     NetworkDeviceDetails,
+    OutboxDelivery,
+    OutboxMessage,
     PeripheralDetails,
     PrinterDetails,
+    ReliabilitySnapshot,
     ReplacementRecord,
+    StocktakeCampaign,
+    StocktakeScan,
+    StocktakeSession,
     TeleconferenceDetails,
+    WebhookEndpoint,
 )
 
 admin.site.register(Asset)
@@ -30,8 +38,16 @@ admin.site.register(PrinterDetails)
 admin.site.register(NetworkDeviceDetails)
 admin.site.register(TeleconferenceDetails)
 admin.site.register(CameraDetails)
+admin.site.register(MaintenancePlan)
 admin.site.register(MaintenanceRecord)
 admin.site.register(ReplacementRecord)
 admin.site.register(DecommissionRecord)
+admin.site.register(ReliabilitySnapshot)
 admin.site.register(ConsumableItem)
 admin.site.register(ConsumableMovement)
+admin.site.register(StocktakeCampaign)
+admin.site.register(StocktakeSession)
+admin.site.register(StocktakeScan)
+admin.site.register(WebhookEndpoint)
+admin.site.register(OutboxMessage)
+admin.site.register(OutboxDelivery)
@@ -0,0 +1,114 @@
+"""Per-category schema for the `Asset.attributes` JSONB document and attribute filtering."""
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+ATTRIBUTE_TYPES = {
+    "brand": str,
+    "model": str,
+    "host": str,
+    "mac": str,
+    "ip": str,
+    "os_name": str,
+    "antivirus_name": str,
+    "domain": str,
+    "dns1": str,
+    "dns2": str,
+    "processor": str,
+    "cpu_speed": str,
+    "ram_total_gb": int,
+    "ram_slots_total": int,
+    "storage_summary": str,
+    "padlock_present": bool,
+    "associated_email": str,
+    "managed_by_text": str,
+    "standalone_server": bool,
+}
+
+BASE_ATTRIBUTES = {"brand", "model"}
+CATEGORY_ATTRIBUTE_SCHEMAS = (
+    (
+        {"CPU", "Laptop", "Server"},
+        BASE_ATTRIBUTES | {
+            "host", "mac", "ip", "os_name", "antivirus_name", "domain", "dns1", "dns2",
+            "processor", "cpu_speed", "ram_total_gb", "ram_slots_total", "storage_summary", "padlock_present",
+        },
+    ),
+    ({"Printer"}, BASE_ATTRIBUTES | {"ip", "associated_email"}),
+    ({"Switch", "Access Point", "Router"}, BASE_ATTRIBUTES | {"ip", "managed_by_text", "standalone_server"}),
+    ({"Security Camera"}, BASE_ATTRIBUTES | {"ip"}),
+)
+
+FILTER_OPERATORS = {
+    int: {"exact", "gt", "gte", "lt", "lte"},
+    str: {"exact", "iexact", "icontains", "istartswith"},
+    bool: {"exact"},
+}
+
+
+def attribute_keys_for(category_name) -> set[str]:
+    for categories, keys in CATEGORY_ATTRIBUTE_SCHEMAS:
+        if category_name in categories:
+            return set(keys)
+    return set(BASE_ATTRIBUTES)
+
+
+def _coerce(key, value):
+    expected = ATTRIBUTE_TYPES[key]
+    if expected is bool:
+        if isinstance(value, str):
+            return value.strip().lower() in {"1", "true", "yes", "on"}
+        return bool(value)
+    if expected is int:
+        if isinstance(value, bool):
+            raise ValidationError({key: "Expected a whole number."})
+        try:
+            return int(value)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError({key: "Expected a whole number."}) from exc
+    return str(value).strip()
+
+
+def _is_empty(value) -> bool:
+    # Not `value in (None, "", False)`: 0 == False, and a count of 0 is a value.
+    return value is None or value is False or value == ""
+
+
+def clean_attributes(category_name, payload) -> dict:
+    """Validate an attribute payload against the category schema, dropping empty values."""
+    allowed = attribute_keys_for(category_name)
+    unknown = sorted(key for key, value in (payload or {}).items() if key not in allowed and not _is_empty(value))
+    if unknown:
+        raise ValidationError({"attributes": f"Not valid for {category_name or 'this category'}: {', '.join(unknown)}."})
+    cleaned = {}
+    for key, value in (payload or {}).items():
+        if key not in allowed or value in (None, ""):
+            continue
+        value = _coerce(key, value)
+        if not _is_empty(value):
+            cleaned[key] = value
+    return cleaned
+
+
+def attribute_filter(filters) -> Q:
+    """Build one Q over `attributes` from {"key" or "key__op": value}.
+
+    Equality terms are merged into a single `@>` containment (served by the GIN index);
+    range and text terms become key-transform lookups in the same WHERE clause.
+    """
+    contains = {}
+    q = Q()
+    for term, raw in filters.items():
+        key, _, op = term.partition("__")
+        op = op or "exact"
+        if key not in ATTRIBUTE_TYPES:
+            raise ValidationError(f"Unknown attribute: {key}.")
+        if op not in FILTER_OPERATORS[ATTRIBUTE_TYPES[key]]:
+            raise ValidationError(f"Unsupported operator for {key}: {op}.")
+        value = _coerce(key, raw)
+        if op == "exact":
+            contains[key] = value
+        else:
+            q &= Q(**{f"attributes__{key}__{op}": value})
+    if contains:
+        q &= Q(attributes__contains=contains)
+    return q
@@ -0,0 +1,200 @@
+"""Bulk operations on assets: editing many at once and creating a batch from one purchase.
+
+For edits, the asset rules only depend on the category and ownership type besides the edited
+values, so they are checked on one representative asset per distinct combination instead of
+on every row, and the change itself is a single UPDATE. Batch creation checks every
+identifier for collisions in one query and inserts assets, detail rows and events with
+bulk_create, with primary keys (and so public IDs) drawn from the sequence beforehand. Bulk
+writes skip model signals, so the affected caches are invalidated explicitly.
+"""
+import csv
+import re
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.db import reserve_ids
+from core.invalidation import publish
+
+from .detail import invalidate_asset_detail
+from .models import Asset, AssetEvent
+from .outbox import enqueue_many
+from .services import build_detail_record
+
+BULK_FIELDS = {
+    "status": "status__name",
+    "location": "location__exact_name",
+    "responsible_employee": "responsible_name",
+}
+ROW_FIELDS = (
+    "id",
+    "category_id",
+    "ownership_type",
+    "status_id",
+    "location_id",
+    "responsible_employee_id",
+    "status__name",
+    "location__exact_name",
+    "responsible_employee__first_name",
+    "responsible_employee__last_name",
+)
+BATCH_SIZE = 1000
+MAX_BATCH_ASSETS = 1000
+IDENTIFIER_FIELDS = ("serial", "asset_tag_internal", "control_patrimonial")
+# Foreign keys are shared by the whole batch and checked by the form; validating them per asset would cost a query each.
+SHARED_FK_FIELDS = ["category", "location", "status", "responsible_employee"]
+TAG_PATTERN_RE = re.compile(r"#+")
+
+
+def validate_bulk_change(rows, changes: dict) -> None:
+    """Run Asset.clean() with `changes` applied once per (category, ownership type); report errors on the edited fields."""
+    representatives = {(row["category_id"], row["ownership_type"]): row["id"] for row in rows}
+    for asset in Asset.objects.select_related("category", "responsible_employee").filter(pk__in=representatives.values()):
+        for field, value in changes.items():
+            setattr(asset, field, value)
+        try:
+            asset.clean()
+        except ValidationError as exc:
+            messages = [message for field, field_messages in exc.message_dict.items() if field in changes for message in field_messages]
+            if messages:
+                raise ValidationError(f"{asset.category.name} ({asset.get_ownership_type_display()}): {' '.join(messages)}")
+
+
+def bulk_edit_assets(*, queryset, changes: dict, actor=None) -> int:
+    """Apply `changes` (any of BULK_FIELDS, None meaning unchanged) to the assets in `queryset`; return how many changed."""
+    changes = {field: value for field, value in changes.items() if field in BULK_FIELDS and value is not None}
+    if not changes:
+        raise ValidationError("Choose a status, location or responsible employee to apply.")
+
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(queryset.order_by("id").select_for_update(of=("self",)).values(*ROW_FIELDS))
+        validate_bulk_change(rows, changes)
+
+        events = []
+        for row in rows:
+            row["responsible_name"] = f"{row['responsible_employee__first_name']} {row['responsible_employee__last_name']}".strip()
+            parts = [
+                f"{field.replace('_', ' ')} {row[BULK_FIELDS[field]]} -> {value}"
+                for field, value in changes.items()
+                if row[f"{field}_id"] != value.pk
+            ]
+            if parts:
+                events.append(AssetEvent(asset_id=row["id"], event_type=AssetEvent.EventType.UPDATED, description=f"Bulk edit: {'; '.join(parts)}", created_by=actor))
+        if not events:
+            return 0
+
+        Asset.objects.filter(pk__in=[event.asset_id for event in events]).update(**changes, updated_at=now)
+        AssetEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+        invalidate_asset_detail()
+        publish("assets")
+        publish("dashboard")
+    return len(events)
+
+
+def parse_identifier_lines(lines) -> list[dict]:
+    """Read "serial[,internal tag[,control patrimonial]]" lines; blank lines and a header row are skipped."""
+    identifiers = []
+    for number, row in enumerate(csv.reader(lines), start=1):
+        values = [value.strip() for value in row]
+        if not any(values):
+            continue
+        if number == 1 and values[0].lower() == "serial":
+            continue
+        if len(values) > len(IDENTIFIER_FIELDS):
+            raise ValidationError(f"Line {number}: expected at most {len(IDENTIFIER_FIELDS)} values.")
+        identifiers.append({field: value or None for field, value in zip(IDENTIFIER_FIELDS, values + [""] * 3)})
+    return identifiers
+
+
+def expand_tag_pattern(pattern: str, start: int, count: int) -> list[str]:
+    """Internal tags from a pattern whose run of "#" is replaced by a zero-padded counter: "MON-26-###" -> MON-26-001."""
+    runs = TAG_PATTERN_RE.findall(pattern)
+    if len(runs) != 1:
+        raise ValidationError('The tag pattern needs exactly one run of "#", e.g. MON-2026-###.')
+    width = len(runs[0])
+    return [TAG_PATTERN_RE.sub(str(number).zfill(width), pattern) for number in range(start, start + count)]
+
+
+def identifier_collisions(identifiers: list[dict]) -> list[str]:
+    """Identifiers repeated inside the batch or already used by an asset, checked in one query."""
+    seen = {field: set() for field in IDENTIFIER_FIELDS}
+    repeated = []
+    for row in identifiers:
+        for field in IDENTIFIER_FIELDS:
+            value = row.get(field)
+            if value and value in seen[field]:
+                repeated.append(value)
+            elif value:
+                seen[field].add(value)
+    lookup = Q()
+    for field, values in seen.items():
+        if values:
+            lookup |= Q(**{f"{field}__in": values})
+    existing = []
+    if lookup:
+        for row in Asset.objects.filter(lookup).values(*IDENTIFIER_FIELDS):
+            existing.extend(row[field] for field in IDENTIFIER_FIELDS if row[field] in seen[field])
+    return sorted(set(repeated)) + sorted(set(existing))
+
+
+def create_asset_batch(*, shared: dict, identifiers: list[dict], details: dict | None = None, actor=None) -> list[Asset]:
+    """Create one asset per identifier row, all sharing `shared` (category, location, status, responsible employee...).
+
+    `details` is the wizard details payload, applied to every asset's detail row. Raises
+    ValidationError when an identifier collides or an asset would break the asset rules.
+    """
+    if not identifiers:
+        raise ValidationError("Add at least one serial or internal tag.")
+    if len(identifiers) > MAX_BATCH_ASSETS:
+        raise ValidationError(f"At most {MAX_BATCH_ASSETS} assets can be created at once.")
+    collisions = identifier_collisions(identifiers)
+    if collisions:
+        shown = ", ".join(collisions[:10])
+        more = f" and {len(collisions) - 10} more" if len(collisions) > 10 else ""
+        raise ValidationError(f"Identifiers already in use or repeated: {shown}{more}.")
+
+    category = shared["category"]
+    assets = [Asset(**shared, **row) for row in identifiers]
+    for number, asset in enumerate(assets, start=1):
+        try:
+            asset.full_clean(exclude=SHARED_FK_FIELDS, validate_unique=False, validate_constraints=False)
+        except ValidationError as exc:
+            raise ValidationError(f"Row {number} ({asset}): {' '.join(exc.messages)}")
+
+    with transaction.atomic():
+        for asset, pk in zip(assets, reserve_ids(Asset, len(assets))):
+            asset.pk = pk
+            asset.public_id = f"ASSET-{pk:08d}"
+        Asset.objects.bulk_create(assets, batch_size=BATCH_SIZE)
+        records = [build_detail_record(asset, details or {}, category.name) for asset in assets]
+        records = [record for record in records if record is not None]
+        if records:
+            type(records[0]).objects.bulk_create(records, batch_size=BATCH_SIZE)
+        AssetEvent.objects.bulk_create(
+            [
+                AssetEvent(asset=asset, event_type=AssetEvent.EventType.CREATED, created_by=actor, description=f"Created {asset.public_id} (batch of {len(assets)})")
+                for asset in assets
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        enqueue_many(
+            "asset.created",
+            [
+                (
+                    asset.pk,
+                    {
+                        "public_id": asset.public_id,
+                        "category": category.name,
+                        "location_id": asset.location_id,
+                        "responsible_employee_id": asset.responsible_employee_id,
+                    },
+                )
+                for asset in assets
+            ],
+        )
+        publish("assets")
+        publish("dashboard")
+    return assets
@@ -0,0 +1,56 @@
+"""Read-through cache of the asset detail page.
+
+The cached payload holds everything the page shows that does not depend on who is looking.
+Signals on the asset and its dependent records evict one asset's entry through the cache
+invalidation bus; catalog and employee changes drop the whole namespace, since their names
+are shown on every page. A payload loaded while an eviction landed is served once but not
+kept, so an edit made during a miss is visible on the next request. Sensitive values are
+cached with the asset but filtered per request.
+"""
+from django.http import Http404
+
+from core.invalidation import cached, evict, on_evict, publish
+
+from .models import Asset
+
+DETAIL_NAMESPACE = "asset_detail"
+SHARED_NAMESPACES = {"catalogs", "employees"}
+
+
+def load_asset_detail(pk) -> dict:
+    try:
+        asset = Asset.objects.select_related(
+            "category", "location", "status", "responsible_employee", "sensitive_data", "decommission_record"
+        ).get(pk=pk)
+    except Asset.DoesNotExist:
+        raise Http404("No asset found matching the query")
+    return {
+        "asset": asset,
+        "attributes": [(key.replace("_", " ").capitalize(), _display_value(value)) for key, value in sorted(asset.attributes.items())],
+        "sensitive_data": getattr(asset, "sensitive_data", None),
+        "current_assignment": asset.assignments.filter(is_current=True).select_related("assigned_employee").first(),
+        "maintenance_records": list(asset.maintenance_records.order_by("-opened_at")[:5]),
+        "replacement_records": list(asset.replacement_records.order_by("-replacement_date")[:5]),
+        "decommission_record": getattr(asset, "decommission_record", None),
+    }
+
+
+def _display_value(value):
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    return value
+
+
+def asset_detail(pk) -> dict:
+    return cached(DETAIL_NAMESPACE, str(pk), lambda: load_asset_detail(pk))
+
+
+def invalidate_asset_detail(asset_id=None) -> None:
+    """Drop one asset's entry, or every entry when `asset_id` is None (bulk updates), after commit."""
+    publish(DETAIL_NAMESPACE, asset_id)
+
+
+@on_evict
+def _shared_names_changed(namespace, key):
+    if namespace in SHARED_NAMESPACES:
+        evict(DETAIL_NAMESPACE)
@@ -0,0 +1,163 @@
+"""Hardware inventory ingestion from discovery agents into ComputerSpecs."""
+import ipaddress
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from core.invalidation import publish
+
+from .detail import invalidate_asset_detail
+from .fields import normalize_mac
+from .models import Asset, AssetEvent, ComputerSpecs
+
+MAX_DISCOVERY_BATCH = 1000
+DISCOVERABLE_CATEGORIES = {"CPU", "Laptop", "Server"}
+SPEC_FIELDS = ("cpu_model", "ram_gb", "storage_gb", "os_name", "ip_address", "mac_address", "hostname")
+# Upper bounds of the ComputerSpecs columns (PositiveSmallIntegerField / PositiveIntegerField).
+SPEC_INTEGER_LIMITS = {"ram_gb": 32767, "storage_gb": 2147483647}
+HOSTNAME_MAX_LENGTH = ComputerSpecs._meta.get_field("hostname").max_length
+SPEC_ATTRIBUTES = {"cpu_model": "processor", "ram_gb": "ram_total_gb", "os_name": "os_name", "ip_address": "ip", "mac_address": "mac", "hostname": "host"}
+
+
+def _clean_report(report) -> dict:
+    if not isinstance(report, dict):
+        raise ValidationError("Each host report must be an object.")
+    cleaned = {
+        "serial": str(report.get("serial") or "").strip(),
+        "hostname": str(report.get("hostname") or "").strip().lower(),
+        "mac_address": normalize_mac(report.get("mac_address")) or None,
+        "cpu_model": str(report.get("cpu_model") or "").strip()[:120],
+        "os_name": str(report.get("os_name") or "").strip()[:120],
+        "ip_address": None,
+    }
+    if len(cleaned["hostname"]) > HOSTNAME_MAX_LENGTH:
+        raise ValidationError(f"hostname cannot exceed {HOSTNAME_MAX_LENGTH} characters.")
+    if not (cleaned["serial"] or cleaned["hostname"] or cleaned["mac_address"]):
+        raise ValidationError("A serial, MAC address or hostname is required to match a host.")
+    if report.get("ip_address"):
+        try:
+            cleaned["ip_address"] = str(ipaddress.ip_address(str(report["ip_address"]).strip()))
+        except ValueError as exc:
+            raise ValidationError(f"Invalid IP address: {report['ip_address']}") from exc
+    for field in ("ram_gb", "storage_gb"):
+        value = report.get(field)
+        if value in (None, ""):
+            cleaned[field] = None
+            continue
+        try:
+            cleaned[field] = max(int(value), 0)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(f"{field} must be an integer.") from exc
+        if cleaned[field] > SPEC_INTEGER_LIMITS[field]:
+            raise ValidationError(f"{field} cannot exceed {SPEC_INTEGER_LIMITS[field]}.")
+    return cleaned
+
+
+def ingest_hardware_reports(reports, *, source: str = "discovery") -> dict:
+    """Match host reports to assets and upsert their ComputerSpecs.
+
+    A batch costs a fixed number of queries regardless of its size: one lookup per
+    match key, then, in a single transaction, locked loads of the existing specs and
+    assets and the bulk writes.
+    Matching tries serial, then MAC address, then hostname.
+    """
+    if len(reports) > MAX_DISCOVERY_BATCH:
+        raise ValidationError(f"A discovery batch cannot exceed {MAX_DISCOVERY_BATCH} hosts.")
+
+    rejected = []
+    cleaned = []
+    for index, report in enumerate(reports):
+        try:
+            cleaned.append((index, _clean_report(report)))
+        except ValidationError as exc:
+            rejected.append({"index": index, "error": exc.messages[0]})
+
+    serials = {c["serial"] for _, c in cleaned if c["serial"]}
+    macs = {c["mac_address"] for _, c in cleaned if c["mac_address"]}
+    hostnames = {c["hostname"] for _, c in cleaned if c["hostname"]}
+
+    by_serial = {
+        serial: (asset_id, category)
+        for serial, asset_id, category in Asset.objects.filter(serial__in=serials).values_list("serial", "id", "category__name")
+    }
+    by_mac, by_hostname = {}, {}
+    # Reports are lowercased; hostnames stored before that normalization may be mixed case.
+    spec_keys = (
+        ComputerSpecs.objects.alias(host=Lower("hostname"))
+        .filter(Q(mac_address__in=macs) | Q(host__in=hostnames))
+        .values_list("asset_id", "mac_address", "hostname")
+    )
+    for asset_id, mac, hostname in spec_keys:
+        if mac:
+            by_mac[mac] = asset_id
+        if hostname:
+            by_hostname[hostname.lower()] = asset_id
+
+    matched = {}
+    unmatched = []
+    for index, report in cleaned:
+        asset_id = None
+        serial_match = by_serial.get(report["serial"])
+        if serial_match:
+            asset_id, category = serial_match
+            if category not in DISCOVERABLE_CATEGORIES:
+                unmatched.append({"index": index, "error": f"Asset with serial {report['serial']} is a {category}, not a computer."})
+                continue
+        asset_id = asset_id or by_mac.get(report["mac_address"]) or by_hostname.get(report["hostname"])
+        if asset_id is None:
+            unmatched.append({"index": index, "serial": report["serial"], "hostname": report["hostname"], "mac_address": report["mac_address"]})
+            continue
+        matched[asset_id] = report
+
+    now = timezone.now()
+    to_update, to_create, events = [], [], []
+    attribute_changes = {}
+    with transaction.atomic():
+        # Locked until the writes: bulk_update writes whole rows, so a concurrent edit in between would be lost.
+        existing = {spec.asset_id: spec for spec in ComputerSpecs.objects.select_for_update().filter(asset_id__in=matched).order_by("asset_id")}
+        for asset_id, report in matched.items():
+            spec = existing.get(asset_id)
+            if spec is None:
+                spec = ComputerSpecs(asset_id=asset_id, cpu_model="N/A", ram_gb=0, storage_gb=0)
+                to_create.append(spec)
+            changes = []
+            for field in SPEC_FIELDS:
+                value = report.get(field)
+                if value in (None, "") or getattr(spec, field) == value:
+                    continue
+                changes.append(f"{field}: {getattr(spec, field) or '-'} -> {value}")
+                setattr(spec, field, value)
+                if field in SPEC_ATTRIBUTES:
+                    attribute_changes.setdefault(asset_id, {})[SPEC_ATTRIBUTES[field]] = value
+            spec.last_discovered_at = now
+            if spec.pk:
+                to_update.append(spec)
+            if changes:
+                events.append(AssetEvent(asset_id=asset_id, event_type=AssetEvent.EventType.UPDATED, description=f"{source}: " + "; ".join(changes)))
+
+        assets = list(Asset.objects.select_for_update().filter(pk__in=attribute_changes).only("id", "attributes").order_by("id"))
+        for asset in assets:
+            asset.attributes = {**asset.attributes, **attribute_changes[asset.pk]}
+            asset.updated_at = now
+
+        ComputerSpecs.objects.bulk_update(to_update, [*SPEC_FIELDS, "last_discovered_at"], batch_size=500)
+        Asset.objects.bulk_update(assets, ["attributes", "updated_at"], batch_size=500)
+        ComputerSpecs.objects.bulk_create(to_create, batch_size=500)
+        AssetEvent.objects.bulk_create(events, batch_size=500)
+        if assets or to_update or to_create:
+            invalidate_asset_detail()
+        if assets:
+            # bulk_update sends no signals; attribute filters on the cached asset tables depend on these.
+            publish("assets")
+
+    return {
+        "received": len(reports),
+        "matched": len(matched),
+        "created": len(to_create),
+        "changed": len(events),
+        "unmatched": unmatched,
+        "rejected": rejected,
+    }
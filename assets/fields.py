@@ -0,0 +1,51 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+MAC_RE = re.compile(r"^[0-9a-f]{12}$")
+
+
+def normalize_mac(value) -> str:
+    """Canonical lower-case colon form (aa:bb:cc:dd:ee:ff), or "" when the value is not a MAC."""
+    digits = re.sub(r"[^0-9a-fA-F]", "", str(value or "")).lower()
+    if not MAC_RE.match(digits):
+        return ""
+    return ":".join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+class MACAddressField(models.Field):
+    """MAC address stored as PostgreSQL `macaddr` (varchar elsewhere), always in canonical form."""
+
+    description = "MAC address"
+
+    def __init__(self, *args, **kwargs):
+        kwargs["max_length"] = 17
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop("max_length", None)
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == "postgresql":
+            return "macaddr"
+        return "varchar(17)"
+
+    def to_python(self, value):
+        if value in (None, ""):
+            return None
+        normalized = normalize_mac(value)
+        if not normalized:
+            raise ValidationError("Enter a valid MAC address.", code="invalid")
+        return normalized
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value in (None, ""):
+            return None
+        return normalize_mac(value) or value
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else str(value)
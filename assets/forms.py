@@ -1,7 +1,10 @@
 from django import forms
 
+from core.models import AssignmentReason, Location, Status
 from employees.models import Employee
 
+from .attributes import attribute_keys_for
+from .bulk import IDENTIFIER_FIELDS, MAX_BATCH_ASSETS, expand_tag_pattern, parse_identifier_lines
 from .models import (
     Asset,
     AssetAssignment,
@@ -16,9 +19,14 @@ from .models import (
     PeripheralDetails,
     PrinterDetails,
     ReplacementRecord,
+    StocktakeCampaign,
+    StocktakeSession,
     TeleconferenceDetails,
 )
 
+# Wizard details that identify one device, so they are not shared across a quantity batch.
+PER_DEVICE_DETAIL_FIELDS = ("host", "mac", "ip")
+
 
 class AssetForm(forms.ModelForm):
     class Meta:
@@ -43,6 +51,7 @@ class AssetWizardStep1Form(forms.Form):
     category = forms.ModelChoiceField(queryset=None, required=True)
     ownership_type = forms.ChoiceField(choices=Asset.OwnershipType.choices, required=True)
     provider_name = forms.CharField(max_length=200, required=False)
+    quantity_mode = forms.BooleanField(required=False, label="Several identical assets from one purchase")
 
     def __init__(self, *args, **kwargs):
         from core.models import Category
@@ -68,18 +77,23 @@ class AssetWizardStep2Form(forms.Form):
     status = forms.ModelChoiceField(queryset=None, required=True)
     observations = forms.CharField(required=False, widget=forms.Textarea)
 
-    def __init__(self, *args, ownership_type=None, **kwargs):
+    def __init__(self, *args, ownership_type=None, quantity_mode=False, **kwargs):
         from core.models import Location, Status
 
         super().__init__(*args, **kwargs)
         self.ownership_type = ownership_type
+        self.quantity_mode = quantity_mode
+        if quantity_mode:
+            # Identifiers differ per asset and are entered as a list after the details step.
+            for name in IDENTIFIER_FIELDS:
+                self.fields.pop(name)
         self.fields["location"].queryset = Location.objects.filter(is_active=True)
         self.fields["status"].queryset = Status.objects.filter(is_active=True)
         self.fields["responsible_employee"].queryset = Employee.objects.filter(
             worker_type__in=[Employee.WorkerType.NOMBRADO, Employee.WorkerType.CAS],
             is_active=True,
         )
-        if ownership_type == Asset.OwnershipType.PROVIDER:
+        if ownership_type == Asset.OwnershipType.PROVIDER and not quantity_mode:
             self.fields["control_patrimonial"].widget = forms.HiddenInput()
 
     def clean_station_code(self):
@@ -88,6 +102,8 @@ class AssetWizardStep2Form(forms.Form):
 
     def clean(self):
         cleaned = super().clean()
+        if self.quantity_mode:
+            return cleaned
         ownership_type = self.ownership_type
         control = (cleaned.get("control_patrimonial") or "").strip()
         internal = (cleaned.get("asset_tag_internal") or "").strip()
@@ -127,39 +143,54 @@ class AssetWizardStep3Form(forms.Form):
     managed_by_text = forms.CharField(max_length=120, required=False)
     standalone_server = forms.BooleanField(required=False)
 
-    COMPUTER_CATEGORIES = {"CPU", "Laptop", "Server"}
-    PRINTER_CATEGORIES = {"Printer"}
-    NETWORK_CATEGORIES = {"Switch", "Access Point", "Router"}
-    CAMERA_CATEGORIES = {"Security Camera"}
-    SIMPLE_PERIPHERAL_CATEGORIES = {
-        "Monitor", "Keyboard", "Teclado", "Webcam", "Headphones", "Microphone", "PC Speaker",
-        "Projector", "Interactive Whiteboard", "Air Conditioner", "Biometric Clock", "Tablet", "Sound Console", "Teleconference",
-    }
-
-    def __init__(self, *args, category_name=None, **kwargs):
+    def __init__(self, *args, category_name=None, quantity_mode=False, **kwargs):
         super().__init__(*args, **kwargs)
         self.category_name = category_name
-        allowed = {"brand", "model"}
-
-        if category_name in self.COMPUTER_CATEGORIES:
-            allowed = {
-                "brand", "model", "host", "mac", "ip", "os_name", "antivirus_name", "domain", "dns1", "dns2",
-                "processor", "cpu_speed", "ram_total_gb", "ram_slots_total", "storage_summary", "padlock_present",
-            }
-        elif category_name in self.PRINTER_CATEGORIES:
-            allowed = {"brand", "model", "ip", "associated_email"}
-        elif category_name in self.NETWORK_CATEGORIES:
-            allowed = {"brand", "model", "ip", "managed_by_text", "standalone_server"}
-        elif category_name in self.CAMERA_CATEGORIES:
-            allowed = {"brand", "model", "ip"}
-        elif category_name in self.SIMPLE_PERIPHERAL_CATEGORIES:
-            allowed = {"brand", "model"}
+        allowed = attribute_keys_for(category_name)
+        if quantity_mode:
+            allowed = set(allowed) - set(PER_DEVICE_DETAIL_FIELDS)
 
         for name in list(self.fields):
             if name not in allowed:
                 self.fields.pop(name)
 
 
+class AssetWizardIdentifiersForm(forms.Form):
+    identifiers = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={"rows": 10}),
+        help_text="One asset per line: serial, internal tag, control patrimonial (the last two are optional).",
+    )
+    identifiers_file = forms.FileField(required=False, help_text="Or upload the same lines as a CSV file.")
+    tag_pattern = forms.CharField(max_length=50, required=False, help_text='Internal tags for lines without one, e.g. MON-2026-### ("#" is the counter).')
+    tag_start = forms.IntegerField(min_value=0, initial=1, required=False)
+    quantity = forms.IntegerField(
+        min_value=1, max_value=MAX_BATCH_ASSETS, required=False, help_text="Without a list: how many assets to tag from the pattern."
+    )
+
+    def clean(self):
+        cleaned = super().clean()
+        lines = (cleaned.get("identifiers") or "").splitlines()
+        upload = cleaned.get("identifiers_file")
+        try:
+            if upload:
+                lines += upload.read().decode("utf-8-sig").splitlines()
+            rows = parse_identifier_lines(lines)
+            if cleaned.get("tag_pattern"):
+                if not rows:
+                    rows = [dict.fromkeys(IDENTIFIER_FIELDS) for _ in range(cleaned.get("quantity") or 0)]
+                untagged = [row for row in rows if not row["asset_tag_internal"]]
+                tags = expand_tag_pattern(cleaned["tag_pattern"], 1 if cleaned.get("tag_start") is None else cleaned["tag_start"], len(untagged))
+                for row, tag in zip(untagged, tags):
+                    row["asset_tag_internal"] = tag
+        except UnicodeDecodeError:
+            raise forms.ValidationError("The uploaded file must be UTF-8 text.")
+        if not rows:
+            raise forms.ValidationError("Paste or upload at least one line, or give a tag pattern and a quantity.")
+        cleaned["rows"] = rows
+        return cleaned
+
+
 class AssetWizardStep4SensitiveForm(forms.ModelForm):
     class Meta:
         model = AssetSensitiveData
@@ -176,6 +207,27 @@ class MaintenanceForm(forms.ModelForm):
         fields = ["asset", "maintenance_type", "status", "description", "closed_at"]
 
 
+class MaintenanceQueueFilterForm(forms.Form):
+    ALL = "ALL"
+
+    status = forms.ChoiceField(
+        choices=[("", "Open and in progress"), *MaintenanceRecord.MaintenanceStatus.choices, (ALL, "All")], required=False
+    )
+    maintenance_type = forms.ChoiceField(choices=[("", "Any type"), *MaintenanceRecord.MaintenanceType.choices], required=False, label="Type")
+    location = forms.ModelChoiceField(queryset=Location.objects.filter(is_active=True), required=False, empty_label="Any location")
+    older_than_days = forms.IntegerField(min_value=1, required=False, label="Open more than (days)")
+
+    def queue_filters(self) -> dict:
+        """Keyword arguments for maintenance_queue()."""
+        status = self.cleaned_data["status"]
+        return {
+            "status": None if not status else "" if status == self.ALL else status,
+            "maintenance_type": self.cleaned_data["maintenance_type"],
+            "location": self.cleaned_data["location"],
+            "older_than_days": self.cleaned_data["older_than_days"],
+        }
+
+
 class ReplacementForm(forms.ModelForm):
     class Meta:
         model = ReplacementRecord
@@ -211,3 +263,74 @@ class ReassignmentForm(forms.ModelForm):
         model = AssetAssignment
         fields = ["asset", "assigned_employee", "reason"]
         labels = {"assigned_employee": "new assigned employee"}
+
+
+class StocktakeCampaignForm(forms.ModelForm):
+    class Meta:
+        model = StocktakeCampaign
+        fields = ["name", "notes"]
+
+
+class StocktakeSessionForm(forms.ModelForm):
+    class Meta:
+        model = StocktakeSession
+        fields = ["location"]
+
+    def __init__(self, *args, campaign=None, **kwargs):
+        from core.models import Location
+
+        super().__init__(*args, **kwargs)
+        qs = Location.objects.filter(is_active=True)
+        if campaign is not None:
+            qs = qs.exclude(stocktake_sessions__campaign=campaign)
+        self.fields["location"].queryset = qs
+
+
+class AssetBulkEditForm(forms.Form):
+    SCOPE_SELECTED = "selected"
+    SCOPE_FILTER = "filter"
+
+    scope = forms.ChoiceField(
+        choices=[(SCOPE_SELECTED, "Selected assets"), (SCOPE_FILTER, "All assets matching the search")], initial=SCOPE_SELECTED
+    )
+    ids = forms.ModelMultipleChoiceField(queryset=Asset.objects.all(), required=False)
+    filter = forms.CharField(required=False, widget=forms.HiddenInput)
+    status = forms.ModelChoiceField(queryset=Status.objects.filter(is_active=True), required=False)
+    location = forms.ModelChoiceField(queryset=Location.objects.filter(is_active=True), required=False)
+    responsible_employee = forms.ModelChoiceField(queryset=Employee.objects.filter(is_active=True), required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        if cleaned.get("scope") == self.SCOPE_SELECTED and not cleaned.get("ids"):
+            raise forms.ValidationError("Select at least one asset.")
+        return cleaned
+
+
+class StationMoveForm(forms.Form):
+    location = forms.ModelChoiceField(queryset=Location.objects.filter(is_active=True))
+
+
+class StationReassignForm(forms.Form):
+    assigned_employee = forms.ModelChoiceField(queryset=Employee.objects.filter(is_active=True), label="New assigned employee")
+    reason = forms.ModelChoiceField(queryset=AssignmentReason.objects.filter(is_active=True))
+
+
+class OffboardingForm(forms.Form):
+    successor = forms.ModelChoiceField(
+        queryset=Employee.objects.filter(is_active=True, worker_type__in=[Employee.WorkerType.NOMBRADO, Employee.WorkerType.CAS]),
+        help_text="Receives responsibility and current assignments.",
+    )
+    reason = forms.ModelChoiceField(queryset=AssignmentReason.objects.filter(is_active=True))
+    deactivate_employee = forms.BooleanField(required=False, initial=True)
+
+    def __init__(self, *args, employee=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if employee is not None:
+            self.fields["successor"].queryset = self.fields["successor"].queryset.exclude(pk=employee.pk)
+
+
+class StocktakeScanForm(forms.Form):
+    codes = forms.CharField(widget=forms.Textarea(attrs={"rows": 8}), help_text="One scanned code per line.")
+
+    def clean_codes(self):
+        return self.cleaned_data["codes"].splitlines()
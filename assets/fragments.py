@@ -0,0 +1,64 @@
+"""Rendered list tables cached per worker.
+
+The table of a list page is rendered once per query string and role combination and kept in
+the per-worker cache from core.invalidation, so repeated reads skip both the ORM and the
+template engine. Only the table is cached: the surrounding page (navigation, CSRF tokens,
+messages) is still rendered for each request. Writes evict the affected tables through the
+invalidation bus, in every worker.
+"""
+from urllib.parse import urlencode
+
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from accounts.context_processors import role_flags
+from core.invalidation import cached, evict, on_evict
+
+FRAGMENT_MAX_ENTRIES = 200
+ASSET_TABLES = "fragments.assets"
+ASSIGNMENT_TABLES = "fragments.assignments"
+MAINTENANCE_TABLES = "fragments.maintenance"
+CONSUMABLE_TABLES = "fragments.consumables"
+# Tables that show data published under other namespaces (asset codes, catalog and employee names).
+DEPENDENT_TABLES = {
+    "assets": (ASSET_TABLES, ASSIGNMENT_TABLES, MAINTENANCE_TABLES),
+    "catalogs": (ASSET_TABLES, ASSIGNMENT_TABLES, MAINTENANCE_TABLES),
+    "employees": (ASSET_TABLES, ASSIGNMENT_TABLES, MAINTENANCE_TABLES),
+}
+
+
+class CachedTableMixin:
+    """For ListViews: render `fragment_template_name` through the cache and hand it to the page as `table_html`.
+
+    HTMX requests get the table alone.
+    """
+
+    fragment_template_name = None
+    fragment_namespace = None
+
+    def get_fragment_key(self, flags) -> tuple:
+        query = urlencode(sorted((key, value) for key, values in self.request.GET.lists() for value in values))
+        return (query, *sorted(flags.items()))
+
+    def render_table(self) -> str:
+        flags = role_flags(self.request)
+
+        def render():
+            context = {**self.get_context_data(), **flags}
+            return render_to_string(self.fragment_template_name, context)
+
+        return mark_safe(cached(self.fragment_namespace, self.get_fragment_key(flags), render, max_entries=FRAGMENT_MAX_ENTRIES))
+
+    def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        table_html = self.render_table()
+        if request.headers.get("HX-Request"):
+            return HttpResponse(table_html)
+        return self.render_to_response({"table_html": table_html, "view": self})
+
+
+@on_evict
+def _shared_data_changed(namespace, key):
+    for table in DEPENDENT_TABLES.get(namespace, ()):
+        evict(table)
@@ -0,0 +1,110 @@
+"""Replacement lineage: which assets an asset replaced, and which replaced it, across any number of hops.
+
+ReplacementRecord links an asset to its replacement, so lineages are chains (or trees, when
+one asset was replaced by several or several by one). Each lookup walks them with a
+recursive CTE in a single query instead of one query per hop. Every branch carries the path
+walked so far, so a cycle in bad data stops the recursion instead of looping forever.
+"""
+from django.db import connections, router
+
+from .models import Asset, ReplacementRecord
+
+TABLE = ReplacementRecord._meta.db_table
+
+LINEAGE_SQL = f"""
+WITH RECURSIVE successors AS (
+    SELECT r.replacement_asset_id AS asset_id, 1 AS depth, r.replacement_date, r.reason,
+           ARRAY[r.asset_id, r.replacement_asset_id] AS path
+    FROM {TABLE} r
+    WHERE r.asset_id = %(asset)s AND r.replacement_asset_id IS NOT NULL
+    UNION ALL
+    SELECT r.replacement_asset_id, s.depth + 1, r.replacement_date, r.reason, s.path || r.replacement_asset_id
+    FROM successors s
+    JOIN {TABLE} r ON r.asset_id = s.asset_id
+    WHERE r.replacement_asset_id IS NOT NULL AND r.replacement_asset_id <> ALL(s.path)
+),
+predecessors AS (
+    SELECT r.asset_id, -1 AS depth, r.replacement_date, r.reason, ARRAY[r.replacement_asset_id, r.asset_id] AS path
+    FROM {TABLE} r
+    WHERE r.replacement_asset_id = %(asset)s
+    UNION ALL
+    SELECT r.asset_id, p.depth - 1, r.replacement_date, r.reason, p.path || r.asset_id
+    FROM predecessors p
+    JOIN {TABLE} r ON r.replacement_asset_id = p.asset_id
+    WHERE r.asset_id <> ALL(p.path)
+)
+SELECT chain.asset_id, chain.depth, chain.replacement_date, chain.reason,
+       chain.depth > 0 AND NOT EXISTS (
+           SELECT 1 FROM {TABLE} n WHERE n.asset_id = chain.asset_id AND n.replacement_asset_id IS NOT NULL
+       ) AS is_current
+FROM (
+    SELECT asset_id, depth, replacement_date, reason FROM successors
+    UNION ALL
+    SELECT asset_id, depth, replacement_date, reason FROM predecessors
+) chain
+ORDER BY chain.depth, chain.replacement_date, chain.asset_id
+"""
+
+CURRENT_SUCCESSORS_SQL = f"""
+WITH RECURSIVE chain AS (
+    SELECT r.asset_id AS origin_id, r.replacement_asset_id AS asset_id, ARRAY[r.asset_id, r.replacement_asset_id] AS path
+    FROM {TABLE} r
+    WHERE r.replacement_asset_id IS NOT NULL AND (%(every)s OR r.asset_id = ANY(%(assets)s))
+    UNION ALL
+    SELECT c.origin_id, r.replacement_asset_id, c.path || r.replacement_asset_id
+    FROM chain c
+    JOIN {TABLE} r ON r.asset_id = c.asset_id
+    WHERE r.replacement_asset_id IS NOT NULL AND r.replacement_asset_id <> ALL(c.path)
+)
+SELECT DISTINCT c.origin_id, a.public_id
+FROM chain c
+JOIN {Asset._meta.db_table} a ON a.id = c.asset_id
+WHERE NOT EXISTS (SELECT 1 FROM {TABLE} n WHERE n.asset_id = c.asset_id AND n.replacement_asset_id IS NOT NULL)
+ORDER BY c.origin_id, a.public_id
+"""
+
+
+def _cursor():
+    return connections[router.db_for_read(ReplacementRecord)].cursor()
+
+
+def asset_lineage(asset_id) -> dict:
+    """Predecessors (oldest first) and successors (nearest first) of an asset, plus its current successors.
+
+    Each entry is a dict with the `asset`, its `depth` (negative before the asset, positive
+    after it) and the `replacement_date` and `reason` of the hop. Two queries: the walk and the assets.
+    """
+    with _cursor() as cursor:
+        cursor.execute(LINEAGE_SQL, {"asset": asset_id})
+        rows = cursor.fetchall()
+    if not rows:
+        return {"predecessors": [], "successors": [], "current": []}
+
+    assets = Asset.objects.select_related("category", "status").in_bulk({row[0] for row in rows})
+    entries, seen = [], set()
+    for related_id, depth, replacement_date, reason, is_current in rows:
+        # A diamond (A -> B, A -> C, B -> D, C -> D) reaches D twice; list it once.
+        if (related_id, depth > 0) in seen:
+            continue
+        seen.add((related_id, depth > 0))
+        entries.append({"asset": assets[related_id], "depth": depth, "replacement_date": replacement_date, "reason": reason, "is_current": is_current})
+    return {
+        "predecessors": [entry for entry in entries if entry["depth"] < 0],
+        "successors": [entry for entry in entries if entry["depth"] > 0],
+        "current": [entry["asset"] for entry in entries if entry["is_current"]],
+    }
+
+
+def current_successors(asset_ids=None) -> dict[int, list[str]]:
+    """Public IDs of the assets at the end of each replacement chain, keyed by the replaced asset's id.
+
+    With `asset_ids` None every replaced asset is resolved, which suits full exports: one query
+    however many assets and hops. Assets never replaced are absent from the result.
+    """
+    params = {"every": asset_ids is None, "assets": list(asset_ids or [])}
+    resolved = {}
+    with _cursor() as cursor:
+        cursor.execute(CURRENT_SUCCESSORS_SQL, params)
+        for origin_id, public_id in cursor.fetchall():
+            resolved.setdefault(origin_id, []).append(public_id)
+    return resolved
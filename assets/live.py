@@ -0,0 +1,108 @@
+"""Dashboard metrics pushed to open browsers over server-sent events.
+
+One broadcaster per worker process recomputes the metrics once per burst of committed
+changes (signalled through the cache invalidation bus) and fans the delta out to every
+connected viewer, instead of each wall screen re-running the dashboard queries.
+"""
+import asyncio
+import json
+
+from django.db.models import F
+
+from core.invalidation import on_evict
+
+from .models import Asset, ConsumableItem, DecommissionRecord, MaintenanceRecord
+from .stations import incomplete_stations
+
+DASHBOARD_NAMESPACE = "dashboard"
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+async def compute_metrics() -> dict:
+    return {
+        "total_assets": await Asset.objects.acount(),
+        "operational_assets": await Asset.objects.filter(status__name="Operational").acount(),
+        "inoperative_assets": await Asset.objects.filter(status__name="Inoperative").acount(),
+        "assigned_assets": await Asset.objects.filter(assignments__is_current=True).distinct().acount(),
+        "open_maintenance": await MaintenanceRecord.objects.exclude(status=MaintenanceRecord.MaintenanceStatus.CLOSED).acount(),
+        "decommissioned_assets": await DecommissionRecord.objects.acount(),
+        "low_stock_items": await ConsumableItem.objects.with_stock().filter(stock__lte=F("min_stock")).acount(),
+        "incomplete_stations": await incomplete_stations().acount(),
+    }
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class DashboardBroadcaster:
+    debounce_seconds = 0.5
+
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.snapshot = None
+        self.loop = None
+        self._dirty = False
+        self._refresh_task = None
+
+    async def subscribe(self):
+        """Register a viewer; return its queue of deltas and the current full snapshot."""
+        self.loop = asyncio.get_running_loop()
+        if self.snapshot is None:
+            self.snapshot = await compute_metrics()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue, self.snapshot
+
+    def unsubscribe(self, queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            # Nobody is watching, so nothing keeps the snapshot current any more.
+            self.snapshot = None
+
+    def notify_changed(self) -> None:
+        """Thread-safe: called from request threads and the invalidation listener."""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            self.snapshot = None
+            return
+        loop.call_soon_threadsafe(self._schedule_refresh)
+
+    def _schedule_refresh(self) -> None:
+        if not self.subscribers:
+            self.snapshot = None
+            return
+        self._dirty = True
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.loop.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        while self._dirty:
+            self._dirty = False
+            await asyncio.sleep(self.debounce_seconds)
+            metrics = await compute_metrics()
+            previous = self.snapshot or {}
+            self.snapshot = metrics
+            delta = {key: value for key, value in metrics.items() if previous.get(key) != value}
+            if delta:
+                self.publish(delta)
+
+    def publish(self, delta: dict) -> None:
+        for queue in list(self.subscribers):
+            pending = delta
+            if queue.full():
+                # A stalled viewer only needs the latest values: fold its backlog into one delta.
+                merged = {}
+                while not queue.empty():
+                    merged.update(queue.get_nowait())
+                pending = {**merged, **delta}
+            queue.put_nowait(pending)
+
+
+broadcaster = DashboardBroadcaster()
+
+
+@on_evict
+def _dashboard_changed(namespace, key):
+    if namespace == DASHBOARD_NAMESPACE:
+        broadcaster.notify_changed()
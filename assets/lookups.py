@@ -0,0 +1,22 @@
+import ipaddress
+
+from django.db import NotSupportedError
+from django.db.models import GenericIPAddressField, Lookup
+
+
+@GenericIPAddressField.register_lookup
+class InSubnet(Lookup):
+    """`ip_address__in_subnet="10.20.0.0/16"`: inet containment (`<<=`), served by the inet_ops GiST index."""
+
+    lookup_name = "in_subnet"
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return "%s", [str(ipaddress.ip_network(str(value).strip(), strict=False))]
+
+    def as_sql(self, compiler, connection):
+        if connection.vendor != "postgresql":
+            raise NotSupportedError("in_subnet lookups require PostgreSQL.")
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} <<= {rhs}::inet", [*lhs_params, *rhs_params]
@@ -0,0 +1,165 @@
+"""Maintenance: preventive scheduling, the technician work queue and SLA metrics.
+
+An asset is due under a plan when its last closed PREVENTIVE record is older than the plan
+interval (or it never had one), it has no preventive work order still open, and the plan has
+not already generated one for the current period. That is one query per plan; the new OPEN
+records are inserted with bulk_create. The (plan, asset, period) unique constraint makes
+reruns in the same period, even concurrent ones, insert nothing: when a concurrent run got to
+some assets first, the batch falls back to row-by-row inserts that skip them, so the counts
+reported are the rows actually written.
+
+The work queue is oldest first and paged by keyset on (opened_at, id), which the
+(status, opened_at, id) index serves for a status filter. SLA metrics per category (mean time
+to repair and open-age percentiles) are one grouped query, cached until maintenance data
+changes and for at most an hour, since open ages grow without any write.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, DurationField, Exists, ExpressionWrapper, F, Max, OuterRef, Q, Subquery, Value
+from django.utils import timezone
+
+from core.db import PercentileCont
+from core.invalidation import cached, evict, on_evict, publish
+
+from .detail import invalidate_asset_detail
+from .fragments import MAINTENANCE_TABLES
+from .models import Asset, MaintenancePlan, MaintenanceRecord
+
+BATCH_SIZE = 1000
+PREVENTIVE = MaintenanceRecord.MaintenanceType.PREVENTIVE
+CLOSED = MaintenanceRecord.MaintenanceStatus.CLOSED
+QUEUE_ORDERING = ("opened_at", "id")
+SLA_NAMESPACE = "maintenance.sla"
+SLA_WINDOW_DAYS = 90
+
+
+def due_assets(plan: MaintenancePlan, today):
+    """Assets in the plan scope that need a new preventive work order for the period containing `today`."""
+    scope = Q(decommission_record__isnull=True)
+    if plan.category_id:
+        scope &= Q(category_id=plan.category_id)
+    if plan.location_id:
+        scope &= Q(location_id=plan.location_id)
+    preventive = MaintenanceRecord.objects.filter(asset=OuterRef("pk"), maintenance_type=PREVENTIVE)
+    last_closed = preventive.filter(status=CLOSED).order_by().values("asset").annotate(last=Max("closed_at")).values("last")
+    due_before = timezone.make_aware(datetime.combine(today - timedelta(days=plan.interval_days), time.min))
+    return (
+        Asset.objects.filter(scope)
+        .annotate(last_preventive_at=Subquery(last_closed))
+        .filter(Q(last_preventive_at__isnull=True) | Q(last_preventive_at__lt=due_before))
+        .exclude(Exists(preventive.exclude(status=CLOSED)))
+        .exclude(Exists(MaintenanceRecord.objects.filter(asset=OuterRef("pk"), plan=plan, period_start=plan.period_start(today))))
+        .order_by("id")
+    )
+
+
+def _insert_work_orders(records: list[MaintenanceRecord]) -> int:
+    """Insert the records and return how many were written, skipping those another run already opened."""
+    try:
+        with transaction.atomic():
+            MaintenanceRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+        return len(records)
+    except IntegrityError:
+        pass
+    inserted = 0
+    for record in records:
+        try:
+            with transaction.atomic():
+                MaintenanceRecord.objects.bulk_create([record])
+        except IntegrityError:
+            continue
+        inserted += 1
+    return inserted
+
+
+def schedule_preventive(*, today=None, plans=None, dry_run: bool = False) -> list[tuple[MaintenancePlan, int]]:
+    """Open the due work orders of every active plan (or of `plans`); return (plan, count) pairs.
+
+    The count is the number of work orders opened, or with `dry_run` the number that would be.
+    """
+    today = today or timezone.localdate()
+    plans = list(plans if plans is not None else MaintenancePlan.objects.filter(is_active=True, starts_on__lte=today))
+    results = []
+    created = 0
+    with transaction.atomic():
+        for plan in plans:
+            asset_ids = list(due_assets(plan, today).values_list("id", flat=True))
+            count = len(asset_ids)
+            if asset_ids and not dry_run:
+                period = plan.period_start(today)
+                count = _insert_work_orders(
+                    [
+                        MaintenanceRecord(
+                            asset_id=asset_id,
+                            maintenance_type=PREVENTIVE,
+                            description=plan.description or plan.name,
+                            plan=plan,
+                            period_start=period,
+                        )
+                        for asset_id in asset_ids
+                    ]
+                )
+                created += count
+            results.append((plan, count))
+        if created:
+            publish(MAINTENANCE_TABLES)
+            publish("dashboard")
+            invalidate_asset_detail()
+    return results
+
+
+def maintenance_queue(*, status=None, maintenance_type=None, location=None, older_than_days=None):
+    """Maintenance records for the work queue, oldest first; `status` None means every record not yet closed."""
+    qs = MaintenanceRecord.objects.select_related("asset__category", "asset__location", "performed_by")
+    if status is None:
+        qs = qs.filter(status__in=[MaintenanceRecord.MaintenanceStatus.OPEN, MaintenanceRecord.MaintenanceStatus.IN_PROGRESS])
+    elif status:
+        qs = qs.filter(status=status)
+    if maintenance_type:
+        qs = qs.filter(maintenance_type=maintenance_type)
+    if location:
+        qs = qs.filter(asset__location=location)
+    if older_than_days:
+        qs = qs.filter(opened_at__lt=timezone.now() - timedelta(days=older_than_days))
+    return qs.order_by(*QUEUE_ORDERING)
+
+
+def compute_sla_metrics(now=None) -> list[dict]:
+    """Per category: records closed in the last SLA_WINDOW_DAYS with their mean time to repair, and open records with age percentiles.
+
+    Durations are returned in hours.
+    """
+    now = now or timezone.now()
+    closed = Q(status=CLOSED, closed_at__gte=now - timedelta(days=SLA_WINDOW_DAYS))
+    still_open = ~Q(status=CLOSED)
+    repair_time = ExpressionWrapper(F("closed_at") - F("opened_at"), output_field=DurationField())
+    open_age = ExpressionWrapper(Value(now) - F("opened_at"), output_field=DurationField())
+    rows = list(
+        MaintenanceRecord.objects.filter(closed | still_open)
+        .values(category=F("asset__category__name"))
+        .annotate(
+            closed_count=Count("id", filter=closed),
+            mttr=Avg(repair_time, filter=closed),
+            open_count=Count("id", filter=still_open),
+            open_age_p50=PercentileCont(open_age, 0.5, filter=still_open),
+            open_age_p90=PercentileCont(open_age, 0.9, filter=still_open),
+        )
+        .order_by("-open_count", "category")
+    )
+    for row in rows:
+        for name in ("mttr", "open_age_p50", "open_age_p90"):
+            duration = row.pop(name)
+            row[f"{name}_hours"] = None if duration is None else round(duration.total_seconds() / 3600, 1)
+    return rows
+
+
+def sla_metrics() -> list[dict]:
+    hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+    return cached(SLA_NAMESPACE, hour.isoformat(), compute_sla_metrics, max_entries=1)
+
+
+@on_evict
+def _maintenance_changed(namespace, key):
+    if namespace == "dashboard":
+        evict(SLA_NAMESPACE)
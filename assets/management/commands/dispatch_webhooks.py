@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from assets.outbox import dispatch_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox events to webhook endpoints in batches, with retries and backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running, polling every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            result = dispatch_pending()
+            if result["delivered"] or result["failed"] or not options["loop"]:
+                self.stdout.write(f"Delivered: {result['delivered']}, failed: {result['failed']}")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from assets.labels import iter_label_pdf, iter_labels, label_queryset
+from core.models import Category, Location
+
+
+class Command(BaseCommand):
+    help = "Write a Code 128 label sheet PDF for a location, a category or every asset. Streams to disk for large selections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the PDF file to write.")
+        parser.add_argument("--location", help="Exact location name.")
+        parser.add_argument("--category", help="Category name.")
+        parser.add_argument("--columns", type=int, default=3)
+        parser.add_argument("--rows", type=int, default=8)
+
+    def handle(self, *args, **options):
+        location_id = category_id = None
+        if options["location"]:
+            location_id = Location.objects.filter(exact_name=options["location"]).values_list("id", flat=True).first()
+            if location_id is None:
+                raise CommandError(f"Unknown location: {options['location']}")
+        if options["category"]:
+            category_id = Category.objects.filter(name=options["category"]).values_list("id", flat=True).first()
+            if category_id is None:
+                raise CommandError(f"Unknown category: {options['category']}")
+
+        queryset = label_queryset(location_id=location_id, category_id=category_id)
+        total = queryset.count()
+        with open(options["output"], "wb") as fh:
+            for chunk in iter_label_pdf(iter_labels(queryset), columns=options["columns"], rows=options["rows"]):
+                fh.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {total} labels to {options['output']}"))
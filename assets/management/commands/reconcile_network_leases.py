@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from assets.network import reconcile_leases
+
+
+class Command(BaseCommand):
+    help = "Stream an ARP table or DHCP lease export and flag unknown devices and assets whose recorded address differs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Lease/ARP export (dnsmasq leases, `arp -a` output or CSV with ip and mac columns).")
+
+    def handle(self, *args, **options):
+        counts = {"UNKNOWN": 0, "MISMATCH": 0}
+        with open(options["path"], encoding="utf-8", errors="replace") as fh:
+            for finding in reconcile_leases(fh):
+                counts[finding["kind"]] += 1
+                asset = f"asset={finding['asset_id']}" if finding["asset_id"] else ""
+                self.stdout.write(
+                    f"{finding['kind']:<8} line {finding['line']}: {finding['ip']} {finding['mac']} {finding['hostname']} {asset} {finding['detail']}".rstrip()
+                )
+        self.stdout.write(self.style.SUCCESS(f"Unknown devices: {counts['UNKNOWN']}, mismatched assets: {counts['MISMATCH']}"))
@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from assets.maintenance import schedule_preventive
+from assets.models import MaintenancePlan
+
+
+class Command(BaseCommand):
+    help = "Open the preventive maintenance work orders that are due under the active maintenance plans. Safe to rerun."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Schedule as of this day (YYYY-MM-DD) instead of today.")
+        parser.add_argument("--plan", type=int, action="append", dest="plans", help="Only this plan id; repeatable.")
+        parser.add_argument("--dry-run", action="store_true", help="Report how many work orders would be opened.")
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        plans = None
+        if options["plans"]:
+            plans = MaintenancePlan.objects.filter(pk__in=options["plans"])
+        results = schedule_preventive(today=today, plans=plans, dry_run=options["dry_run"])
+        for plan, count in results:
+            self.stdout.write(f"{plan.name}: {count} due (period from {plan.period_start(today)})")
+        total = sum(count for _, count in results)
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Dry run: {total} preventive work orders due across {len(results)} plans"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{total} preventive work orders opened across {len(results)} plans"))
@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from assets.reliability import DEFAULT_WINDOW_DAYS, snapshot_reliability
+
+
+class Command(BaseCommand):
+    help = "Materialize the reliability analytics (MTBF, MTTR, failure rates) for the report. Run nightly; reruns replace the day's snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Snapshot day (YYYY-MM-DD); the window ends the day before. Defaults to today.")
+        parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS, help="Length of the analysis window in days.")
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options["date"]) if options["date"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        if options["window_days"] < 1:
+            raise CommandError("--window-days must be positive.")
+        snapshots = snapshot_reliability(computed_on=day, window_days=options["window_days"])
+        self.stdout.write(self.style.SUCCESS(f"Stored {len(snapshots)} reliability rows for {day} ({options['window_days']}-day window)"))
@@ -0,0 +1,60 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0007_remove_station_code_unique_constraint"),
+        ("core", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StocktakeCampaign",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=120, unique=True)),
+                ("notes", models.TextField(blank=True)),
+                ("status", models.CharField(choices=[("OPEN", "Open"), ("CLOSED", "Closed")], default="OPEN", max_length=20)),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("closed_at", models.DateTimeField(blank=True, null=True)),
+                ("created_by", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={"ordering": ["-started_at"]},
+        ),
+        migrations.CreateModel(
+            name="StocktakeSession",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("status", models.CharField(choices=[("OPEN", "Open"), ("CLOSED", "Closed")], default="OPEN", max_length=20)),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("closed_at", models.DateTimeField(blank=True, null=True)),
+                ("campaign", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="sessions", to="assets.stocktakecampaign")),
+                ("location", models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name="stocktake_sessions", to="core.location")),
+                ("started_by", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "ordering": ["location__exact_name"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("campaign", "location"), name="unique_stocktake_session_per_location"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="StocktakeScan",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("code", models.CharField(max_length=80)),
+                ("scanned_at", models.DateTimeField(auto_now_add=True)),
+                ("scanned_by", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ("session", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="scans", to="assets.stocktakesession")),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("session", "code"), name="unique_stocktake_scan_code_per_session"),
+                ],
+            },
+        ),
+    ]
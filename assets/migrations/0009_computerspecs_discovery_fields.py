@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0008_stocktake"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="computerspecs",
+            name="hostname",
+            field=models.CharField(blank=True, db_index=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name="computerspecs",
+            name="last_discovered_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
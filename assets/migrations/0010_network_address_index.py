@@ -0,0 +1,50 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+import assets.fields
+
+
+def normalize_mac_addresses(apps, schema_editor):
+    ComputerSpecs = apps.get_model("assets", "ComputerSpecs")
+    for spec in ComputerSpecs.objects.exclude(mac_address__isnull=True).only("id", "mac_address"):
+        normalized = assets.fields.normalize_mac(spec.mac_address) or None
+        if normalized != spec.mac_address:
+            ComputerSpecs.objects.filter(pk=spec.pk).update(mac_address=normalized)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0009_computerspecs_discovery_fields"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="computerspecs",
+            name="mac_address",
+            field=models.CharField(blank=True, max_length=17, null=True),
+        ),
+        migrations.RunPython(normalize_mac_addresses, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="computerspecs",
+            name="mac_address",
+            field=assets.fields.MACAddressField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="computerspecs",
+            index=django.contrib.postgres.indexes.GistIndex(fields=["ip_address"], name="computerspecs_ip_gist", opclasses=["inet_ops"]),
+        ),
+        migrations.AddField(
+            model_name="networkdevicedetails",
+            name="ip_address",
+            field=models.GenericIPAddressField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="networkdevicedetails",
+            name="mac_address",
+            field=assets.fields.MACAddressField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="networkdevicedetails",
+            index=django.contrib.postgres.indexes.GistIndex(fields=["ip_address"], name="networkdevice_ip_gist", opclasses=["inet_ops"]),
+        ),
+    ]
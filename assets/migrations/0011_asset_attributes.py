@@ -0,0 +1,48 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+UPDATE assets_asset AS a
+SET attributes = a.attributes || jsonb_strip_nulls(jsonb_build_object(
+    'processor', NULLIF(NULLIF(c.cpu_model, ''), 'N/A'),
+    'ram_total_gb', NULLIF(c.ram_gb, 0),
+    'os_name', NULLIF(c.os_name, ''),
+    'ip', host(c.ip_address),
+    'mac', c.mac_address::text,
+    'host', NULLIF(c.hostname, '')
+))
+FROM assets_computerspecs AS c
+WHERE c.asset_id = a.id;
+
+UPDATE assets_asset AS a
+SET attributes = a.attributes || jsonb_strip_nulls(jsonb_build_object(
+    'brand', NULLIF(p.brand, ''),
+    'model', NULLIF(p.model, '')
+))
+FROM assets_peripheraldetails AS p
+WHERE p.asset_id = a.id;
+
+UPDATE assets_asset AS a
+SET attributes = a.attributes || jsonb_strip_nulls(jsonb_build_object('ip', host(n.ip_address)))
+FROM assets_networkdevicedetails AS n
+WHERE n.asset_id = a.id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0010_network_address_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="attributes",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="asset",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["attributes"], name="asset_attributes_gin", opclasses=["jsonb_path_ops"]),
+        ),
+    ]
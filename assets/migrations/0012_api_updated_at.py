@@ -0,0 +1,27 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0011_asset_attributes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assetassignment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="consumableitem",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            "UPDATE assets_assetassignment SET updated_at = COALESCE(end_at, start_at)",
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,49 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0012_api_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="maintenancerecord",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            "UPDATE assets_maintenancerecord SET updated_at = COALESCE(closed_at, opened_at)",
+            migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name="DeletionTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("resource", models.CharField(max_length=40)),
+                ("object_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_id_idx")],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["updated_at", "id"], name="asset_updated_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="assetassignment",
+            index=models.Index(fields=["updated_at", "id"], name="assignment_updated_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="maintenancerecord",
+            index=models.Index(fields=["updated_at", "id"], name="maintenance_updated_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consumablemovement",
+            index=models.Index(fields=["created_at", "id"], name="movement_created_id_idx"),
+        ),
+    ]
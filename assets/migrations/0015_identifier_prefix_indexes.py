@@ -0,0 +1,40 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0014_outbox"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper("asset_tag_internal"), name="text_pattern_ops"),
+                name="asset_tag_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper("control_patrimonial"), name="text_pattern_ops"),
+                name="asset_patrimonial_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper("serial"), name="text_pattern_ops"),
+                name="asset_serial_prefix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper("public_id"), name="text_pattern_ops"),
+                name="asset_public_id_prefix_idx",
+            ),
+        ),
+    ]
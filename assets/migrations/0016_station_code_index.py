@@ -0,0 +1,15 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0015_identifier_prefix_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(django.db.models.functions.text.Upper("station_code"), name="asset_station_code_idx"),
+        ),
+    ]
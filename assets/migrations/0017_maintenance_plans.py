@@ -0,0 +1,54 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0016_station_code_index"),
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaintenancePlan",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=120, unique=True)),
+                ("interval_days", models.PositiveIntegerField(default=90)),
+                ("starts_on", models.DateField(default=django.utils.timezone.localdate)),
+                ("description", models.TextField(blank=True, help_text="Work order text; defaults to the plan name.")),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("category", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name="maintenance_plans", to="core.category")),
+                ("location", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name="maintenance_plans", to="core.location")),
+            ],
+            options={
+                "ordering": ["name"],
+                "constraints": [
+                    models.CheckConstraint(check=models.Q(("category__isnull", False), ("location__isnull", False), _connector="OR"), name="maintenance_plan_scope_required"),
+                    models.CheckConstraint(check=models.Q(("interval_days__gt", 0)), name="maintenance_plan_interval_positive"),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="maintenancerecord",
+            name="plan",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="records", to="assets.maintenanceplan"),
+        ),
+        migrations.AddField(
+            model_name="maintenancerecord",
+            name="period_start",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="maintenancerecord",
+            index=models.Index(fields=["asset", "maintenance_type", "closed_at"], name="maintenance_asset_type_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="maintenancerecord",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("plan__isnull", False)), fields=("plan", "asset", "period_start"), name="unique_plan_period_per_asset"
+            ),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0017_maintenance_plans"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="maintenancerecord",
+            index=models.Index(fields=["status", "opened_at", "id"], name="maintenance_status_opened_idx"),
+        ),
+    ]
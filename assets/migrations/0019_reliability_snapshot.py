@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("assets", "0018_maintenance_status_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReliabilitySnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("computed_on", models.DateField()),
+                ("window_days", models.PositiveIntegerField()),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[("CATEGORY", "Category"), ("MODEL", "Brand and model"), ("LOCATION", "Location")], max_length=20
+                    ),
+                ),
+                ("category", models.CharField(blank=True, max_length=100)),
+                ("brand", models.CharField(blank=True, max_length=120)),
+                ("model", models.CharField(blank=True, max_length=120)),
+                ("location", models.CharField(blank=True, max_length=120)),
+                ("assets", models.PositiveIntegerField()),
+                ("operating_days", models.PositiveBigIntegerField()),
+                ("failures", models.PositiveIntegerField()),
+                ("replacements", models.PositiveIntegerField()),
+                ("decommissions", models.PositiveIntegerField()),
+                ("mtbf_days", models.FloatField(blank=True, null=True)),
+                ("mttr_hours", models.FloatField(blank=True, null=True)),
+                ("failures_per_asset_year", models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["computed_on", "dimension"], name="reliability_day_dimension_idx")],
+            },
+        ),
+    ]
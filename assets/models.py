@@ -1,11 +1,19 @@
+from datetime import timedelta
+
 from django.conf import settings
-from django.core.exceptions import ValidationError
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Coalesce, Upper
+from django.utils import timezone
 
 from core.models import AssignmentReason, Category, Location, Status
 from employees.models import Employee
 
+from .attributes import clean_attributes
+from .fields import MACAddressField
+
 
 REQUIRES_CONTROL_CATEGORIES = {
     "Teleconference",
@@ -50,11 +58,23 @@ class Asset(models.Model):
 
     ownership_type = models.CharField(max_length=20, choices=OwnershipType.choices, default=OwnershipType.INEI)
     provider_name = models.CharField(max_length=200, blank=True, null=True)
+    attributes = models.JSONField(default=dict, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            GinIndex(fields=["attributes"], opclasses=["jsonb_path_ops"], name="asset_attributes_gin"),
+            models.Index(fields=["updated_at", "id"], name="asset_updated_id_idx"),
+            # Case-insensitive prefix lookups for the search typeahead (see assets/typeahead.py).
+            models.Index(OpClass(Upper("asset_tag_internal"), name="text_pattern_ops"), name="asset_tag_prefix_idx"),
+            models.Index(OpClass(Upper("control_patrimonial"), name="text_pattern_ops"), name="asset_patrimonial_prefix_idx"),
+            models.Index(OpClass(Upper("serial"), name="text_pattern_ops"), name="asset_serial_prefix_idx"),
+            models.Index(OpClass(Upper("public_id"), name="text_pattern_ops"), name="asset_public_id_prefix_idx"),
+            # Workstation lookups and grouping compare the upper-cased code (see assets/stations.py).
+            models.Index(Upper("station_code"), name="asset_station_code_idx"),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=Q(control_patrimonial__isnull=False) | Q(asset_tag_internal__isnull=False),
@@ -98,6 +118,12 @@ class Asset(models.Model):
         if category_name in self.INTERNAL_REQUIRED_CATEGORIES and not self.asset_tag_internal:
             errors["asset_tag_internal"] = f"{category_name} requires internal code (asset_tag_internal)."
 
+        if self.attributes:
+            try:
+                self.attributes = clean_attributes(category_name, self.attributes)
+            except ValidationError as exc:
+                errors[NON_FIELD_ERRORS] = exc.messages
+
         if errors:
             raise ValidationError(errors)
 
@@ -153,8 +179,12 @@ class AssetAssignment(models.Model):
     start_at = models.DateTimeField(auto_now_add=True)
     end_at = models.DateTimeField(null=True, blank=True)
     is_current = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="assignment_updated_id_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["asset"],
@@ -212,7 +242,14 @@ class ComputerSpecs(models.Model):
     storage_gb = models.PositiveIntegerField()
     os_name = models.CharField(max_length=120, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    mac_address = models.CharField(max_length=17, blank=True)
+    mac_address = MACAddressField(null=True, blank=True, db_index=True)
+    hostname = models.CharField(max_length=120, blank=True, db_index=True)
+    last_discovered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            GistIndex(fields=["ip_address"], opclasses=["inet_ops"], name="computerspecs_ip_gist"),
+        ]
 
 
 class PeripheralDetails(models.Model):
@@ -234,6 +271,13 @@ class NetworkDeviceDetails(models.Model):
     ports = models.PositiveSmallIntegerField(default=0)
     managed = models.BooleanField(default=False)
     wifi_standard = models.CharField(max_length=50, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    mac_address = MACAddressField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            GistIndex(fields=["ip_address"], opclasses=["inet_ops"], name="networkdevice_ip_gist"),
+        ]
 
 
 class TeleconferenceDetails(models.Model):
@@ -248,6 +292,38 @@ class CameraDetails(models.Model):
     resolution = models.CharField(max_length=50, blank=True)
     field_of_view = models.PositiveSmallIntegerField(default=0)
 
+class MaintenancePlan(models.Model):
+    """Preventive maintenance every `interval_days` for the assets of a category and/or location.
+
+    Periods are consecutive windows of `interval_days` starting on `starts_on`; the scheduler
+    (assets/maintenance.py) opens at most one work order per asset, plan and period.
+    """
+
+    name = models.CharField(max_length=120, unique=True)
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, null=True, blank=True, related_name="maintenance_plans")
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, null=True, blank=True, related_name="maintenance_plans")
+    interval_days = models.PositiveIntegerField(default=90)
+    starts_on = models.DateField(default=timezone.localdate)
+    description = models.TextField(blank=True, help_text="Work order text; defaults to the plan name.")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.CheckConstraint(check=Q(category__isnull=False) | Q(location__isnull=False), name="maintenance_plan_scope_required"),
+            models.CheckConstraint(check=Q(interval_days__gt=0), name="maintenance_plan_interval_positive"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def period_start(self, day):
+        """First day of the period that contains `day`."""
+        periods = max((day - self.starts_on).days, 0) // self.interval_days
+        return self.starts_on + timedelta(days=periods * self.interval_days)
+
+
 class MaintenanceRecord(models.Model):
     class MaintenanceType(models.TextChoices):
         PREVENTIVE = "PREVENTIVE", "Preventive"
@@ -265,6 +341,23 @@ class MaintenanceRecord(models.Model):
     opened_at = models.DateTimeField(auto_now_add=True)
     closed_at = models.DateTimeField(null=True, blank=True)
     performed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    plan = models.ForeignKey(MaintenancePlan, on_delete=models.SET_NULL, null=True, blank=True, related_name="records")
+    period_start = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="maintenance_updated_id_idx"),
+            models.Index(fields=["asset", "maintenance_type", "closed_at"], name="maintenance_asset_type_idx"),
+            models.Index(fields=["status", "opened_at", "id"], name="maintenance_status_opened_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["plan", "asset", "period_start"],
+                condition=Q(plan__isnull=False),
+                name="unique_plan_period_per_asset",
+            )
+        ]
 
 
 class ReplacementRecord(models.Model):
@@ -284,12 +377,65 @@ class DecommissionRecord(models.Model):
     approved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
 
 
+class ReliabilitySnapshot(models.Model):
+    """Reliability figures for one group of assets over a window, materialized nightly (see assets/reliability.py)."""
+
+    class Dimension(models.TextChoices):
+        CATEGORY = "CATEGORY", "Category"
+        MODEL = "MODEL", "Brand and model"
+        LOCATION = "LOCATION", "Location"
+
+    computed_on = models.DateField()
+    window_days = models.PositiveIntegerField()
+    dimension = models.CharField(max_length=20, choices=Dimension.choices)
+    category = models.CharField(max_length=100, blank=True)
+    brand = models.CharField(max_length=120, blank=True)
+    model = models.CharField(max_length=120, blank=True)
+    location = models.CharField(max_length=120, blank=True)
+    assets = models.PositiveIntegerField()
+    operating_days = models.PositiveBigIntegerField()
+    failures = models.PositiveIntegerField()
+    replacements = models.PositiveIntegerField()
+    decommissions = models.PositiveIntegerField()
+    mtbf_days = models.FloatField(null=True, blank=True)
+    mttr_hours = models.FloatField(null=True, blank=True)
+    failures_per_asset_year = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["computed_on", "dimension"], name="reliability_day_dimension_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.get_dimension_display()} {self.label} ({self.computed_on})"
+
+    @property
+    def label(self) -> str:
+        if self.dimension == self.Dimension.LOCATION:
+            return self.location
+        if self.dimension == self.Dimension.MODEL:
+            return " / ".join(part for part in (self.category, self.brand, self.model) if part) or "-"
+        return self.category
+
+
+class ConsumableItemQuerySet(models.QuerySet):
+    def with_stock(self):
+        """Annotate `stock` (ingress - egress + adjustments) in SQL instead of per-item queries."""
+        signed_quantity = models.Case(
+            models.When(movements__movement_type=ConsumableMovement.MovementType.OUT, then=-models.F("movements__quantity")),
+            default=models.F("movements__quantity"),
+            output_field=models.IntegerField(),
+        )
+        return self.annotate(stock=Coalesce(models.Sum(signed_quantity), models.Value(0)))
+
+
 class ConsumableItem(models.Model):
     name = models.CharField(max_length=120)
     sku = models.CharField(max_length=50, unique=True)
     unit = models.CharField(max_length=30, default="unit")
     min_stock = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ConsumableItemQuerySet.as_manager()
 
     class Meta:
         ordering = ["name"]
@@ -326,6 +472,9 @@ class ConsumableMovement(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="movement_created_id_idx"),
+        ]
 
     def clean(self):
         errors = {}
@@ -347,3 +496,126 @@ class ConsumableMovement(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+class DeletionTombstone(models.Model):
+    """Marker left behind when a change-feed record is deleted, so downstream copies can drop it."""
+
+    resource = models.CharField(max_length=40)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_id_idx"),
+        ]
+
+
+class WebhookEndpoint(models.Model):
+    """External system notified of asset events. An empty `topics` list subscribes to every topic."""
+
+    name = models.CharField(max_length=120, unique=True)
+    url = models.URLField(max_length=500)
+    secret = models.CharField(max_length=128, help_text="Shared secret used to sign deliveries (HMAC-SHA256).")
+    topics = models.JSONField(default=list, blank=True)
+    batch_size = models.PositiveSmallIntegerField(default=50)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def accepts(self, topic: str) -> bool:
+        return not self.topics or topic in self.topics
+
+
+class OutboxMessage(models.Model):
+    """Event written in the same transaction as the change it describes; delivered later by the dispatcher."""
+
+    topic = models.CharField(max_length=60)
+    asset = models.ForeignKey(Asset, on_delete=models.SET_NULL, null=True, blank=True, related_name="outbox_messages")
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class OutboxDelivery(models.Model):
+    class DeliveryStatus(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        DELIVERED = "DELIVERED", "Delivered"
+        FAILED = "FAILED", "Failed"
+
+    message = models.ForeignKey(OutboxMessage, on_delete=models.CASCADE, related_name="deliveries")
+    endpoint = models.ForeignKey(WebhookEndpoint, on_delete=models.CASCADE, related_name="deliveries")
+    status = models.CharField(max_length=20, choices=DeliveryStatus.choices, default=DeliveryStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["message", "endpoint"], name="unique_outbox_delivery_per_endpoint"),
+        ]
+        indexes = [
+            models.Index(fields=["endpoint", "status", "next_attempt_at"], name="outbox_delivery_due_idx"),
+        ]
+
+
+class StocktakeCampaign(models.Model):
+    class CampaignStatus(models.TextChoices):
+        OPEN = "OPEN", "Open"
+        CLOSED = "CLOSED", "Closed"
+
+    name = models.CharField(max_length=120, unique=True)
+    notes = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=CampaignStatus.choices, default=CampaignStatus.OPEN)
+    started_at = models.DateTimeField(auto_now_add=True)
+    closed_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class StocktakeSession(models.Model):
+    class SessionStatus(models.TextChoices):
+        OPEN = "OPEN", "Open"
+        CLOSED = "CLOSED", "Closed"
+
+    campaign = models.ForeignKey(StocktakeCampaign, on_delete=models.CASCADE, related_name="sessions")
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name="stocktake_sessions")
+    status = models.CharField(max_length=20, choices=SessionStatus.choices, default=SessionStatus.OPEN)
+    started_at = models.DateTimeField(auto_now_add=True)
+    closed_at = models.DateTimeField(null=True, blank=True)
+    started_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        ordering = ["location__exact_name"]
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "location"], name="unique_stocktake_session_per_location"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.campaign} / {self.location}"
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == self.SessionStatus.OPEN and self.campaign.status == StocktakeCampaign.CampaignStatus.OPEN
+
+
+class StocktakeScan(models.Model):
+    session = models.ForeignKey(StocktakeSession, on_delete=models.CASCADE, related_name="scans")
+    code = models.CharField(max_length=80)
+    scanned_at = models.DateTimeField(auto_now_add=True)
+    scanned_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["session", "code"], name="unique_stocktake_scan_code_per_session"),
+        ]
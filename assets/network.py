@@ -0,0 +1,100 @@
+"""Network address queries over ComputerSpecs and NetworkDeviceDetails, and lease-file reconciliation."""
+import ipaddress
+import re
+
+from django.db import connection
+
+from .fields import normalize_mac
+from .models import ComputerSpecs, NetworkDeviceDetails
+
+NETWORK_SOURCES = (("computer", ComputerSpecs), ("network_device", NetworkDeviceDetails))
+ADDRESS_FIELDS = ("asset_id", "asset__public_id", "asset__asset_tag_internal", "asset__category__name", "ip_address", "mac_address")
+MAC_TOKEN_RE = re.compile(r"\b[0-9A-Fa-f]{2}(?:[:-][0-9A-Fa-f]{2}){5}\b|\b[0-9A-Fa-f]{4}(?:\.[0-9A-Fa-f]{4}){2}\b")
+TOKEN_SPLIT_RE = re.compile(r"[\s,;()\[\]]+")
+LEASE_KEYWORDS = {"at", "on", "ether", "dynamic", "static", "incomplete", "permanent"}
+
+
+def _address_rows(filters) -> list[dict]:
+    """Run the same filter against every table that carries network addresses, as one UNION query."""
+    querysets = [
+        model.objects.filter(**filters).values(*ADDRESS_FIELDS)
+        for _, model in NETWORK_SOURCES
+    ]
+    return list(querysets[0].union(*querysets[1:], all=True).order_by("ip_address", "asset_id"))
+
+
+def assets_in_subnet(cidr: str) -> list[dict]:
+    return _address_rows({"ip_address__in_subnet": cidr})
+
+
+def assets_by_mac(mac: str) -> list[dict]:
+    normalized = normalize_mac(mac)
+    if not normalized:
+        return []
+    return _address_rows({"mac_address": normalized})
+
+
+def duplicate_ips() -> list[tuple[str, list[int]]]:
+    """IP addresses recorded on more than one asset across computers and network devices."""
+    union_sql = " UNION ALL ".join(
+        f"SELECT ip_address, asset_id FROM {model._meta.db_table} WHERE ip_address IS NOT NULL"
+        for _, model in NETWORK_SOURCES
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT host(ip_address), array_agg(asset_id ORDER BY asset_id) FROM ({union_sql}) addresses "
+            "GROUP BY ip_address HAVING COUNT(*) > 1 ORDER BY ip_address"
+        )
+        return [(ip, list(asset_ids)) for ip, asset_ids in cursor.fetchall()]
+
+
+def parse_lease_line(line: str) -> tuple[str | None, str | None, str]:
+    """Extract (ip, mac, hostname) from a dnsmasq/ISC/ARP/CSV line. Hostname is best effort."""
+    mac_match = MAC_TOKEN_RE.search(line)
+    mac = normalize_mac(mac_match.group(0)) if mac_match else None
+    ip = None
+    hostname = ""
+    previous = ""
+    for token in TOKEN_SPLIT_RE.split(line.strip()):
+        if not token or (mac_match and token == mac_match.group(0)):
+            continue
+        if ip is None:
+            try:
+                ip = str(ipaddress.ip_address(token))
+                continue
+            except ValueError:
+                pass
+        if not hostname and previous != "on" and token.lower() not in LEASE_KEYWORDS and ":" not in token and any(ch.isalpha() for ch in token):
+            hostname = token
+        previous = token.lower()
+    return ip, mac or None, hostname
+
+
+def reconcile_leases(lines):
+    """Compare an ARP/DHCP export against recorded addresses in a single pass over the file.
+
+    Known addresses are loaded once into dicts; the file itself is consumed line by line so
+    exports of any size stream through. Yields finding dicts with kind UNKNOWN or MISMATCH.
+    """
+    by_mac = {}
+    by_ip = {}
+    for _, model in NETWORK_SOURCES:
+        for asset_id, ip, mac in model.objects.filter(asset__decommission_record__isnull=True).values_list("asset_id", "ip_address", "mac_address").iterator(chunk_size=5000):
+            if mac:
+                by_mac[mac] = (asset_id, ip)
+            if ip:
+                by_ip[ip] = (asset_id, mac)
+
+    for line_no, line in enumerate(lines, start=1):
+        ip, mac, hostname = parse_lease_line(line)
+        if ip is None or mac is None:
+            continue
+        known = by_mac.get(mac)
+        holder = by_ip.get(ip)
+        if known is None:
+            if holder is None:
+                yield {"kind": "UNKNOWN", "line": line_no, "ip": ip, "mac": mac, "hostname": hostname, "asset_id": None, "detail": "Device not in inventory"}
+            else:
+                yield {"kind": "MISMATCH", "line": line_no, "ip": ip, "mac": mac, "hostname": hostname, "asset_id": holder[0], "detail": f"IP recorded for asset with MAC {holder[1] or '-'}"}
+        elif known[1] and known[1] != ip:
+            yield {"kind": "MISMATCH", "line": line_no, "ip": ip, "mac": mac, "hostname": hostname, "asset_id": known[0], "detail": f"Recorded IP {known[1]}"}
@@ -0,0 +1,158 @@
+"""Offboarding: move everything a departing employee holds to a successor in one transaction.
+
+The preview is the single holdings query also used by the employee holdings page. The
+transfer locks those asset rows, rewrites responsibility and current assignments with
+set-based updates, writes events and outbox messages in bulk, and returns a handover summary
+signed with the project secret so an exported copy can be checked later.
+"""
+import json
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Subquery
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from core.invalidation import publish
+from employees.models import Employee
+
+from .detail import invalidate_asset_detail
+from .models import Asset, AssetAssignment, AssetEvent
+from .outbox import enqueue_many
+
+HANDOVER_SALT = "assets.offboarding.handover"
+BATCH_SIZE = 1000
+RESPONSIBLE_WORKER_TYPES = {Employee.WorkerType.NOMBRADO, Employee.WorkerType.CAS}
+
+
+def holdings_queryset(employee):
+    """Assets the employee is responsible for or currently holds; `held_assignment_id` is set for the latter."""
+    current = AssetAssignment.objects.filter(asset=OuterRef("pk"), is_current=True, assigned_employee=employee)
+    return (
+        Asset.objects.filter(Q(responsible_employee=employee) | Exists(current))
+        .select_related("category", "location", "status")
+        .annotate(
+            assigned_since=Subquery(current.values("start_at")[:1]),
+            held_assignment_id=Subquery(current.values("pk")[:1]),
+        )
+        .order_by("category__name", "id")
+    )
+
+
+def offboard_employee(*, employee, target, reason, actor=None, deactivate: bool = True) -> dict:
+    """Transfer responsibility and current assignments from `employee` to `target`; return the signed handover."""
+    if target.pk == employee.pk:
+        raise ValidationError("The successor must be a different employee.")
+    if not target.is_active:
+        raise ValidationError("The successor must be an active employee.")
+    # Same worker-type rule AssetAssignment.clean() applies; bulk_create skips it.
+    AssetAssignment(assigned_employee=target, reason=reason).clean()
+
+    now = timezone.now()
+    with transaction.atomic():
+        holdings = list(holdings_queryset(employee).select_for_update(of=("self",)))
+        responsible = [asset for asset in holdings if asset.responsible_employee_id == employee.pk]
+        held = [asset for asset in holdings if asset.held_assignment_id is not None]
+        # Asset.clean() rule for responsibility, which the set-based update below would skip.
+        if responsible and target.worker_type not in RESPONSIBLE_WORKER_TYPES:
+            raise ValidationError("The successor must be NOMBRADO or CAS to take over responsibility for assets.")
+
+        Asset.objects.filter(responsible_employee=employee).update(responsible_employee=target, updated_at=now)
+        AssetAssignment.objects.filter(assigned_employee=employee, is_current=True).update(is_current=False, end_at=now, updated_at=now)
+        new_assignments = AssetAssignment.objects.bulk_create(
+            [AssetAssignment(asset_id=asset.pk, assigned_employee=target, reason=reason, is_current=True) for asset in held],
+            batch_size=BATCH_SIZE,
+        )
+
+        AssetEvent.objects.bulk_create(
+            [
+                AssetEvent(
+                    asset_id=asset.pk,
+                    event_type=AssetEvent.EventType.REASSIGNED,
+                    description=f"Offboarding of {employee}: {_moved_parts(asset, employee)} -> {target}",
+                    created_by=actor,
+                )
+                for asset in holdings
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        enqueue_many(
+            "asset.responsible_changed",
+            [
+                (asset.pk, {"public_id": asset.public_id, "previous_employee_dni": employee.dni, "employee_dni": target.dni})
+                for asset in responsible
+            ],
+        )
+        enqueue_many(
+            "asset.reassigned",
+            [
+                (
+                    asset.pk,
+                    {
+                        "public_id": asset.public_id,
+                        "assignment_id": assignment.pk,
+                        "previous_employee_dni": employee.dni,
+                        "employee_dni": target.dni,
+                        "reason": reason.name,
+                    },
+                )
+                for asset, assignment in zip(held, new_assignments)
+            ],
+        )
+        if deactivate and employee.is_active:
+            employee.is_active = False
+            employee.save(update_fields=["is_active", "updated_at"])
+
+        invalidate_asset_detail()
+        publish("assets")
+        publish("dashboard")
+
+    return sign_handover(
+        {
+            "employee": {"dni": employee.dni, "name": str(employee)},
+            "successor": {"dni": target.dni, "name": str(target)},
+            "reason": reason.name,
+            "performed_at": now,
+            "performed_by": actor.get_username() if actor else "",
+            "employee_deactivated": deactivate,
+            "assets": [
+                {
+                    "id": asset.pk,
+                    "public_id": asset.public_id,
+                    "label": str(asset),
+                    "category": asset.category.name,
+                    "responsible_moved": asset.responsible_employee_id == employee.pk,
+                    "assignment_moved": asset.held_assignment_id is not None,
+                }
+                for asset in holdings
+            ],
+        }
+    )
+
+
+def _moved_parts(asset, employee) -> str:
+    parts = []
+    if asset.responsible_employee_id == employee.pk:
+        parts.append("responsibility")
+    if asset.held_assignment_id is not None:
+        parts.append("assignment")
+    return " and ".join(parts)
+
+
+def _canonical(summary: dict) -> str:
+    return json.dumps(summary, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+
+
+def sign_handover(summary: dict) -> dict:
+    """Return the summary as plain JSON data plus a `signature` over its canonical form."""
+    document = json.loads(_canonical(summary))
+    document["signature"] = signing.Signer(salt=HANDOVER_SALT).signature(_canonical(document))
+    return document
+
+
+def verify_handover(document: dict) -> bool:
+    summary = {key: value for key, value in document.items() if key != "signature"}
+    expected = signing.Signer(salt=HANDOVER_SALT).signature(_canonical(summary))
+    return constant_time_compare(expected, document.get("signature", ""))
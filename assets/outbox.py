@@ -0,0 +1,137 @@
+"""Transactional outbox: events are stored with the change that caused them and pushed to webhooks later."""
+import hashlib
+import hmac
+import json
+import urllib.error
+import urllib.request
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import OutboxDelivery, OutboxMessage, WebhookEndpoint
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 6 * 60 * 60
+CLAIM_SECONDS = 60
+REQUEST_TIMEOUT_SECONDS = 10
+SIGNATURE_HEADER = "X-Inventory-Signature"
+
+
+def enqueue(topic: str, *, asset=None, payload: dict) -> OutboxMessage:
+    """Record an event for every subscribed endpoint. Call inside the transaction that makes the change."""
+    message = OutboxMessage.objects.create(topic=topic, asset=asset, payload=payload)
+    endpoints = [endpoint for endpoint in WebhookEndpoint.objects.filter(is_active=True) if endpoint.accepts(topic)]
+    OutboxDelivery.objects.bulk_create([OutboxDelivery(message=message, endpoint=endpoint) for endpoint in endpoints])
+    return message
+
+
+def enqueue_many(topic: str, events: list[tuple[int, dict]]) -> int:
+    """Bulk `enqueue` for set-based changes: one message per (asset_id, payload), deliveries in batches."""
+    if not events:
+        return 0
+    messages = OutboxMessage.objects.bulk_create(
+        [OutboxMessage(topic=topic, asset_id=asset_id, payload=payload) for asset_id, payload in events], batch_size=1000
+    )
+    endpoints = [endpoint for endpoint in WebhookEndpoint.objects.filter(is_active=True) if endpoint.accepts(topic)]
+    OutboxDelivery.objects.bulk_create(
+        [OutboxDelivery(message=message, endpoint=endpoint) for message in messages for endpoint in endpoints], batch_size=1000
+    )
+    return len(messages)
+
+
+def sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def post_batch(endpoint: WebhookEndpoint, body: bytes) -> str:
+    """POST one batch; return an error description, or "" on a 2xx response."""
+    request = urllib.request.Request(
+        endpoint.url,
+        data=body,
+        method="POST",
+        headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign(endpoint.secret, body)},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS):
+            return ""
+    except urllib.error.HTTPError as exc:
+        return f"HTTP {exc.code}"
+    except (urllib.error.URLError, OSError) as exc:
+        return str(getattr(exc, "reason", exc))
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def _claim_batch(endpoint: WebhookEndpoint, now) -> list[OutboxDelivery]:
+    """Lease the next due deliveries of `endpoint`, oldest first.
+
+    Claims are serialized per endpoint by locking its row, and a claimed delivery has its
+    next_attempt_at pushed forward, so concurrent dispatchers never send the same event.
+    A delivery is held back while an earlier one for the same asset is in flight or
+    backing off, so a receiver always sees an asset's events in order.
+    """
+    blocked_by_earlier = OutboxDelivery.objects.filter(
+        endpoint=endpoint,
+        status=OutboxDelivery.DeliveryStatus.PENDING,
+        next_attempt_at__gt=now,
+        message__asset_id=OuterRef("message__asset_id"),
+        message_id__lt=OuterRef("message_id"),
+    )
+    with transaction.atomic():
+        if not WebhookEndpoint.objects.select_for_update(skip_locked=True).filter(pk=endpoint.pk).exists():
+            return []
+        deliveries = list(
+            OutboxDelivery.objects.filter(endpoint=endpoint, status=OutboxDelivery.DeliveryStatus.PENDING, next_attempt_at__lte=now)
+            .exclude(Exists(blocked_by_earlier))
+            .select_related("message")
+            .order_by("message_id")[: endpoint.batch_size]
+        )
+        OutboxDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS))
+    return deliveries
+
+
+def dispatch_endpoint(endpoint: WebhookEndpoint, *, send=post_batch, now=None) -> dict:
+    """Send due deliveries of one endpoint in batches until none are left or a batch fails."""
+    now = now or timezone.now()
+    delivered = failed = 0
+    while True:
+        deliveries = _claim_batch(endpoint, now)
+        if not deliveries:
+            break
+        events = [
+            {"id": d.message_id, "topic": d.message.topic, "asset_id": d.message.asset_id, "created_at": d.message.created_at, "payload": d.message.payload}
+            for d in deliveries
+        ]
+        body = json.dumps({"endpoint": endpoint.name, "events": events}, cls=DjangoJSONEncoder).encode()
+        error = send(endpoint, body)
+        if not error:
+            OutboxDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(
+                status=OutboxDelivery.DeliveryStatus.DELIVERED, delivered_at=timezone.now(), last_error=""
+            )
+            delivered += len(deliveries)
+            continue
+        for delivery in deliveries:
+            delivery.attempts += 1
+            delivery.last_error = error[:500]
+            delivery.next_attempt_at = now + backoff(delivery.attempts)
+            if delivery.attempts >= MAX_ATTEMPTS:
+                delivery.status = OutboxDelivery.DeliveryStatus.FAILED
+        OutboxDelivery.objects.bulk_update(deliveries, ["attempts", "last_error", "next_attempt_at", "status"])
+        failed += len(deliveries)
+        break
+    return {"delivered": delivered, "failed": failed}
+
+
+def dispatch_pending(*, send=post_batch, now=None) -> dict:
+    totals = {"delivered": 0, "failed": 0}
+    for endpoint in WebhookEndpoint.objects.filter(is_active=True):
+        result = dispatch_endpoint(endpoint, send=send, now=now)
+        totals["delivered"] += result["delivered"]
+        totals["failed"] += result["failed"]
+    return totals
@@ -0,0 +1,175 @@
+"""Reliability analytics: MTBF, MTTR and failure rates per category, brand/model and location.
+
+A failure is a CORRECTIVE maintenance record opened inside the window. Each asset contributes
+the days it was in service during the window (from its acquisition or registration until its
+decommission date), so MTBF is operating days per failure and the failure rate is failures
+per asset-year. MTTR is the mean open-to-close time of the failures already closed. The
+brand and model come from the peripheral details, falling back to the `brand`/`model` attributes.
+
+All three groupings come out of one query with GROUPING SETS. The result is stored as
+ReliabilitySnapshot rows by the nightly `snapshot_reliability` command, and the report reads
+the latest snapshot instead of scanning the maintenance history on every request.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Category, Location
+
+from .models import Asset, DecommissionRecord, MaintenanceRecord, PeripheralDetails, ReliabilitySnapshot, ReplacementRecord
+
+DEFAULT_WINDOW_DAYS = 365
+BATCH_SIZE = 1000
+CSV_FIELDS = [
+    "dimension",
+    "category",
+    "brand",
+    "model",
+    "location",
+    "assets",
+    "operating_days",
+    "failures",
+    "mtbf_days",
+    "mttr_hours",
+    "failures_per_asset_year",
+    "replacements",
+    "decommissions",
+    "window_days",
+    "computed_on",
+]
+
+RELIABILITY_SQL = """
+WITH scope AS (
+    SELECT
+        a.id,
+        c.name AS category,
+        COALESCE(NULLIF(p.brand, ''), a.attributes ->> 'brand', '') AS brand,
+        COALESCE(NULLIF(p.model, ''), a.attributes ->> 'model', '') AS model,
+        l.exact_name AS location,
+        LEAST(COALESCE(d.decommission_date, %(end)s), %(end)s)
+            - GREATEST(COALESCE(a.acquisition_date, a.registered_at::date), %(start)s) AS operating_days,
+        COALESCE(d.decommission_date >= %(start)s AND d.decommission_date < %(end)s, false) AS decommissioned
+    FROM {asset} a
+    JOIN {category} c ON c.id = a.category_id
+    JOIN {location} l ON l.id = a.location_id
+    LEFT JOIN {peripheral} p ON p.asset_id = a.id
+    LEFT JOIN {decommission} d ON d.asset_id = a.id
+    WHERE COALESCE(a.acquisition_date, a.registered_at::date) < %(end)s
+      AND (d.decommission_date IS NULL OR d.decommission_date >= %(start)s)
+),
+failures AS (
+    SELECT
+        asset_id,
+        COUNT(*) AS failures,
+        COUNT(closed_at) AS repairs,
+        SUM(EXTRACT(EPOCH FROM closed_at - opened_at)) AS repair_seconds
+    FROM {maintenance}
+    WHERE maintenance_type = %(corrective)s AND opened_at >= %(start_at)s AND opened_at < %(end_at)s
+    GROUP BY asset_id
+),
+replacements AS (
+    SELECT asset_id, COUNT(*) AS replacements
+    FROM {replacement}
+    WHERE replacement_date >= %(start)s AND replacement_date < %(end)s
+    GROUP BY asset_id
+)
+SELECT
+    GROUPING(s.location) = 0 AS by_location,
+    GROUPING(s.brand) = 0 AS by_model,
+    s.category,
+    s.brand,
+    s.model,
+    s.location,
+    COUNT(*),
+    SUM(GREATEST(s.operating_days, 0))::bigint,
+    COALESCE(SUM(f.failures), 0)::integer,
+    SUM(f.repairs)::integer,
+    SUM(f.repair_seconds)::float,
+    COALESCE(SUM(r.replacements), 0)::integer,
+    COUNT(*) FILTER (WHERE s.decommissioned)
+FROM scope s
+LEFT JOIN failures f ON f.asset_id = s.id
+LEFT JOIN replacements r ON r.asset_id = s.id
+GROUP BY GROUPING SETS ((s.category), (s.category, s.brand, s.model), (s.location))
+""".format(
+    asset=Asset._meta.db_table,
+    category=Category._meta.db_table,
+    location=Location._meta.db_table,
+    peripheral=PeripheralDetails._meta.db_table,
+    decommission=DecommissionRecord._meta.db_table,
+    maintenance=MaintenanceRecord._meta.db_table,
+    replacement=ReplacementRecord._meta.db_table,
+)
+
+
+def compute_reliability(*, computed_on=None, window_days: int = DEFAULT_WINDOW_DAYS) -> list[ReliabilitySnapshot]:
+    """Unsaved snapshot rows for the `window_days` days before `computed_on` (default today)."""
+    end = computed_on or timezone.localdate()
+    start = end - timedelta(days=window_days)
+    params = {
+        "start": start,
+        "end": end,
+        "start_at": timezone.make_aware(datetime.combine(start, time.min)),
+        "end_at": timezone.make_aware(datetime.combine(end, time.min)),
+        "corrective": MaintenanceRecord.MaintenanceType.CORRECTIVE,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(RELIABILITY_SQL, params)
+        rows = cursor.fetchall()
+
+    snapshots = []
+    for by_location, by_model, category, brand, model, location, assets, operating_days, failures, repairs, repair_seconds, replacements, decommissions in rows:
+        if by_location:
+            dimension, category, brand, model = ReliabilitySnapshot.Dimension.LOCATION, "", "", ""
+        elif by_model:
+            dimension, location = ReliabilitySnapshot.Dimension.MODEL, ""
+        else:
+            dimension, brand, model, location = ReliabilitySnapshot.Dimension.CATEGORY, "", "", ""
+        snapshots.append(
+            ReliabilitySnapshot(
+                computed_on=end,
+                window_days=window_days,
+                dimension=dimension,
+                category=category,
+                brand=brand,
+                model=model,
+                location=location,
+                assets=assets,
+                operating_days=operating_days,
+                failures=failures,
+                replacements=replacements,
+                decommissions=decommissions,
+                mtbf_days=round(operating_days / failures, 1) if failures else None,
+                mttr_hours=round(repair_seconds / repairs / 3600, 1) if repairs else None,
+                failures_per_asset_year=round(failures * 365 / operating_days, 3) if operating_days else None,
+            )
+        )
+    return snapshots
+
+
+def snapshot_reliability(*, computed_on=None, window_days: int = DEFAULT_WINDOW_DAYS) -> list[ReliabilitySnapshot]:
+    """Compute and store the snapshot for `computed_on`, replacing any earlier run of the same day."""
+    day = computed_on or timezone.localdate()
+    snapshots = compute_reliability(computed_on=day, window_days=window_days)
+    with transaction.atomic():
+        ReliabilitySnapshot.objects.filter(computed_on=day).delete()
+        ReliabilitySnapshot.objects.bulk_create(snapshots, batch_size=BATCH_SIZE)
+    return snapshots
+
+
+def latest_snapshot(dimension=None):
+    """Rows of the most recent snapshot day, least reliable first (highest failure rate)."""
+    day = ReliabilitySnapshot.objects.order_by("-computed_on").values_list("computed_on", flat=True).first()
+    if day is None:
+        return ReliabilitySnapshot.objects.none()
+    qs = ReliabilitySnapshot.objects.filter(computed_on=day)
+    if dimension:
+        qs = qs.filter(dimension=dimension)
+    return qs.order_by("dimension", F("failures_per_asset_year").desc(nulls_last=True), "category", "brand", "model", "location")
+
+
+def csv_row(snapshot: ReliabilitySnapshot) -> dict:
+    values = {field: getattr(snapshot, field) for field in CSV_FIELDS}
+    return {field: "" if value is None else value for field, value in values.items()}
@@ -1,32 +1,48 @@
-from .models import Asset
+from asgiref.sync import sync_to_async
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+from .lineage import current_successors
+from .models import Asset, AssetAssignment
+
+
+def safe_rows_queryset():
+    current_assignee = AssetAssignment.objects.filter(asset=OuterRef("pk"), is_current=True).annotate(
+        full_name=Concat("assigned_employee__first_name", Value(" "), "assigned_employee__last_name", output_field=CharField())
+    )
+    return (
+        Asset.objects.select_related("category", "location", "status", "responsible_employee", "sensitive_data")
+        .annotate(current_assigned=Subquery(current_assignee.values("full_name")[:1]))
+        .order_by("id")
+    )
+
+
+def safe_row(asset: Asset, successors: dict) -> dict:
+    return {
+        "id": asset.id,
+        "category": asset.category.name,
+        "location": asset.location.exact_name,
+        "status": asset.status.name,
+        "responsible": f"{asset.responsible_employee.first_name} {asset.responsible_employee.last_name}".strip(),
+        "current_assigned": (asset.current_assigned or "").strip(),
+        "asset_tag_internal": asset.asset_tag_internal or "",
+        "control_patrimonial": asset.control_patrimonial or "",
+        "serial": asset.serial or "",
+        "ownership_type": asset.ownership_type,
+        "provider_name": asset.provider_name or "",
+        "has_padlock_key": "Yes" if asset.has_padlock_key else "No",
+        "has_license": "Yes" if asset.has_license else "No",
+        "current_successor": ", ".join(successors.get(asset.id, [])),
+    }
 
 
 def get_asset_safe_rows():
-    rows = []
-    qs = Asset.objects.select_related("category", "location", "status", "responsible_employee")
-    for asset in qs:
-        rows.append(
-            {
-                "id": asset.id,
-                "category": asset.category.name,
-                "location": asset.location.exact_name,
-                "status": asset.status.name,
-                "responsible": f"{asset.responsible_employee.first_name} {asset.responsible_employee.last_name}".strip(),
-                "current_assigned": _current_assigned_name(asset),
-                "asset_tag_internal": asset.asset_tag_internal or "",
-                "control_patrimonial": asset.control_patrimonial or "",
-                "serial": asset.serial or "",
-                "ownership_type": asset.ownership_type,
-                "provider_name": asset.provider_name or "",
-                "has_padlock_key": "Yes" if asset.has_padlock_key else "No",
-                "has_license": "Yes" if asset.has_license else "No",
-            }
-        )
-    return rows
-
-
-def _current_assigned_name(asset: Asset) -> str:
-    current = asset.assignments.filter(is_current=True).select_related("assigned_employee").first()
-    if not current or not current.assigned_employee:
-        return ""
-    return f"{current.assigned_employee.first_name} {current.assigned_employee.last_name}".strip()
+    successors = current_successors()
+    return [safe_row(asset, successors) for asset in safe_rows_queryset()]
+
+
+async def aiter_asset_safe_rows(chunk_size=500):
+    # Every replacement chain is resolved up front in one query; only replaced assets appear in it.
+    successors = await sync_to_async(current_successors)()
+    async for asset in safe_rows_queryset().aiterator(chunk_size=chunk_size):
+        yield safe_row(asset, successors)
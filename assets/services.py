@@ -2,10 +2,54 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
 
+from core.invalidation import publish
 from core.models import AssignmentReason
 from employees.models import Employee
 
-from .models import Asset, AssetAssignment, AssetEvent
+from .detail import invalidate_asset_detail
+from .fields import normalize_mac
+from .models import (
+    Asset,
+    AssetAssignment,
+    AssetEvent,
+    CameraDetails,
+    ComputerSpecs,
+    NetworkDeviceDetails,
+    PeripheralDetails,
+    PrinterDetails,
+    TeleconferenceDetails,
+)
+from .outbox import enqueue, enqueue_many
+
+COMPUTER_CATEGORIES = {"CPU", "Laptop", "Server"}
+NETWORK_CATEGORIES = {"Switch", "Access Point", "Router"}
+PERIPHERAL_CATEGORIES = {"Monitor", "Keyboard", "Teclado", "Webcam", "Headphones", "Microphone", "PC Speaker", "Projector", "Interactive Whiteboard", "Air Conditioner", "Biometric Clock", "Tablet", "Sound Console"}
+
+
+def build_detail_record(asset: Asset, payload: dict, category_name: str):
+    """Unsaved detail row for the category from the wizard details payload, or None when the category has none."""
+    if category_name in COMPUTER_CATEGORIES:
+        return ComputerSpecs(
+            asset=asset,
+            cpu_model=payload.get("processor") or payload.get("model") or "N/A",
+            ram_gb=payload.get("ram_total_gb") or 0,
+            storage_gb=0,
+            os_name=payload.get("os_name") or "",
+            ip_address=payload.get("ip") or None,
+            mac_address=normalize_mac(payload.get("mac")),
+            hostname=(payload.get("host") or "").strip().lower(),
+        )
+    if category_name in PERIPHERAL_CATEGORIES:
+        return PeripheralDetails(asset=asset, brand=payload.get("brand") or "", model=payload.get("model") or "")
+    if category_name == "Printer":
+        return PrinterDetails(asset=asset, print_technology=payload.get("brand") or "", ppm=0)
+    if category_name in NETWORK_CATEGORIES:
+        return NetworkDeviceDetails(asset=asset, managed=bool(payload.get("managed_by_text")), wifi_standard="", ip_address=payload.get("ip") or None)
+    if category_name == "Teleconference":
+        return TeleconferenceDetails(asset=asset)
+    if category_name == "Security Camera":
+        return CameraDetails(asset=asset)
+    return None
 
 
 def assign_asset(*, asset: Asset, reason: AssignmentReason, assigned_employee: Employee | None, actor=None, note: str = "") -> AssetAssignment:
@@ -35,6 +79,16 @@ def assign_asset(*, asset: Asset, reason: AssignmentReason, assigned_employee: E
             description=desc,
             created_by=actor,
         )
+        enqueue(
+            "asset.assigned",
+            asset=asset,
+            payload={
+                "public_id": asset.public_id,
+                "assignment_id": assignment.pk,
+                "employee_dni": assigned_employee.dni if assigned_employee else None,
+                "reason": reason.name,
+            },
+        )
         return assignment
 
 
@@ -50,7 +104,7 @@ def reassign_asset(*, asset: Asset, reason: AssignmentReason, new_assigned_emplo
         if current:
             current.is_current = False
             current.end_at = timezone.now()
-            current.save(update_fields=["is_current", "end_at"])
+            current.save(update_fields=["is_current", "end_at", "updated_at"])
 
         new_assignment = AssetAssignment.objects.create(
             asset=asset,
@@ -68,4 +122,67 @@ def reassign_asset(*, asset: Asset, reason: AssignmentReason, new_assigned_emplo
             description=desc,
             created_by=actor,
         )
+        enqueue(
+            "asset.reassigned",
+            asset=asset,
+            payload={
+                "public_id": asset.public_id,
+                "assignment_id": new_assignment.pk,
+                "previous_employee_dni": current.assigned_employee.dni if current and current.assigned_employee else None,
+                "employee_dni": new_assigned_employee.dni if new_assigned_employee else None,
+                "reason": reason.name,
+            },
+        )
         return new_assignment
+
+
+def bulk_reassign_assets(*, asset_ids, reason: AssignmentReason, new_assigned_employee: Employee | None, actor=None, note: str = "") -> list[AssetAssignment]:
+    """reassign_asset() for many assets: one UPDATE closes the current assignments, then bulk inserts.
+
+    Bulk writes skip model signals, so the caches are invalidated here.
+    """
+    if new_assigned_employee is not None:
+        AssetAssignment(assigned_employee=new_assigned_employee, reason=reason).clean()
+    now = timezone.now()
+    with transaction.atomic():
+        assets = list(Asset.objects.select_for_update().filter(pk__in=asset_ids).order_by("id").only("id", "public_id"))
+        current = {
+            assignment.asset_id: assignment
+            for assignment in AssetAssignment.objects.filter(asset__in=assets, is_current=True).select_related("assigned_employee")
+        }
+        AssetAssignment.objects.filter(pk__in=[assignment.pk for assignment in current.values()]).update(is_current=False, end_at=now, updated_at=now)
+        new_assignments = AssetAssignment.objects.bulk_create(
+            [AssetAssignment(asset=asset, assigned_employee=new_assigned_employee, reason=reason, is_current=True) for asset in assets]
+        )
+
+        after = str(new_assigned_employee) if new_assigned_employee else "Unassigned"
+        events, messages = [], []
+        for asset, assignment in zip(assets, new_assignments):
+            previous = current.get(asset.pk)
+            previous_employee = previous.assigned_employee if previous else None
+            events.append(
+                AssetEvent(
+                    asset=asset,
+                    event_type=AssetEvent.EventType.REASSIGNED,
+                    description=note or f"Reassigned: {previous_employee or 'Unassigned'} -> {after}",
+                    created_by=actor,
+                )
+            )
+            messages.append(
+                (
+                    asset.pk,
+                    {
+                        "public_id": asset.public_id,
+                        "assignment_id": assignment.pk,
+                        "previous_employee_dni": previous_employee.dni if previous_employee else None,
+                        "employee_dni": new_assigned_employee.dni if new_assigned_employee else None,
+                        "reason": reason.name,
+                    },
+                )
+            )
+        AssetEvent.objects.bulk_create(events)
+        enqueue_many("asset.reassigned", messages)
+        invalidate_asset_detail()
+        publish("assets")
+        publish("dashboard")
+        return new_assignments
@@ -0,0 +1,86 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.invalidation import publish
+
+from .detail import invalidate_asset_detail
+from .fragments import ASSIGNMENT_TABLES, CONSUMABLE_TABLES, MAINTENANCE_TABLES
+from .models import (
+    Asset,
+    AssetAssignment,
+    AssetSensitiveData,
+    CameraDetails,
+    ComputerSpecs,
+    ConsumableItem,
+    ConsumableMovement,
+    DecommissionRecord,
+    DeletionTombstone,
+    MaintenanceRecord,
+    NetworkDeviceDetails,
+    PeripheralDetails,
+    PrinterDetails,
+    ReplacementRecord,
+    TeleconferenceDetails,
+)
+
+DASHBOARD_MODELS = (Asset, AssetAssignment, MaintenanceRecord, DecommissionRecord, ConsumableItem, ConsumableMovement)
+DETAIL_DEPENDENT_MODELS = (
+    AssetAssignment,
+    MaintenanceRecord,
+    ReplacementRecord,
+    DecommissionRecord,
+    AssetSensitiveData,
+    ComputerSpecs,
+    PeripheralDetails,
+    PrinterDetails,
+    NetworkDeviceDetails,
+    TeleconferenceDetails,
+    CameraDetails,
+)
+TABLE_NAMESPACES = {
+    AssetAssignment: ASSIGNMENT_TABLES,
+    MaintenanceRecord: MAINTENANCE_TABLES,
+    ConsumableItem: CONSUMABLE_TABLES,
+    ConsumableMovement: CONSUMABLE_TABLES,
+}
+TOMBSTONE_RESOURCES = {
+    Asset: "assets",
+    AssetAssignment: "assignments",
+    MaintenanceRecord: "maintenance",
+    ConsumableMovement: "consumable_movements",
+}
+
+
+def record_tombstone(sender, instance, **kwargs):
+    DeletionTombstone.objects.create(resource=TOMBSTONE_RESOURCES[sender], object_id=instance.pk)
+
+
+# Connected per sender: a post_delete receiver without one disables fast deletes for every model.
+for model in TOMBSTONE_RESOURCES:
+    post_delete.connect(record_tombstone, sender=model, dispatch_uid=f"tombstone_{model._meta.label_lower}")
+
+
+def refresh_dashboard(sender, **kwargs):
+    publish("dashboard")
+
+
+for model in DASHBOARD_MODELS:
+    for signal in (post_save, post_delete):
+        signal.connect(refresh_dashboard, sender=model, dispatch_uid=f"dashboard_{model._meta.label_lower}_{signal is post_save}")
+
+
+def refresh_asset_detail(sender, instance, **kwargs):
+    invalidate_asset_detail(instance.pk if sender is Asset else instance.asset_id)
+
+
+for model in (Asset, *DETAIL_DEPENDENT_MODELS):
+    for signal in (post_save, post_delete):
+        signal.connect(refresh_asset_detail, sender=model, dispatch_uid=f"asset_detail_{model._meta.label_lower}_{signal is post_save}")
+
+
+def refresh_tables(sender, **kwargs):
+    publish(TABLE_NAMESPACES[sender])
+
+
+for model in TABLE_NAMESPACES:
+    for signal in (post_save, post_delete):
+        signal.connect(refresh_tables, sender=model, dispatch_uid=f"tables_{model._meta.label_lower}_{signal is post_save}")
@@ -0,0 +1,75 @@
+"""Workstations: the assets that share a station code (CPU, monitor, keyboard and peripherals).
+
+Codes are compared upper-cased, which the asset_station_code_idx expression index serves.
+A station is complete when it has a computer, a monitor and a keyboard, or a laptop;
+decommissioned assets do not count. Moves and reassignments go through the bulk services,
+so a whole station changes with a handful of queries.
+"""
+from django.db.models import Count, F, FilteredRelation, Q
+from django.db.models.functions import Upper
+
+from .bulk import bulk_edit_assets
+from .models import Asset
+from .services import bulk_reassign_assets
+
+STATION_COMPONENTS = {
+    "computers": {"CPU"},
+    "monitors": {"Monitor"},
+    "keyboards": {"Keyboard", "Teclado"},
+}
+SELF_CONTAINED_CATEGORIES = {"Laptop"}
+
+
+def normalize_station_code(code) -> str:
+    return (code or "").strip().upper()
+
+
+def station_queryset(code):
+    return Asset.objects.alias(station=Upper("station_code")).filter(station=normalize_station_code(code))
+
+
+def station_components(code) -> list[Asset]:
+    """Every asset of the station with its current assignee, in one query."""
+    return list(
+        station_queryset(code)
+        .select_related("category", "location", "status", "responsible_employee")
+        .annotate(
+            current=FilteredRelation("assignments", condition=Q(assignments__is_current=True)),
+            assigned_since=F("current__start_at"),
+            assignee_first_name=F("current__assigned_employee__first_name"),
+            assignee_last_name=F("current__assigned_employee__last_name"),
+        )
+        .order_by("category__name", "id")
+    )
+
+
+def station_summaries():
+    """Component counts per station code, as one grouped query."""
+    counts = {
+        name: Count("id", filter=Q(category__name__in=categories))
+        for name, categories in {**STATION_COMPONENTS, "laptops": SELF_CONTAINED_CATEGORIES}.items()
+    }
+    return (
+        Asset.objects.filter(station_code__isnull=False, decommission_record__isnull=True)
+        .exclude(station_code="")
+        .annotate(station=Upper("station_code"))
+        .values("station")
+        .annotate(components=Count("id"), **counts)
+        .order_by("station")
+    )
+
+
+def incomplete_stations():
+    missing = Q()
+    for name in STATION_COMPONENTS:
+        missing |= Q(**{name: 0})
+    return station_summaries().filter(missing, laptops=0)
+
+
+def move_station(code, *, location, actor=None) -> int:
+    return bulk_edit_assets(queryset=station_queryset(code).filter(decommission_record__isnull=True), changes={"location": location}, actor=actor)
+
+
+def reassign_station(code, *, reason, assigned_employee, actor=None) -> int:
+    asset_ids = list(station_queryset(code).filter(decommission_record__isnull=True).values_list("id", flat=True))
+    return len(bulk_reassign_assets(asset_ids=asset_ids, reason=reason, new_assigned_employee=assigned_employee, actor=actor))
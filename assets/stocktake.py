@@ -0,0 +1,131 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.invalidation import publish
+
+from .detail import invalidate_asset_detail
+from .models import Asset, AssetEvent, StocktakeScan, StocktakeSession
+
+MAX_SCAN_BATCH = 10000
+MAX_CODE_LENGTH = StocktakeScan._meta.get_field("code").max_length
+IDENTIFIER_FIELDS = ("public_id", "control_patrimonial", "asset_tag_internal", "serial")
+RECONCILE_FIELDS = ("id", "public_id", "control_patrimonial", "asset_tag_internal", "serial", "location_id", "location__exact_name", "category__name")
+
+
+def normalize_codes(raw_codes) -> list[str]:
+    """Strip blanks and repeated reads while keeping the scanner order."""
+    seen = set()
+    codes = []
+    for raw in raw_codes:
+        code = str(raw or "").strip()
+        if code and code not in seen:
+            seen.add(code)
+            codes.append(code)
+    return codes
+
+
+def ingest_scans(*, session: StocktakeSession, codes, actor=None) -> dict:
+    """Store a batch of scanned codes for a session. Re-reading a code is idempotent.
+
+    Codes longer than the scan column are not stored; they come back in "rejected".
+    """
+    if not session.is_open:
+        raise ValidationError("Stocktake session is closed.")
+    codes = normalize_codes(codes)
+    if len(codes) > MAX_SCAN_BATCH:
+        raise ValidationError(f"A scan batch cannot exceed {MAX_SCAN_BATCH} codes.")
+
+    rejected = [code for code in codes if len(code) > MAX_CODE_LENGTH]
+    valid = [code for code in codes if len(code) <= MAX_CODE_LENGTH]
+    existing = set(StocktakeScan.objects.filter(session=session, code__in=valid).values_list("code", flat=True))
+    new_codes = [code for code in valid if code not in existing]
+    StocktakeScan.objects.bulk_create(
+        [StocktakeScan(session=session, code=code, scanned_by=actor) for code in new_codes],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    return {"received": len(codes), "accepted": len(new_codes), "duplicates": len(valid) - len(new_codes), "rejected": rejected}
+
+
+def _resolve_codes(codes: set[str]) -> tuple[dict[int, dict], set[str]]:
+    """Match codes against every asset identifier in one query; return (assets by id, unmatched codes)."""
+    if not codes:
+        return {}, set()
+    lookup = Q()
+    for field in IDENTIFIER_FIELDS:
+        lookup |= Q(**{f"{field}__in": codes})
+    found = {}
+    matched = set()
+    for row in Asset.objects.filter(lookup).values(*RECONCILE_FIELDS):
+        found[row["id"]] = row
+        matched.update(row[field] for field in IDENTIFIER_FIELDS if row[field] in codes)
+    return found, codes - matched
+
+
+def reconcile_session(session: StocktakeSession) -> dict:
+    """Compare scanned codes against the assets expected at the session location.
+
+    Returns missing assets (expected but not scanned), unexpected codes (no asset matches)
+    and moved assets (scanned here while the system records another location).
+    """
+    codes = set(session.scans.values_list("code", flat=True))
+    expected = {
+        row["id"]: row
+        for row in Asset.objects.filter(location_id=session.location_id, decommission_record__isnull=True).values(*RECONCILE_FIELDS)
+    }
+    found, unexpected = _resolve_codes(codes)
+
+    missing = [row for asset_id, row in expected.items() if asset_id not in found]
+    moved = [row for row in found.values() if row["location_id"] != session.location_id]
+    return {
+        "expected_count": len(expected),
+        "scanned_count": len(codes),
+        "found_count": len(found.keys() & expected.keys()),
+        "missing": sorted(missing, key=lambda row: row["id"]),
+        "unexpected": sorted(unexpected),
+        "moved": sorted(moved, key=lambda row: row["id"]),
+    }
+
+
+def apply_location_corrections(*, session: StocktakeSession, actor=None) -> int:
+    """Move every asset scanned in this session but recorded elsewhere to the session location.
+
+    Only open sessions can apply corrections, and decommissioned assets are never moved.
+    """
+    if not session.is_open:
+        raise ValidationError("Stocktake session is closed.")
+    moved = reconcile_session(session)["moved"]
+    if not moved:
+        return 0
+    target = session.location.exact_name
+    with transaction.atomic():
+        active = set(
+            Asset.objects.filter(pk__in=[row["id"] for row in moved], decommission_record__isnull=True).values_list("id", flat=True)
+        )
+        moved = [row for row in moved if row["id"] in active]
+        if not moved:
+            return 0
+        Asset.objects.filter(pk__in=active).update(location_id=session.location_id, updated_at=timezone.now())
+        invalidate_asset_detail()
+        publish("assets")
+        AssetEvent.objects.bulk_create(
+            [
+                AssetEvent(
+                    asset_id=row["id"],
+                    event_type=AssetEvent.EventType.UPDATED,
+                    description=f"Stocktake {session.campaign.name}: location {row['location__exact_name']} -> {target}",
+                    created_by=actor,
+                )
+                for row in moved
+            ],
+            batch_size=1000,
+        )
+    return len(moved)
+
+
+def close_session(*, session: StocktakeSession) -> None:
+    session.status = StocktakeSession.SessionStatus.CLOSED
+    session.closed_at = timezone.now()
+    session.save(update_fields=["status", "closed_at"])
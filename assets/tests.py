@@ -1,15 +1,67 @@
-from datetime import date
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
 
-from django.contrib.auth.models import Group, User
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser, Group, User
+from django.contrib.sessions.models import Session
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models.signals import post_delete, post_save
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
+from accounts.models import IntegrationToken
+from core import invalidation
 from core.models import AssignmentReason, Category, Location, Status
 from employees.models import Employee
 
-from .models import Asset, AssetAssignment, AssetEvent, AssetSensitiveData
+from . import detail, views
+from .attributes import attribute_filter, clean_attributes
+from .bulk import bulk_edit_assets, create_asset_batch, expand_tag_pattern, parse_identifier_lines
+from .detail import asset_detail
+from .forms import OffboardingForm
+from .fragments import ASSET_TABLES
+from .discovery import ingest_hardware_reports
+from .models import (
+    Asset,
+    AssetAssignment,
+    AssetEvent,
+    AssetSensitiveData,
+    ComputerSpecs,
+    DecommissionRecord,
+    MaintenancePlan,
+    MaintenanceRecord,
+    NetworkDeviceDetails,
+    OutboxDelivery,
+    OutboxMessage,
+    PeripheralDetails,
+    ReliabilitySnapshot,
+    ReplacementRecord,
+    StocktakeCampaign,
+    StocktakeSession,
+    WebhookEndpoint,
+)
+from .offboarding import offboard_employee, verify_handover
+from .network import assets_by_mac, assets_in_subnet, duplicate_ips, reconcile_leases
+from .lineage import asset_lineage, current_successors
+from .reliability import compute_reliability
+from .outbox import SIGNATURE_HEADER, backoff, dispatch_pending
+from .labels import code128_values, iter_label_pdf, render_label
+from .maintenance import compute_sla_metrics, due_assets, schedule_preventive
+from .live import DashboardBroadcaster, broadcaster, compute_metrics
 from .services import assign_asset, reassign_asset
+from .stations import incomplete_stations, move_station, station_components
+from .stocktake import apply_location_corrections, close_session, ingest_scans, reconcile_session
+from .typeahead import search_prefix, typeahead
 
 
 class AssetRulesTests(TestCase):
@@ -341,3 +393,1219 @@ class WizardFlowTests(TestCase):
             station_code="LAB1-01",
         )
         asset.full_clean()
+
+
+class StocktakeTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Monitor")
+        self.status = Status.objects.create(name="Operational")
+        self.room = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Lab 2")
+        self.other_room = Location.objects.create(site="Main", floor="2", type="ROOM", exact_name="Lab 3")
+        self.responsible = Employee.objects.create(dni="13131313", first_name="Rosa", last_name="Vega", worker_type=Employee.WorkerType.CAS)
+        self.here = self._mk_asset("INT-ST-001", self.room)
+        self.missing = self._mk_asset("INT-ST-002", self.room)
+        self.elsewhere = self._mk_asset("INT-ST-003", self.other_room)
+        campaign = StocktakeCampaign.objects.create(name="2026 annual")
+        self.session = StocktakeSession.objects.create(campaign=campaign, location=self.room)
+
+    def _mk_asset(self, tag, location):
+        return Asset.objects.create(
+            category=self.category,
+            location=location,
+            status=self.status,
+            asset_tag_internal=tag,
+            responsible_employee=self.responsible,
+        )
+
+    def test_ingest_is_idempotent_per_code(self):
+        first = ingest_scans(session=self.session, codes=["INT-ST-001", " INT-ST-001 ", "", "UNKNOWN-1"])
+        second = ingest_scans(session=self.session, codes=["INT-ST-001", self.elsewhere.public_id])
+        self.assertEqual(first, {"received": 2, "accepted": 2, "duplicates": 0, "rejected": []})
+        self.assertEqual(second, {"received": 2, "accepted": 1, "duplicates": 1, "rejected": []})
+        self.assertEqual(self.session.scans.count(), 3)
+
+    def test_reconcile_reports_missing_unexpected_and_moved(self):
+        ingest_scans(session=self.session, codes=["INT-ST-001", self.elsewhere.public_id, "UNKNOWN-1"])
+        result = reconcile_session(self.session)
+        self.assertEqual([row["id"] for row in result["missing"]], [self.missing.id])
+        self.assertEqual([row["id"] for row in result["moved"]], [self.elsewhere.id])
+        self.assertEqual(result["unexpected"], ["UNKNOWN-1"])
+        self.assertEqual(result["found_count"], 1)
+
+    def test_apply_corrections_moves_assets_and_records_events(self):
+        ingest_scans(session=self.session, codes=[self.elsewhere.serial or self.elsewhere.asset_tag_internal])
+        moved = apply_location_corrections(session=self.session)
+        self.elsewhere.refresh_from_db()
+        self.assertEqual(moved, 1)
+        self.assertEqual(self.elsewhere.location, self.room)
+        self.assertTrue(AssetEvent.objects.filter(asset=self.elsewhere, event_type=AssetEvent.EventType.UPDATED).exists())
+
+    def test_apply_corrections_skips_decommissioned_assets_and_closed_sessions(self):
+        retired = self._mk_asset("INT-ST-004", self.other_room)
+        DecommissionRecord.objects.create(asset=retired, reason="Broken", decommission_date=date(2026, 1, 1))
+        ingest_scans(session=self.session, codes=[self.elsewhere.asset_tag_internal, retired.asset_tag_internal])
+        self.assertEqual(apply_location_corrections(session=self.session), 1)
+        retired.refresh_from_db()
+        self.assertEqual(retired.location, self.other_room)
+
+        self.elsewhere.location = self.other_room
+        self.elsewhere.save()
+        close_session(session=self.session)
+        with self.assertRaises(ValidationError):
+            apply_location_corrections(session=self.session)
+
+        admin_group, _ = Group.objects.get_or_create(name="ADMIN")
+        user = User.objects.create_user("stock_closed", password="x")
+        user.groups.add(admin_group)
+        self.client.login(username="stock_closed", password="x")
+        resp = self.client.post(f"/assets/stocktake/sessions/{self.session.pk}/apply-corrections/", follow=True)
+        self.assertContains(resp, "Stocktake session is closed.")
+        self.elsewhere.refresh_from_db()
+        self.assertEqual(self.elsewhere.location, self.other_room)
+
+    def test_scan_endpoint_accepts_json_batches(self):
+        admin_group, _ = Group.objects.get_or_create(name="ADMIN")
+        user = User.objects.create_user("stock_admin", password="x")
+        user.groups.add(admin_group)
+        self.client.login(username="stock_admin", password="x")
+        resp = self.client.post(
+            f"/assets/stocktake/sessions/{self.session.pk}/scans/",
+            data={"codes": [f"CODE-{i}" for i in range(2500)]},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["accepted"], 2500)
+
+        too_long = "X" * 81
+        resp = self.client.post(
+            f"/assets/stocktake/sessions/{self.session.pk}/scans/",
+            data={"codes": ["Y" * 80, too_long]},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"received": 2, "accepted": 1, "duplicates": 0, "rejected": [too_long]})
+
+
+class LabelSheetTests(TestCase):
+    def test_code128_switches_to_set_c_for_trailing_digits(self):
+        values = code128_values("ASSET-00000001")
+        self.assertEqual(values[0], 104)
+        self.assertIn(99, values)
+        self.assertEqual(values[-5:-2], [0, 0, 1])
+
+    def test_pdf_stream_has_valid_cross_reference(self):
+        labels = [(f"ASSET-{i:08d}", f"INT-{i:04d}") for i in range(30)]
+        pdf = b"".join(iter_label_pdf(labels, columns=3, rows=8))
+        self.assertTrue(pdf.startswith(b"%PDF-1.4"))
+        self.assertIn(b"/Count 2", pdf)
+        xref_at = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+        self.assertTrue(pdf[xref_at:].startswith(b"xref"))
+        entries = pdf[xref_at:].split(b"\n")[3:]
+        for obj_id, entry in enumerate(entries[: pdf.count(b" 0 obj\n")], start=1):
+            offset = int(entry[:10])
+            self.assertTrue(pdf[offset:].startswith(f"{obj_id} 0 obj".encode()))
+
+    def test_rendered_labels_are_cached_per_identifier(self):
+        render_label.cache_clear()
+        list(iter_label_pdf([("ASSET-00000001", "CP-1")] * 5))
+        self.assertEqual(render_label.cache_info().misses, 1)
+        self.assertEqual(render_label.cache_info().hits, 4)
+
+    def test_label_sheet_rejects_non_numeric_filters(self):
+        viewer_group, _ = Group.objects.get_or_create(name="VIEWER")
+        user = User.objects.create_user("label_viewer", password="x")
+        user.groups.add(viewer_group)
+        self.client.login(username="label_viewer", password="x")
+        self.assertEqual(self.client.get("/assets/labels.pdf", {"location": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get("/assets/labels.pdf", {"category": "1;2"}).status_code, 400)
+        response = self.client.get("/assets/labels.pdf", {"location": "1", "category": ""})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF-1.4"))
+
+
+class DiscoveryIngestTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="CPU")
+        self.location = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Lab 4")
+        self.status = Status.objects.create(name="Operational")
+        self.responsible = Employee.objects.create(dni="14141414", first_name="Eva", last_name="Luna", worker_type=Employee.WorkerType.NOMBRADO)
+        self.by_serial = self._mk_asset("INT-DSC-001", serial="SN-DSC-001")
+        self.by_mac = self._mk_asset("INT-DSC-002")
+        ComputerSpecs.objects.create(asset=self.by_mac, cpu_model="i5", ram_gb=8, storage_gb=256, mac_address="aa:bb:cc:dd:ee:ff", hostname="pc-02")
+        self.token, self.raw_token = IntegrationToken.issue(name="agent", scope=IntegrationToken.Scope.DISCOVERY)
+
+    def _mk_asset(self, tag, serial=None):
+        return Asset.objects.create(
+            category=self.category,
+            location=self.location,
+            status=self.status,
+            asset_tag_internal=tag,
+            serial=serial,
+            responsible_employee=self.responsible,
+        )
+
+    def test_ingest_upserts_specs_and_records_changes(self):
+        result = ingest_hardware_reports(
+            [
+                {"serial": "SN-DSC-001", "cpu_model": "i7-12700", "ram_gb": 16, "storage_gb": 512, "os_name": "Windows 11"},
+                {"mac_address": "AA-BB-CC-DD-EE-FF", "ram_gb": 16, "ip_address": "10.20.1.5"},
+                {"hostname": "unknown-host"},
+                {"ip_address": "10.0.0.1"},
+            ]
+        )
+        self.assertEqual(result["matched"], 2)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(len(result["unmatched"]), 1)
+        self.assertEqual(len(result["rejected"]), 1)
+        self.assertEqual(self.by_serial.computer_specs.os_name, "Windows 11")
+        specs = ComputerSpecs.objects.get(asset=self.by_mac)
+        self.assertEqual((specs.ram_gb, specs.ip_address), (16, "10.20.1.5"))
+        self.assertEqual(AssetEvent.objects.filter(event_type=AssetEvent.EventType.UPDATED).count(), 2)
+
+    def test_out_of_range_hosts_are_rejected_without_failing_the_batch(self):
+        result = ingest_hardware_reports(
+            [
+                {"serial": "SN-DSC-001", "cpu_model": "i7", "ram_gb": 40000, "storage_gb": 512},
+                {"hostname": "x" * 121, "ram_gb": 8},
+                {"mac_address": "AA-BB-CC-DD-EE-FF", "ram_gb": 32},
+            ]
+        )
+        self.assertEqual([(row["index"], row["error"]) for row in result["rejected"]], [(0, "ram_gb cannot exceed 32767."), (1, "hostname cannot exceed 120 characters.")])
+        self.assertEqual(ComputerSpecs.objects.get(asset=self.by_mac).ram_gb, 32)
+        self.assertFalse(ComputerSpecs.objects.filter(asset=self.by_serial).exists())
+
+    def test_mixed_case_stored_hostnames_match_and_rows_are_locked(self):
+        legacy = self._mk_asset("INT-DSC-003")
+        ComputerSpecs.objects.create(asset=legacy, cpu_model="i3", ram_gb=4, storage_gb=128, hostname="PC-Legacy-07")
+        with CaptureQueriesContext(connection) as queries:
+            result = ingest_hardware_reports([{"hostname": "PC-LEGACY-07", "ram_gb": 16}])
+        self.assertEqual((result["matched"], result["unmatched"]), (1, []))
+        self.assertEqual(ComputerSpecs.objects.get(asset=legacy).ram_gb, 16)
+        locked = [query["sql"] for query in queries.captured_queries if query["sql"].endswith("FOR UPDATE")]
+        self.assertEqual(len(locked), 2)
+
+    def test_unchanged_report_records_no_event(self):
+        ingest_hardware_reports([{"hostname": "PC-02", "ram_gb": 8, "cpu_model": "i5"}])
+        self.assertFalse(AssetEvent.objects.filter(asset=self.by_mac).exists())
+
+    def test_endpoint_requires_bearer_token(self):
+        payload = {"hosts": [{"hostname": "pc-02", "os_name": "Ubuntu 24.04"}]}
+        resp = self.client.post("/assets/discovery/ingest/", data=payload, content_type="application/json")
+        self.assertEqual(resp.status_code, 401)
+        resp = self.client.post(
+            "/assets/discovery/ingest/",
+            data=payload,
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.raw_token}",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["changed"], 1)
+
+
+class NetworkIndexTests(TestCase):
+    def setUp(self):
+        cpu = Category.objects.create(name="CPU")
+        switch = Category.objects.create(name="Switch")
+        location = Location.objects.create(site="Main", floor="3", type="ROOM", exact_name="Rack Room")
+        status = Status.objects.create(name="Operational")
+        responsible = Employee.objects.create(dni="15151515", first_name="Ivan", last_name="Mora", worker_type=Employee.WorkerType.CAS)
+        common = {"location": location, "status": status, "responsible_employee": responsible}
+        self.pc = Asset.objects.create(category=cpu, asset_tag_internal="INT-NET-001", **common)
+        self.pc2 = Asset.objects.create(category=cpu, asset_tag_internal="INT-NET-002", **common)
+        self.switch = Asset.objects.create(category=switch, asset_tag_internal="INT-NET-003", **common)
+        ComputerSpecs.objects.create(asset=self.pc, cpu_model="i5", ram_gb=8, storage_gb=256, ip_address="10.20.1.10", mac_address="AA-BB-CC-00-00-01")
+        ComputerSpecs.objects.create(asset=self.pc2, cpu_model="i5", ram_gb=8, storage_gb=256, ip_address="10.30.0.5", mac_address="aabb.cc00.0002")
+        NetworkDeviceDetails.objects.create(asset=self.switch, ip_address="10.20.0.1", mac_address="aa:bb:cc:00:00:03")
+
+    def test_mac_addresses_are_stored_normalized(self):
+        self.assertEqual(ComputerSpecs.objects.get(asset=self.pc2).mac_address, "aa:bb:cc:00:00:02")
+        self.assertEqual([row["asset_id"] for row in assets_by_mac("AA:BB:CC:00:00:01")], [self.pc.id])
+
+    def test_subnet_query_spans_computers_and_network_devices(self):
+        rows = assets_in_subnet("10.20.0.0/16")
+        self.assertEqual({row["asset_id"] for row in rows}, {self.pc.id, self.switch.id})
+
+    def test_duplicate_ips(self):
+        ComputerSpecs.objects.filter(asset=self.pc2).update(ip_address="10.20.0.1")
+        self.assertEqual(duplicate_ips(), [("10.20.0.1", sorted([self.pc2.id, self.switch.id]))])
+
+    def test_reconcile_leases_flags_unknown_and_mismatched(self):
+        lines = [
+            "1718000000 aa:bb:cc:00:00:01 10.20.1.10 pc-01 *",
+            "1718000000 aa:bb:cc:00:00:02 10.30.0.99 pc-02 *",
+            "? (10.99.0.7) at de:ad:be:ef:00:01 [ether] on eth0",
+        ]
+        findings = list(reconcile_leases(lines))
+        self.assertEqual([(f["kind"], f["line"]) for f in findings], [("MISMATCH", 2), ("UNKNOWN", 3)])
+        self.assertEqual(findings[0]["asset_id"], self.pc2.id)
+
+
+class AttributeStoreTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Laptop")
+        self.location = Location.objects.create(site="Main", floor="2", type="OFFICE", exact_name="Finance")
+        self.status = Status.objects.create(name="Operational")
+        self.responsible = Employee.objects.create(dni="16161616", first_name="Rosa", last_name="Paz", worker_type=Employee.WorkerType.NOMBRADO)
+
+    def _mk_asset(self, tag, attributes):
+        return Asset.objects.create(
+            category=self.category,
+            location=self.location,
+            status=self.status,
+            asset_tag_internal=tag,
+            responsible_employee=self.responsible,
+            attributes=attributes,
+        )
+
+    def test_clean_attributes_coerces_and_rejects_foreign_keys(self):
+        self.assertEqual(
+            clean_attributes("Laptop", {"ram_total_gb": "16", "os_name": " Windows 11 ", "padlock_present": False, "dns2": ""}),
+            {"ram_total_gb": 16, "os_name": "Windows 11"},
+        )
+        self.assertEqual(clean_attributes("Laptop", {"ram_slots_total": 0, "ram_total_gb": "0"}), {"ram_slots_total": 0, "ram_total_gb": 0})
+        with self.assertRaises(ValidationError):
+            clean_attributes("Printer", {"ram_slots_total": 0})
+        with self.assertRaises(ValidationError):
+            clean_attributes("Printer", {"processor": "i7"})
+        with self.assertRaises(ValidationError):
+            self._mk_asset("INT-ATR-000", {"associated_email": "x@example.com"})
+
+    def test_attribute_filter_combines_containment_and_ranges(self):
+        match = self._mk_asset("INT-ATR-001", {"ram_total_gb": 16, "os_name": "Windows 11 Pro", "brand": "Dell"})
+        self._mk_asset("INT-ATR-002", {"ram_total_gb": 8, "os_name": "Windows 11 Pro", "brand": "Dell"})
+        self._mk_asset("INT-ATR-003", {"ram_total_gb": 32, "os_name": "Ubuntu 24.04", "brand": "Dell"})
+        qs = Asset.objects.filter(attribute_filter({"ram_total_gb__gte": "16", "os_name__icontains": "windows 11", "brand": "Dell"}))
+        self.assertEqual(list(qs), [match])
+        with self.assertRaises(ValidationError):
+            attribute_filter({"ram_total_gb__icontains": "1"})
+
+    def test_discovery_refreshes_attributes(self):
+        asset = self._mk_asset("INT-ATR-004", {"brand": "Lenovo"})
+        asset.serial = "SN-ATR-004"
+        asset.save()
+        ingest_hardware_reports([{"serial": "SN-ATR-004", "ram_gb": 16, "os_name": "Windows 11"}])
+        asset.refresh_from_db()
+        self.assertEqual(asset.attributes, {"brand": "Lenovo", "ram_total_gb": 16, "os_name": "Windows 11"})
+
+
+class WebhookStandIn:
+    """Local HTTP receiver for outbox tests; answers with the queued status codes, then 200."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.requests.append((dict(self.headers), body))
+                self.send_response(stand_in.statuses.pop(0) if stand_in.statuses else 200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="CPU")
+        location = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Helpdesk")
+        status = Status.objects.create(name="Operational")
+        self.reason = AssignmentReason.objects.create(name="Initial assignment")
+        self.employee = Employee.objects.create(dni="19191919", first_name="Ana", last_name="Soto", worker_type=Employee.WorkerType.CAS)
+        self.other = Employee.objects.create(dni="20202020", first_name="Raul", last_name="Ibarra", worker_type=Employee.WorkerType.NOMBRADO)
+        self.asset = Asset.objects.create(category=category, location=location, status=status, responsible_employee=self.employee, asset_tag_internal="INT-OBX-001")
+        self.stand_in = WebhookStandIn()
+        self.addCleanup(self.stand_in.close)
+        self.endpoint = WebhookEndpoint.objects.create(name="ticketing", url=self.stand_in.url, secret="s3cret")
+
+    def test_events_are_written_with_the_change(self):
+        assign_asset(asset=self.asset, reason=self.reason, assigned_employee=self.employee)
+        with self.assertRaises(ValidationError):
+            assign_asset(asset=self.asset, reason=self.reason, assigned_employee=self.other)
+        self.assertEqual(list(OutboxMessage.objects.values_list("topic", flat=True)), ["asset.assigned"])
+        self.assertEqual(OutboxDelivery.objects.get().endpoint, self.endpoint)
+
+    def test_dispatch_sends_one_signed_batch(self):
+        assign_asset(asset=self.asset, reason=self.reason, assigned_employee=self.employee)
+        reassign_asset(asset=self.asset, reason=self.reason, new_assigned_employee=self.other)
+        self.assertEqual(dispatch_pending(), {"delivered": 2, "failed": 0})
+        headers, body = self.stand_in.requests[0]
+        self.assertEqual(len(self.stand_in.requests), 1)
+        self.assertEqual(headers[SIGNATURE_HEADER], "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest())
+        events = json.loads(body)["events"]
+        self.assertEqual([e["topic"] for e in events], ["asset.assigned", "asset.reassigned"])
+        self.assertEqual(events[1]["payload"]["previous_employee_dni"], "19191919")
+
+    def test_failed_batch_backs_off_and_keeps_asset_order(self):
+        self.stand_in.statuses = [500]
+        assign_asset(asset=self.asset, reason=self.reason, assigned_employee=self.employee)
+        now = timezone.now()
+        self.assertEqual(dispatch_pending(now=now), {"delivered": 0, "failed": 1})
+        reassign_asset(asset=self.asset, reason=self.reason, new_assigned_employee=self.other)
+
+        self.assertEqual(dispatch_pending(now=now + timedelta(seconds=1)), {"delivered": 0, "failed": 0})
+        self.assertEqual(dispatch_pending(now=now + backoff(1)), {"delivered": 2, "failed": 0})
+        topics = [e["topic"] for e in json.loads(self.stand_in.requests[-1][1])["events"]]
+        self.assertEqual(topics, ["asset.assigned", "asset.reassigned"])
+
+
+class LiveDashboardTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="CPU")
+        self.location = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Help Desk")
+        self.operational = Status.objects.create(name="Operational")
+        self.responsible = Employee.objects.create(dni="23232323", first_name="Eva", last_name="Soto", worker_type=Employee.WorkerType.CAS)
+        self._create_asset("INT-LIVE-1")
+        self.viewer = User.objects.create_user("wall", password="x")
+        self.viewer.groups.add(Group.objects.create(name="VIEWER"))
+        broadcaster.snapshot = None
+
+    def _create_asset(self, tag):
+        return Asset.objects.create(
+            category=self.category,
+            location=self.location,
+            status=self.operational,
+            responsible_employee=self.responsible,
+            asset_tag_internal=tag,
+        )
+
+    async def test_broadcaster_pushes_only_changed_metrics(self):
+        live = DashboardBroadcaster()
+        live.debounce_seconds = 0
+        queue, snapshot = await live.subscribe()
+        self.assertEqual((snapshot["total_assets"], snapshot["operational_assets"]), (1, 1))
+        await sync_to_async(self._create_asset)("INT-LIVE-2")
+        live.notify_changed()
+        live.notify_changed()
+        delta = await asyncio.wait_for(queue.get(), 5)
+        self.assertEqual(delta, {"total_assets": 2, "operational_assets": 2})
+        await live._refresh_task
+        self.assertTrue(queue.empty())
+        live.unsubscribe(queue)
+        self.assertIsNone(live.snapshot)
+
+    def test_stalled_viewer_gets_backlog_folded_into_one_delta(self):
+        live = DashboardBroadcaster()
+        queue = asyncio.Queue(maxsize=2)
+        live.subscribers.add(queue)
+        for total in (2, 3, 4):
+            live.publish({"total_assets": total, f"seen_{total}": True})
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(queue.get_nowait(), {"total_assets": 4, "seen_2": True, "seen_3": True, "seen_4": True})
+
+    async def test_stream_starts_with_snapshot(self):
+        await self.async_client.aforce_login(self.viewer)
+        response = await self.async_client.get("/assets/dashboard/stream/")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        first = await anext(stream)
+        await stream.aclose()
+        self.assertTrue(first.startswith(b"event: snapshot\n"))
+        self.assertEqual(json.loads(first.split(b"data: ")[1])["total_assets"], 1)
+        self.assertEqual(await compute_metrics(), json.loads(first.split(b"data: ")[1]))
+
+    def test_stream_under_wsgi_sends_snapshot_and_retry(self):
+        self.assertEqual(self.client.get("/assets/dashboard/stream/").status_code, 403)
+        self.client.force_login(self.viewer)
+        response = self.client.get("/assets/dashboard/stream/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"event: snapshot", response.content)
+        self.assertTrue(response.content.endswith(b"retry: 15000\n\n"))
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="CPU")
+        location = Location.objects.create(site="Main", floor="2", type="ROOM", exact_name="Accounting")
+        status = Status.objects.create(name="Operational")
+        responsible = Employee.objects.create(dni="24242424", first_name="Raul", last_name="Paz", worker_type=Employee.WorkerType.NOMBRADO)
+        self.holder = Employee.objects.create(dni="25252525", first_name="Ines", last_name="Rojas", worker_type=Employee.WorkerType.CAS)
+        self.assets = [
+            Asset.objects.create(category=category, location=location, status=status, responsible_employee=responsible, asset_tag_internal=f"INT-ASYNC-{index}")
+            for index in range(3)
+        ]
+        assign_asset(asset=self.assets[0], assigned_employee=self.holder, reason=AssignmentReason.objects.create(name="New hire"))
+        self.viewer = User.objects.create_user("reader", password="x")
+        self.viewer.groups.add(Group.objects.create(name="VIEWER"))
+
+    def _request(self, path, user):
+        request = AsyncRequestFactory().get(path)
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        return request
+
+    async def test_list_matches_sync_context(self):
+        response = await views.AsyncAssetListView.as_view()(self._request("/assets/?q=INT-ASYNC-1", self.viewer))
+        self.assertEqual([asset.asset_tag_internal for asset in response.context_data["assets"]], ["INT-ASYNC-1"])
+        self.assertEqual(response.context_data["count"], 1)
+
+    async def test_report_csv_streams_same_rows_as_sync_export(self):
+        await sync_to_async(self.client.force_login)(self.viewer)
+        expected = (await sync_to_async(self.client.get)("/assets/reports/assets.csv")).content
+        response = await views.AsyncAssetReportCSVView.as_view()(self._request("/", self.viewer))
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, expected)
+        self.assertIn(b"Ines Rojas", body)
+
+    async def test_anonymous_users_are_sent_to_login(self):
+        response = await views.AsyncConsumableKardexView.as_view()(self._request("/assets/consumables/1/kardex/", AnonymousUser()), pk=1)
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(CACHE_INVALIDATION="poll", CACHE_INVALIDATION_POLL_SECONDS=3600)
+class AssetDetailCacheTests(TestCase):
+    def setUp(self):
+        invalidation._store.clear()
+        invalidation._poll_state.update(checked_at=0.0, versions=None)
+        self.addCleanup(invalidation._store.clear)
+        self.location = Location.objects.create(site="Main", floor="3", type="ROOM", exact_name="Legal")
+        self.asset = Asset.objects.create(
+            category=Category.objects.create(name="Laptop"),
+            location=self.location,
+            status=Status.objects.create(name="Operational"),
+            responsible_employee=Employee.objects.create(dni="26262626", first_name="Olga", last_name="Mena", worker_type=Employee.WorkerType.CAS),
+            asset_tag_internal="INT-CACHE-1",
+        )
+        AssetSensitiveData.objects.create(asset=self.asset, cpu_padlock_key="PK-1", license_secret="LIC-1")
+
+    def test_second_read_is_served_without_queries(self):
+        asset_detail(self.asset.pk)
+        with self.assertNumQueries(0):
+            payload = asset_detail(self.asset.pk)
+        self.assertEqual(payload["asset"].asset_tag_internal, "INT-CACHE-1")
+
+    def test_dependent_and_catalog_changes_evict_after_commit(self):
+        asset_detail(self.asset.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            MaintenanceRecord.objects.create(asset=self.asset, maintenance_type=MaintenanceRecord.MaintenanceType.CORRECTIVE, description="Hinge")
+        self.assertEqual(len(asset_detail(self.asset.pk)["maintenance_records"]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.location.exact_name = "Legal Archive"
+            self.location.save()
+        self.assertEqual(asset_detail(self.asset.pk)["asset"].location.exact_name, "Legal Archive")
+
+    def test_edit_during_a_miss_is_not_hidden_by_the_stale_load(self):
+        load = detail.load_asset_detail
+
+        def load_then_edit(pk):
+            payload = load(pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                Asset.objects.filter(pk=pk).update(asset_tag_internal="INT-CACHE-2")
+                detail.invalidate_asset_detail(pk)
+            return payload
+
+        with mock.patch("assets.detail.load_asset_detail", load_then_edit):
+            self.assertEqual(asset_detail(self.asset.pk)["asset"].asset_tag_internal, "INT-CACHE-1")
+        self.assertEqual(asset_detail(self.asset.pk)["asset"].asset_tag_internal, "INT-CACHE-2")
+
+    def test_sensitive_values_are_filtered_per_viewer(self):
+        viewer = User.objects.create_user("scanner", password="x")
+        viewer.groups.add(Group.objects.create(name="VIEWER"))
+        admin = User.objects.create_superuser("root", password="x")
+        url = f"/assets/{self.asset.pk}/"
+        self.client.force_login(viewer)
+        self.assertNotContains(self.client.get(url), "PK-1")
+        self.client.force_login(admin)
+        self.assertContains(self.client.get(url), "PK-1")
+        self.assertEqual(self.client.get("/assets/999999/").status_code, 404)
+
+    def test_attribute_values_are_shown_as_stored(self):
+        self.asset.attributes = {"os_name": "Windows 11", "ram_total_gb": 16, "padlock_present": True}
+        self.asset.save()
+        self.client.force_login(User.objects.create_superuser("root", password="x"))
+        response = self.client.get(f"/assets/{self.asset.pk}/")
+        self.assertContains(response, "Windows 11")
+        self.assertContains(response, '<dd class="inline">16</dd>', html=False)
+        self.assertContains(response, '<dd class="inline">Yes</dd>', html=False)
+
+
+@override_settings(CACHE_INVALIDATION="poll", CACHE_INVALIDATION_POLL_SECONDS=3600)
+class TypeaheadTests(TestCase):
+    def setUp(self):
+        invalidation._store.clear()
+        invalidation._poll_state.update(checked_at=0.0, versions=None)
+        self.addCleanup(invalidation._store.clear)
+        category = Category.objects.create(name="Printer")
+        location = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Print Room")
+        status = Status.objects.create(name="Operational")
+        responsible = Employee.objects.create(dni="27272727", first_name="Tito", last_name="Lara", worker_type=Employee.WorkerType.CAS)
+        self.create = lambda **fields: Asset.objects.create(category=category, location=location, status=status, responsible_employee=responsible, **fields)
+        self.first = self.create(asset_tag_internal="PRN-002", serial="ab-77")
+        self.second = self.create(asset_tag_internal="PRN-001")
+        self.by_serial = self.create(asset_tag_internal="INT-900", serial="PRN-SER-1")
+
+    def test_prefix_matches_identifiers_case_insensitively(self):
+        rows = search_prefix("PRN")
+        self.assertEqual([(row["id"], row["field"]) for row in rows], [(self.second.id, "Internal"), (self.first.id, "Internal"), (self.by_serial.id, "Serial")])
+        self.assertEqual(search_prefix("AB-")[0]["value"], "ab-77")
+        self.assertEqual(len(search_prefix("PRN", limit=2)), 2)
+        self.assertEqual(search_prefix("PRN_"), [])
+        self.assertEqual(typeahead(" p")["results"], [])
+
+    def test_cached_prefix_is_dropped_when_an_asset_changes(self):
+        self.assertEqual(len(typeahead("prn-0")["results"]), 2)
+        with self.assertNumQueries(0):
+            typeahead("prn-0")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create(asset_tag_internal="PRN-003")
+        self.assertEqual(len(typeahead("prn-0")["results"]), 3)
+
+    def test_view_renders_suggestions(self):
+        viewer = User.objects.create_user("desk", password="x")
+        viewer.groups.add(Group.objects.create(name="VIEWER"))
+        self.client.force_login(viewer)
+        response = self.client.get("/assets/typeahead/?q=int-9", HTTP_HX_REQUEST="true")
+        self.assertContains(response, f"/assets/{self.by_serial.id}/")
+        self.assertContains(self.client.get("/assets/typeahead/?q=zz"), 'No identifier starts with "ZZ"')
+
+
+@override_settings(CACHE_INVALIDATION="poll", CACHE_INVALIDATION_POLL_SECONDS=3600)
+class ListFragmentCacheTests(TestCase):
+    def setUp(self):
+        invalidation._store.clear()
+        invalidation._poll_state.update(checked_at=0.0, versions=None)
+        self.addCleanup(invalidation._store.clear)
+        self.category = Category.objects.create(name="Monitor")
+        self.asset = Asset.objects.create(
+            category=self.category,
+            location=Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Lobby"),
+            status=Status.objects.create(name="Operational"),
+            responsible_employee=Employee.objects.create(dni="28282828", first_name="Ana", last_name="Rios", worker_type=Employee.WorkerType.CAS),
+            asset_tag_internal="INT-FRAG-1",
+        )
+        viewer = User.objects.create_user("lobby", password="x")
+        viewer.groups.add(Group.objects.create(name="VIEWER"))
+        self.client.force_login(viewer)
+
+    def _asset_queries(self, url, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response, [q["sql"] for q in queries.captured_queries if "assets_asset" in q["sql"]]
+
+    def test_invalidation_receivers_leave_unrelated_models_fast_deletable(self):
+        self.assertFalse(post_delete.has_listeners(Session))
+        self.assertFalse(post_save.has_listeners(AssetEvent))
+        self.assertTrue(post_delete.has_listeners(MaintenanceRecord))
+
+    def test_repeated_reads_skip_the_orm(self):
+        first, queried = self._asset_queries("/assets/?page=1")
+        self.assertTrue(queried)
+        again, queried = self._asset_queries("/assets/?page=1")
+        self.assertEqual(queried, [])
+        self.assertContains(again, "INT-FRAG-1")
+        partial, queried = self._asset_queries("/assets/?page=1", HTTP_HX_REQUEST="true")
+        self.assertEqual(queried, [])
+        self.assertNotContains(partial, "<html")
+        self.assertEqual(len(invalidation._store[ASSET_TABLES]), 1)
+
+    def test_discovery_attribute_changes_evict_asset_tables(self):
+        self.category.name = "CPU"
+        self.category.save()
+        Asset.objects.filter(pk=self.asset.pk).update(serial="SN-FRAG-1")
+        self.assertNotContains(self.client.get("/assets/?attr.os_name=Ubuntu"), "INT-FRAG-1")
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_hardware_reports([{"serial": "SN-FRAG-1", "cpu_model": "i5", "ram_gb": 8, "storage_gb": 256, "os_name": "Ubuntu"}])
+        self.assertContains(self.client.get("/assets/?attr.os_name=Ubuntu"), "INT-FRAG-1")
+
+    def test_writes_evict_affected_tables(self):
+        self.client.get("/assets/")
+        self.client.get("/assets/maintenance/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Display"
+            self.category.save()
+        self.assertNotIn(ASSET_TABLES, invalidation._store)
+        self.assertContains(self.client.get("/assets/"), "Display")
+        with self.captureOnCommitCallbacks(execute=True):
+            MaintenanceRecord.objects.create(asset=self.asset, maintenance_type=MaintenanceRecord.MaintenanceType.PREVENTIVE, description="Clean")
+        self.assertContains(self.client.get("/assets/maintenance/"), "INT-FRAG-1")
+
+    def test_invalid_cursor_is_reported_on_cached_tables_too(self):
+        for _ in range(2):
+            self.assertContains(self.client.get("/assets/maintenance/", {"after": "not-a-cursor"}), "Invalid cursor.")
+
+    def test_catalog_renames_evict_the_maintenance_table(self):
+        MaintenanceRecord.objects.create(asset=self.asset, maintenance_type=MaintenanceRecord.MaintenanceType.CORRECTIVE, description="Flicker")
+        # The table alone: the page's location filter lists the new name regardless.
+        self.assertContains(self.client.get("/assets/maintenance/", HTTP_HX_REQUEST="true"), "Lobby")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.asset.location.exact_name = "Main Hall"
+            self.asset.location.save()
+        self.assertContains(self.client.get("/assets/maintenance/", HTTP_HX_REQUEST="true"), "Main Hall")
+
+
+class OffboardingTests(TestCase):
+    def setUp(self):
+        invalidation._store.clear()
+        self.addCleanup(invalidation._store.clear)
+        self.reason = AssignmentReason.objects.create(name="Offboarding")
+        self.leaving = Employee.objects.create(dni="41414141", first_name="Luis", last_name="Paz", worker_type=Employee.WorkerType.CAS)
+        self.successor = Employee.objects.create(dni="42424242", first_name="Rosa", last_name="Vega", worker_type=Employee.WorkerType.NOMBRADO)
+        other = Employee.objects.create(dni="43434343", first_name="Eva", last_name="Soto", worker_type=Employee.WorkerType.CAS)
+        category = Category.objects.create(name="Laptop")
+        location = Location.objects.create(site="Main", floor="2", type="OFFICE", exact_name="HR")
+        status = Status.objects.create(name="Operational")
+
+        def make(tag, responsible):
+            return Asset.objects.create(category=category, location=location, status=status, responsible_employee=responsible, asset_tag_internal=tag)
+
+        self.owned = make("INT-OFF-1", self.leaving)
+        self.held = make("INT-OFF-2", other)
+        self.both = make("INT-OFF-3", self.leaving)
+        self.untouched = make("INT-OFF-4", other)
+        assign_asset(asset=self.held, reason=self.reason, assigned_employee=self.leaving)
+        assign_asset(asset=self.both, reason=self.reason, assigned_employee=self.leaving)
+        assign_asset(asset=self.untouched, reason=self.reason, assigned_employee=other)
+        WebhookEndpoint.objects.create(name="ERP", url="http://example.invalid/hook", secret="s")
+
+    def test_transfers_everything_in_bulk_and_signs_the_handover(self):
+        # Constant in the number of assets: lock, two updates, bulk inserts, employee deactivation.
+        with self.assertNumQueries(14):
+            handover = offboard_employee(employee=self.leaving, target=self.successor, reason=self.reason)
+        self.assertEqual(
+            set(Asset.objects.filter(responsible_employee=self.successor).values_list("asset_tag_internal", flat=True)),
+            {"INT-OFF-1", "INT-OFF-3"},
+        )
+        current = AssetAssignment.objects.filter(is_current=True, assigned_employee=self.successor)
+        self.assertEqual(set(current.values_list("asset__asset_tag_internal", flat=True)), {"INT-OFF-2", "INT-OFF-3"})
+        self.assertFalse(AssetAssignment.objects.filter(is_current=True, assigned_employee=self.leaving).exists())
+        self.assertEqual(AssetEvent.objects.filter(event_type=AssetEvent.EventType.REASSIGNED).count(), 3)
+        self.assertEqual(OutboxMessage.objects.filter(topic="asset.responsible_changed").count(), 2)
+        self.assertEqual(OutboxMessage.objects.filter(topic="asset.reassigned").count(), 2)
+        self.assertEqual(OutboxDelivery.objects.filter(message__topic__in=["asset.responsible_changed", "asset.reassigned"]).count(), 4)
+        self.leaving.refresh_from_db()
+        self.assertFalse(self.leaving.is_active)
+
+        self.assertEqual([asset["public_id"] for asset in handover["assets"]], [self.owned.public_id, self.held.public_id, self.both.public_id])
+        self.assertTrue(verify_handover(handover))
+        tampered = json.loads(json.dumps(handover))
+        tampered["successor"]["dni"] = "99999999"
+        self.assertFalse(verify_handover(tampered))
+
+    def test_rejects_same_or_inactive_successor(self):
+        with self.assertRaises(ValidationError):
+            offboard_employee(employee=self.leaving, target=self.leaving, reason=self.reason)
+        self.successor.is_active = False
+        self.successor.save()
+        with self.assertRaises(ValidationError):
+            offboard_employee(employee=self.leaving, target=self.successor, reason=self.reason)
+        self.assertEqual(Asset.objects.filter(responsible_employee=self.leaving).count(), 2)
+
+    def test_responsibility_only_goes_to_nombrado_or_cas(self):
+        intern = Employee.objects.create(dni="44444441", first_name="Ivo", last_name="Ruiz", worker_type=Employee.WorkerType.PRACTICANTE)
+        with self.assertRaisesMessage(ValidationError, "NOMBRADO or CAS"):
+            offboard_employee(employee=self.leaving, target=intern, reason=self.reason)
+        self.assertEqual(Asset.objects.filter(responsible_employee=self.leaving).count(), 2)
+        self.assertTrue(AssetAssignment.objects.filter(is_current=True, assigned_employee=self.leaving).exists())
+        self.assertNotIn(intern, OffboardingForm(employee=self.leaving).fields["successor"].queryset)
+
+        # Someone who only holds assignments can hand them to a worker type allowed for assignments.
+        Asset.objects.filter(responsible_employee=self.leaving).update(responsible_employee=self.successor)
+        offboard_employee(employee=self.leaving, target=intern, reason=self.reason)
+        self.assertEqual(AssetAssignment.objects.filter(is_current=True, assigned_employee=intern).count(), 2)
+
+    def test_preview_then_confirm_through_the_view(self):
+        admin = User.objects.create_user("hr-admin", password="x")
+        admin.groups.add(Group.objects.create(name="ADMIN"))
+        self.client.force_login(admin)
+        preview = self.client.get(f"/assets/offboarding/{self.leaving.pk}/")
+        self.assertContains(preview, "Assets to hand over (3)")
+        self.assertNotContains(preview, "INT-OFF-4")
+        response = self.client.post(
+            f"/assets/offboarding/{self.leaving.pk}/",
+            {"successor": self.successor.pk, "reason": self.reason.pk, "deactivate_employee": "on"},
+        )
+        self.assertRedirects(response, "/assets/offboarding/handover/")
+        download = self.client.get("/assets/offboarding/handover/?format=json")
+        self.assertIn("attachment", download["Content-Disposition"])
+        self.assertTrue(verify_handover(download.json()))
+
+
+class AssetBulkEditTests(TestCase):
+    def setUp(self):
+        self.operational = Status.objects.create(name="Operational")
+        self.inoperative = Status.objects.create(name="Inoperative")
+        self.room = Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Server room")
+        self.annex = Location.objects.create(site="Annex", floor="1", type="ROOM", exact_name="Annex room")
+        self.owner = Employee.objects.create(dni="51515151", first_name="Ines", last_name="Lara", worker_type=Employee.WorkerType.CAS)
+        monitor = Category.objects.create(name="Monitor")
+        switch = Category.objects.create(name="Switch")
+
+        def make(tag, category, status):
+            return Asset.objects.create(category=category, location=self.room, status=status, responsible_employee=self.owner, asset_tag_internal=tag)
+
+        self.assets = [make("INT-BULK-1", monitor, self.operational), make("INT-BULK-2", switch, self.operational), make("INT-BULK-3", monitor, self.inoperative)]
+
+    def test_single_update_and_bulk_events(self):
+        # Savepoint, lock, one validation query for both category combinations, UPDATE, events INSERT, release.
+        with self.assertNumQueries(6):
+            changed = bulk_edit_assets(queryset=Asset.objects.all(), changes={"status": self.inoperative, "location": None}, actor=None)
+        self.assertEqual(changed, 2)
+        self.assertEqual(Asset.objects.filter(status=self.inoperative).count(), 3)
+        events = AssetEvent.objects.filter(event_type=AssetEvent.EventType.UPDATED)
+        self.assertEqual(sorted(events.values_list("asset__asset_tag_internal", flat=True)), ["INT-BULK-1", "INT-BULK-2"])
+        self.assertEqual(events.first().description, "Bulk edit: status Operational -> Inoperative")
+
+    def test_rule_violation_rejects_the_whole_change(self):
+        locador = Employee.objects.create(dni="52525252", first_name="Raul", last_name="Diaz", worker_type=Employee.WorkerType.LOCADOR)
+        with self.assertRaisesMessage(ValidationError, "NOMBRADO or CAS"):
+            bulk_edit_assets(queryset=Asset.objects.all(), changes={"responsible_employee": locador, "location": self.annex})
+        self.assertFalse(Asset.objects.filter(location=self.annex).exists())
+        with self.assertRaises(ValidationError):
+            bulk_edit_assets(queryset=Asset.objects.all(), changes={"status": None})
+
+    def test_view_applies_to_checked_assets_or_to_the_search(self):
+        technician = User.objects.create_user("tech-bulk", password="x")
+        technician.groups.add(Group.objects.create(name="TECHNICIAN"))
+        self.client.force_login(technician)
+        self.assertContains(self.client.get("/assets/"), 'form="bulk-edit-form"')
+        first, second, third = self.assets
+        self.client.post("/assets/bulk-edit/", {"scope": "selected", "ids": [first.pk, third.pk], "location": self.annex.pk})
+        self.assertEqual(set(Asset.objects.filter(location=self.annex)), {first, third})
+        response = self.client.post("/assets/bulk-edit/", {"scope": "filter", "filter": "q=INT-BULK-2", "status": self.inoperative.pk})
+        self.assertRedirects(response, "/assets/?q=INT-BULK-2", fetch_redirect_response=False)
+        second.refresh_from_db()
+        self.assertEqual(second.status, self.inoperative)
+        self.assertEqual(Asset.objects.get(pk=first.pk).status, self.operational)
+
+
+class AssetBatchCreateTests(TestCase):
+    def setUp(self):
+        self.monitor = Category.objects.create(name="Monitor")
+        self.location = Location.objects.create(site="Main", floor="3", type="OFFICE", exact_name="Accounting")
+        self.status = Status.objects.create(name="Operational")
+        self.owner = Employee.objects.create(dni="61616161", first_name="Teo", last_name="Rey", worker_type=Employee.WorkerType.NOMBRADO)
+
+    def _shared(self):
+        return {"category": self.monitor, "location": self.location, "status": self.status, "responsible_employee": self.owner, "attributes": {"brand": "LG"}}
+
+    def _rows(self, count, prefix="MON"):
+        return [{"serial": f"{prefix}-SN-{n}", "asset_tag_internal": f"{prefix}-{n:03d}", "control_patrimonial": None} for n in range(count)]
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            create_asset_batch(shared=self._shared(), identifiers=self._rows(3, "A"), details={"brand": "LG", "model": "24MK"})
+        with CaptureQueriesContext(connection) as large:
+            assets = create_asset_batch(shared=self._shared(), identifiers=self._rows(40, "B"), details={"brand": "LG", "model": "24MK"})
+        self.assertEqual(len(small), len(large))
+        self.assertEqual([asset.public_id for asset in assets[:2]], [f"ASSET-{assets[0].pk:08d}", f"ASSET-{assets[1].pk:08d}"])
+        self.assertEqual(PeripheralDetails.objects.filter(model="24MK").count(), 43)
+        self.assertEqual(AssetEvent.objects.filter(event_type=AssetEvent.EventType.CREATED).count(), 43)
+        self.assertEqual(OutboxMessage.objects.filter(topic="asset.created").count(), 43)
+        self.assertEqual(Asset.objects.get(asset_tag_internal="B-007").attributes, {"brand": "LG"})
+
+    def test_collisions_are_reported_before_anything_is_written(self):
+        Asset.objects.create(asset_tag_internal="MON-001", **self._shared())
+        rows = self._rows(3)
+        rows[2]["serial"] = "MON-SN-0"
+        with self.assertRaisesMessage(ValidationError, "MON-SN-0, MON-001"):
+            create_asset_batch(shared=self._shared(), identifiers=rows)
+        self.assertEqual(Asset.objects.count(), 1)
+
+    def test_identifier_lists_and_tag_patterns(self):
+        self.assertEqual(expand_tag_pattern("MON-26-###", 9, 2), ["MON-26-009", "MON-26-010"])
+        with self.assertRaises(ValidationError):
+            expand_tag_pattern("MON-#-#", 1, 1)
+        rows = parse_identifier_lines(["serial,internal", "SN1", "", "SN2, TAG-2"])
+        self.assertEqual(rows, [{"serial": "SN1", "asset_tag_internal": None, "control_patrimonial": None}, {"serial": "SN2", "asset_tag_internal": "TAG-2", "control_patrimonial": None}])
+
+    def test_wizard_quantity_mode(self):
+        technician = User.objects.create_user("tech-batch", password="x")
+        technician.groups.add(Group.objects.create(name="TECHNICIAN"))
+        self.client.force_login(technician)
+        self.client.post("/assets/new/step-1/", {"category": self.monitor.pk, "ownership_type": Asset.OwnershipType.INEI, "quantity_mode": "on"})
+        step2 = self.client.get("/assets/new/step-2/")
+        self.assertNotContains(step2, 'name="serial"')
+        self.client.post("/assets/new/step-2/", {"responsible_employee": self.owner.pk, "location": self.location.pk, "status": self.status.pk})
+        self.assertRedirects(self.client.post("/assets/new/step-3/", {"brand": "Dell", "model": "P2422"}), "/assets/new/identifiers/")
+        response = self.client.post("/assets/new/identifiers/", {"identifiers": "CN-1\nCN-2,DELL-X\nCN-3", "tag_pattern": "DELL-##", "tag_start": 1})
+        self.assertRedirects(response, "/assets/", fetch_redirect_response=False)
+        self.assertEqual(
+            list(Asset.objects.order_by("id").values_list("serial", "asset_tag_internal")),
+            [("CN-1", "DELL-01"), ("CN-2", "DELL-X"), ("CN-3", "DELL-02")],
+        )
+        self.assertEqual(PeripheralDetails.objects.filter(brand="Dell", model="P2422").count(), 3)
+
+
+class WorkstationTests(TestCase):
+    def setUp(self):
+        self.room = Location.objects.create(site="Main", floor="1", type="OFFICE", exact_name="Room 101")
+        self.annex = Location.objects.create(site="Annex", floor="2", type="OFFICE", exact_name="Room 201")
+        self.status = Status.objects.create(name="Operational")
+        self.owner = Employee.objects.create(dni="71717171", first_name="Noe", last_name="Luna", worker_type=Employee.WorkerType.CAS)
+        self.user_a = Employee.objects.create(dni="72727272", first_name="Ada", last_name="Paz", worker_type=Employee.WorkerType.CAS)
+        self.reason = AssignmentReason.objects.create(name="Desk change")
+        self.categories = {name: Category.objects.create(name=name) for name in ("CPU", "Monitor", "Keyboard", "Laptop")}
+        self.count = 0
+
+    def _component(self, category, station):
+        self.count += 1
+        return Asset.objects.create(
+            category=self.categories[category],
+            location=self.room,
+            status=self.status,
+            responsible_employee=self.owner,
+            asset_tag_internal=f"INT-WS-{self.count}",
+            control_patrimonial=f"PAT-WS-{self.count}",
+            acquisition_date=date(2024, 1, 1),
+            station_code=station,
+        )
+
+    def test_components_and_assignees_in_one_query(self):
+        cpu = self._component("CPU", "lab-01")
+        self._component("Monitor", "LAB-01")
+        self._component("Monitor", "LAB-02")
+        assign_asset(asset=cpu, reason=self.reason, assigned_employee=self.user_a)
+        with self.assertNumQueries(1):
+            components = station_components(" Lab-01 ")
+        self.assertEqual([asset.category.name for asset in components], ["CPU", "Monitor"])
+        self.assertEqual((components[0].assignee_first_name, components[1].assignee_first_name), ("Ada", None))
+
+    def test_incomplete_stations_in_one_grouped_query(self):
+        for category in ("CPU", "Monitor", "Keyboard"):
+            self._component(category, "A-1")
+        self._component("CPU", "a-2")
+        self._component("Monitor", "A-2")
+        self._component("Laptop", "A-3")
+        with self.assertNumQueries(1):
+            rows = list(incomplete_stations())
+        self.assertEqual([(row["station"], row["components"], row["keyboards"]) for row in rows], [("A-2", 2, 0)])
+        viewer = User.objects.create_user("ws-viewer", password="x")
+        viewer.groups.add(Group.objects.create(name="VIEWER"))
+        self.client.force_login(viewer)
+        self.assertContains(self.client.get("/assets/dashboard/"), '<span data-metric="incomplete_stations">1</span>', html=False)
+
+    def test_move_and_reassign_the_whole_station(self):
+        components = [self._component(category, "B-7") for category in ("CPU", "Monitor", "Keyboard")]
+        assign_asset(asset=components[0], reason=self.reason, assigned_employee=self.owner)
+        technician = User.objects.create_user("ws-tech", password="x")
+        technician.groups.add(Group.objects.create(name="TECHNICIAN"))
+        self.client.force_login(technician)
+        self.assertContains(self.client.get("/assets/stations/b-7/"), "Move the whole station")
+
+        self.client.post("/assets/stations/B-7/move/", {"location": self.annex.pk})
+        self.assertEqual(Asset.objects.filter(station_code="B-7", location=self.annex).count(), 3)
+        self.client.post("/assets/stations/B-7/reassign/", {"assigned_employee": self.user_a.pk, "reason": self.reason.pk})
+        current = AssetAssignment.objects.filter(asset__station_code="B-7", is_current=True)
+        self.assertEqual(set(current.values_list("assigned_employee__dni", flat=True)), {"72727272"})
+        self.assertEqual(current.count(), 3)
+        self.assertEqual(AssetEvent.objects.filter(event_type=AssetEvent.EventType.REASSIGNED).count(), 3)
+        self.assertEqual(
+            AssetEvent.objects.get(asset=components[0], event_type=AssetEvent.EventType.REASSIGNED).description, "Reassigned: Noe Luna -> Ada Paz"
+        )
+
+    def test_station_codes_with_slashes_link_and_resolve(self):
+        cpu = self._component("CPU", "piso2/pc-01")
+        technician = User.objects.create_user("ws-slash", password="x")
+        technician.groups.add(Group.objects.create(name="TECHNICIAN"))
+        self.client.force_login(technician)
+        self.assertContains(self.client.get(f"/assets/{cpu.pk}/"), 'href="/assets/stations/PISO2/PC-01/"')
+        self.assertContains(self.client.get("/assets/stations/"), 'href="/assets/stations/PISO2/PC-01/"')
+        self.assertContains(self.client.get("/assets/stations/PISO2/PC-01/"), 'action="/assets/stations/PISO2/PC-01/move/"')
+        self.client.post("/assets/stations/PISO2/PC-01/move/", {"location": self.annex.pk})
+        cpu.refresh_from_db()
+        self.assertEqual(cpu.location, self.annex)
+
+    def test_moving_a_station_leaves_decommissioned_components(self):
+        cpu = self._component("CPU", "C-3")
+        retired = self._component("Monitor", "C-3")
+        DecommissionRecord.objects.create(asset=retired, reason="Broken", decommission_date=date(2026, 1, 1))
+        self.assertEqual(move_station("c-3", location=self.annex), 1)
+        cpu.refresh_from_db()
+        retired.refresh_from_db()
+        self.assertEqual((cpu.location, retired.location), (self.annex, self.room))
+
+
+class MaintenancePlanTests(TestCase):
+    def setUp(self):
+        self.pc = Category.objects.create(name="CPU")
+        printer = Category.objects.create(name="Printer")
+        location = Location.objects.create(site="Main", floor="1", type="OFFICE", exact_name="Finance")
+        status = Status.objects.create(name="Operational")
+        owner = Employee.objects.create(dni="81818181", first_name="Ema", last_name="Cruz", worker_type=Employee.WorkerType.CAS)
+
+        def make(tag, category):
+            return Asset.objects.create(category=category, location=location, status=status, responsible_employee=owner, asset_tag_internal=tag)
+
+        self.never = make("INT-PM-1", self.pc)
+        self.recent = make("INT-PM-2", self.pc)
+        self.overdue = make("INT-PM-3", self.pc)
+        self.open = make("INT-PM-4", self.pc)
+        make("INT-PM-5", printer)
+        self.today = date(2026, 10, 18)
+        now = timezone.make_aware(datetime(2026, 10, 18, 12))
+        self.now = now
+        for asset, days in ((self.recent, 30), (self.overdue, 200)):
+            MaintenanceRecord.objects.create(
+                asset=asset,
+                maintenance_type=MaintenanceRecord.MaintenanceType.PREVENTIVE,
+                status=MaintenanceRecord.MaintenanceStatus.CLOSED,
+                description="Cleaning",
+                closed_at=now - timedelta(days=days),
+            )
+        MaintenanceRecord.objects.create(asset=self.open, maintenance_type=MaintenanceRecord.MaintenanceType.PREVENTIVE, description="Pending")
+        self.plan = MaintenancePlan.objects.create(name="PC quarterly", category=self.pc, interval_days=90, starts_on=date(2026, 1, 1))
+
+    def _generated(self):
+        return set(MaintenanceRecord.objects.filter(plan=self.plan).values_list("asset__asset_tag_internal", flat=True))
+
+    def test_opens_due_work_orders_once_per_period(self):
+        today = self.today
+        with self.assertNumQueries(7):
+            [(plan, count)] = schedule_preventive(today=today)
+        self.assertEqual(count, 2)
+        self.assertEqual(self._generated(), {"INT-PM-1", "INT-PM-3"})
+        record = MaintenanceRecord.objects.filter(plan=self.plan).first()
+        self.assertEqual((record.status, record.description, record.period_start), ("OPEN", "PC quarterly", self.plan.period_start(today)))
+        self.assertEqual(schedule_preventive(today=today), [(self.plan, 0)])
+
+        MaintenanceRecord.objects.filter(plan=self.plan).update(status=MaintenanceRecord.MaintenanceStatus.CLOSED, closed_at=self.now)
+        # Next period: only the asset whose last service is older than the interval is due yet.
+        self.assertEqual(schedule_preventive(today=today + timedelta(days=89)), [(self.plan, 1)])
+        self.assertEqual(schedule_preventive(today=today + timedelta(days=95)), [(self.plan, 2)])
+
+    def test_counts_only_work_orders_actually_opened(self):
+        period = self.plan.period_start(self.today)
+
+        def opened_concurrently(taken):
+            # Another run opens work orders for `taken` of the due assets between the due query and the insert.
+            def fake(plan, today):
+                ids = list(due_assets(plan, today).values_list("id", flat=True))
+                MaintenanceRecord.objects.bulk_create(
+                    [MaintenanceRecord(asset_id=asset_id, maintenance_type="PREVENTIVE", description="Other run", plan=plan, period_start=period) for asset_id in ids[:taken]]
+                )
+                return Asset.objects.filter(pk__in=ids)
+
+            return mock.patch("assets.maintenance.due_assets", fake)
+
+        with opened_concurrently(1), self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(schedule_preventive(today=self.today), [(self.plan, 1)])
+        self.assertTrue(callbacks)
+        self.assertEqual(self._generated(), {"INT-PM-1", "INT-PM-3"})
+
+        MaintenanceRecord.objects.filter(plan=self.plan).delete()
+        with opened_concurrently(2), self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(schedule_preventive(today=self.today), [(self.plan, 0)])
+        self.assertEqual(callbacks, [])
+
+    def test_period_windows(self):
+        self.assertEqual(self.plan.period_start(date(2026, 1, 1)), date(2026, 1, 1))
+        self.assertEqual(self.plan.period_start(date(2026, 4, 1)), date(2026, 4, 1))
+        self.assertEqual(self.plan.period_start(date(2026, 3, 31)), date(2026, 1, 1))
+        self.assertEqual(self.plan.period_start(date(2025, 6, 1)), date(2026, 1, 1))
+
+    def test_command_dry_run_and_rerun(self):
+        out = StringIO()
+        call_command("schedule_maintenance", "--dry-run", "--date", "2026-10-18", stdout=out)
+        self.assertIn("Dry run: 2 preventive work orders due", out.getvalue())
+        self.assertEqual(self._generated(), set())
+        call_command("schedule_maintenance", "--date", "2026-10-18", stdout=StringIO())
+        out = StringIO()
+        call_command("schedule_maintenance", "--date", "2026-10-18", "--plan", str(self.plan.pk), stdout=out)
+        self.assertIn("0 preventive work orders opened", out.getvalue())
+        self.assertEqual(len(self._generated()), 2)
+
+
+class MaintenanceQueueTests(TestCase):
+    def setUp(self):
+        viewer_group, _ = Group.objects.get_or_create(name="VIEWER")
+        self.user = User.objects.create_user("queue", password="x")
+        self.user.groups.add(viewer_group)
+        self.client.force_login(self.user)
+        self.cpu = Category.objects.create(name="CPU")
+        printer = Category.objects.create(name="Printer")
+        self.lab = Location.objects.create(site="Main", floor="1", type="OFFICE", exact_name="Lab")
+        office = Location.objects.create(site="Main", floor="2", type="OFFICE", exact_name="Office")
+        status = Status.objects.create(name="Operational")
+        owner = Employee.objects.create(dni="82828282", first_name="Lia", last_name="Soto", worker_type=Employee.WorkerType.CAS)
+        self.now = timezone.now()
+        specs = [
+            ("INT-Q-1", self.cpu, self.lab, "OPEN", 10, None),
+            ("INT-Q-2", self.cpu, office, "IN_PROGRESS", 5, None),
+            ("INT-Q-3", printer, self.lab, "OPEN", 1, None),
+            ("INT-Q-4", self.cpu, self.lab, "CLOSED", 4, 2),
+            ("INT-Q-5", self.cpu, office, "CLOSED", 8, 4),
+        ]
+        for tag, category, location, record_status, opened_days, closed_days in specs:
+            asset = Asset.objects.create(category=category, location=location, status=status, responsible_employee=owner, asset_tag_internal=tag)
+            record = MaintenanceRecord.objects.create(
+                asset=asset,
+                maintenance_type=MaintenanceRecord.MaintenanceType.CORRECTIVE,
+                status=record_status,
+                description="Repair",
+                closed_at=None if closed_days is None else self.now - timedelta(days=closed_days),
+            )
+            MaintenanceRecord.objects.filter(pk=record.pk).update(opened_at=self.now - timedelta(days=opened_days))
+
+    def _tags(self, response):
+        return [record.asset.asset_tag_internal for record in response.context["records"]]
+
+    def test_queue_filters_and_keyset_pages(self):
+        url = "/assets/maintenance/"
+        self.assertEqual(self._tags(self.client.get(url)), ["INT-Q-1", "INT-Q-2", "INT-Q-3"])
+        self.assertEqual(self._tags(self.client.get(url, {"status": "CLOSED"})), ["INT-Q-5", "INT-Q-4"])
+        self.assertEqual(self._tags(self.client.get(url, {"location": self.lab.pk, "older_than_days": 3})), ["INT-Q-1"])
+        self.assertEqual(len(self._tags(self.client.get(url, {"status": "ALL"}))), 5)
+
+        self.addCleanup(setattr, views.MaintenanceListView, "page_size", views.MaintenanceListView.page_size)
+        views.MaintenanceListView.page_size = 2
+        first = self.client.get(url)
+        self.assertEqual(self._tags(first), ["INT-Q-1", "INT-Q-2"])
+        second = self.client.get(url, {"after": first.context["next_cursor"]})
+        self.assertEqual(self._tags(second), ["INT-Q-3"])
+        self.assertIsNone(second.context["next_cursor"])
+
+    def test_queue_rows_need_no_extra_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/assets/maintenance/", {"status": "ALL"}, HTTP_HX_REQUEST="true")
+        self.assertContains(response, "Lab")
+        self.assertEqual(sum('"assets_asset"' in query["sql"] for query in ctx.captured_queries), 1)
+
+    def test_sla_metrics_per_category(self):
+        rows = {row["category"]: row for row in compute_sla_metrics(self.now)}
+        cpu = rows["CPU"]
+        self.assertEqual((cpu["open_count"], cpu["closed_count"]), (2, 2))
+        self.assertEqual(cpu["mttr_hours"], 72.0)
+        self.assertEqual((cpu["open_age_p50_hours"], cpu["open_age_p90_hours"]), (180.0, 228.0))
+        self.assertEqual((rows["Printer"]["open_count"], rows["Printer"]["mttr_hours"]), (1, None))
+
+
+class ReliabilityTests(TestCase):
+    def setUp(self):
+        viewer_group, _ = Group.objects.get_or_create(name="VIEWER")
+        self.user = User.objects.create_user("analyst", password="x")
+        self.user.groups.add(viewer_group)
+        cpu = Category.objects.create(name="CPU")
+        printer = Category.objects.create(name="Printer")
+        lab = Location.objects.create(site="Main", floor="1", type="OFFICE", exact_name="Lab")
+        status = Status.objects.create(name="Operational")
+        owner = Employee.objects.create(dni="83838383", first_name="Rui", last_name="Paz", worker_type=Employee.WorkerType.CAS)
+
+        def make(tag, category, acquired, **attributes):
+            return Asset.objects.create(
+                category=category, location=lab, status=status, responsible_employee=owner,
+                asset_tag_internal=tag, acquisition_date=acquired, attributes=attributes,
+            )
+
+        def fail(asset, opened, hours=None):
+            opened_at = timezone.make_aware(datetime.combine(opened, datetime.min.time()))
+            record = MaintenanceRecord.objects.create(
+                asset=asset,
+                maintenance_type=MaintenanceRecord.MaintenanceType.CORRECTIVE,
+                status="OPEN" if hours is None else "CLOSED",
+                description="Failure",
+                closed_at=None if hours is None else opened_at + timedelta(hours=hours),
+            )
+            MaintenanceRecord.objects.filter(pk=record.pk).update(opened_at=opened_at)
+
+        dell = make("INT-R-1", cpu, date(2025, 1, 1), brand="Dell", model="OptiPlex")
+        hp = make("INT-R-2", cpu, date(2026, 4, 4), brand="HP", model="ProDesk")
+        fail(dell, date(2025, 12, 1), hours=4)
+        fail(dell, date(2026, 3, 1), hours=8)
+        fail(dell, date(2025, 6, 1), hours=100)  # before the window
+        fail(hp, date(2026, 9, 1))
+        retired = make("INT-R-3", printer, date(2020, 1, 1))
+        DecommissionRecord.objects.create(asset=retired, reason="Broken", decommission_date=date(2026, 1, 1))
+        ReplacementRecord.objects.create(asset=retired, replacement_asset=hp, reason="Broken", replacement_date=date(2026, 1, 1))
+        gone = make("INT-R-4", printer, date(2020, 1, 1))
+        DecommissionRecord.objects.create(asset=gone, reason="Old", decommission_date=date(2024, 1, 1))
+        self.day = date(2026, 10, 1)
+
+    def test_metrics_per_category_model_and_location(self):
+        with self.assertNumQueries(1):
+            rows = compute_reliability(computed_on=self.day, window_days=365)
+        by_key = {(row.dimension, row.label): row for row in rows}
+        self.assertEqual(len(rows), 6)
+
+        cpu = by_key[("CATEGORY", "CPU")]
+        self.assertEqual((cpu.assets, cpu.operating_days, cpu.failures), (2, 545, 3))
+        self.assertEqual((cpu.mtbf_days, cpu.mttr_hours, cpu.failures_per_asset_year), (181.7, 6.0, 2.009))
+        dell = by_key[("MODEL", "CPU / Dell / OptiPlex")]
+        self.assertEqual((dell.failures, dell.mtbf_days, dell.mttr_hours), (2, 182.5, 6.0))
+        self.assertIsNone(by_key[("MODEL", "CPU / HP / ProDesk")].mttr_hours)
+        printer = by_key[("CATEGORY", "Printer")]
+        self.assertEqual((printer.assets, printer.operating_days, printer.failures, printer.replacements, printer.decommissions), (1, 92, 0, 1, 1))
+        self.assertIsNone(printer.mtbf_days)
+        lab = by_key[("LOCATION", "Lab")]
+        self.assertEqual((lab.assets, lab.failures), (3, 3))
+
+    def test_nightly_snapshot_feeds_report_and_csv(self):
+        call_command("snapshot_reliability", "--date", "2026-10-01", stdout=StringIO())
+        call_command("snapshot_reliability", "--date", "2026-10-01", stdout=StringIO())
+        self.assertEqual(ReliabilitySnapshot.objects.filter(computed_on=self.day).count(), 6)
+
+        self.client.force_login(self.user)
+        response = self.client.get("/assets/reports/reliability/", {"dimension": "MODEL"})
+        self.assertEqual([row.label for row in response.context["rows"]], ["CPU / HP / ProDesk", "CPU / Dell / OptiPlex", "Printer"])
+        response = self.client.get("/assets/reports/reliability.csv", {"dimension": "CATEGORY"})
+        lines = response.content.decode().splitlines()
+        self.assertTrue(lines[0].startswith("dimension,category,brand,model,location,assets"))
+        self.assertEqual(lines[1], "CATEGORY,CPU,,,,2,545,3,181.7,6.0,2.009,0,0,365,2026-10-01")
+
+
+class ReplacementLineageTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="CPU")
+        location = Location.objects.create(site="Main", floor="1", type="OFFICE", exact_name="Lab")
+        status = Status.objects.create(name="Operational")
+        owner = Employee.objects.create(dni="84848484", first_name="Ana", last_name="Rey", worker_type=Employee.WorkerType.CAS)
+        self.a, self.b, self.c, self.d = (
+            Asset.objects.create(category=category, location=location, status=status, responsible_employee=owner, asset_tag_internal=f"INT-L-{n}")
+            for n in range(1, 5)
+        )
+        ReplacementRecord.objects.create(asset=self.a, replacement_asset=self.b, reason="Slow", replacement_date=date(2022, 1, 1))
+        ReplacementRecord.objects.create(asset=self.b, replacement_asset=self.c, reason="Broken", replacement_date=date(2024, 1, 1))
+
+    def test_lineage_walks_both_directions(self):
+        with self.assertNumQueries(2):
+            lineage = asset_lineage(self.b.pk)
+        self.assertEqual([(e["asset"], e["depth"], e["reason"]) for e in lineage["predecessors"]], [(self.a, -1, "Slow")])
+        self.assertEqual([(e["asset"], e["depth"]) for e in lineage["successors"]], [(self.c, 1)])
+        self.assertEqual(lineage["current"], [self.c])
+
+        lineage = asset_lineage(self.c.pk)
+        self.assertEqual([(e["asset"], e["depth"]) for e in lineage["predecessors"]], [(self.a, -2), (self.b, -1)])
+        self.assertEqual(lineage["current"], [])
+        with self.assertNumQueries(1):
+            self.assertEqual(asset_lineage(self.d.pk), {"predecessors": [], "successors": [], "current": []})
+
+    @override_settings(CACHE_INVALIDATION="poll", CACHE_INVALIDATION_POLL_SECONDS=3600)
+    def test_detail_page_shows_current_state_of_related_assets(self):
+        invalidation._store.clear()
+        invalidation._poll_state.update(checked_at=0.0, versions=None)
+        self.addCleanup(invalidation._store.clear)
+        self.client.force_login(User.objects.create_superuser("root", password="x"))
+        self.assertContains(self.client.get(f"/assets/{self.a.pk}/"), "Operational")
+        retired = Status.objects.create(name="Retired")
+        with self.captureOnCommitCallbacks(execute=True):
+            Asset.objects.filter(pk=self.c.pk).update(status=retired)
+        response = self.client.get(f"/assets/{self.a.pk}/")
+        self.assertContains(response, "Retired")
+        self.assertContains(response, "Current successor:")
+
+    def test_cycles_stop_and_successors_resolve_in_batch(self):
+        ReplacementRecord.objects.create(asset=self.c, replacement_asset=self.a, reason="Data error", replacement_date=date(2025, 1, 1))
+        self.assertEqual([e["asset"] for e in asset_lineage(self.a.pk)["successors"]], [self.b, self.c])
+        ReplacementRecord.objects.filter(reason="Data error").delete()
+
+        ReplacementRecord.objects.create(asset=self.c, replacement_asset=self.d, reason="Upgrade", replacement_date=date(2026, 1, 1))
+        with self.assertNumQueries(1):
+            resolved = current_successors()
+        self.assertEqual(resolved, {self.a.pk: [self.d.public_id], self.b.pk: [self.d.public_id], self.c.pk: [self.d.public_id]})
+        self.assertEqual(current_successors([self.b.pk, self.d.pk]), {self.b.pk: [self.d.public_id]})
+        self.assertEqual(current_successors([]), {})
+        rows = {row["id"]: row for row in get_asset_safe_rows()}
+        self.assertEqual((rows[self.a.pk]["current_successor"], rows[self.d.pk]["current_successor"]), (self.d.public_id, ""))
@@ -0,0 +1,70 @@
+"""Identifier prefix search for the asset list typeahead.
+
+Each identifier has an expression index on UPPER(column) with text_pattern_ops, so a prefix
+lookup is a short index range scan; there is no COUNT and no substring match. Queries run
+under a statement timeout, and recent prefixes are served from the per-worker cache until an
+asset changes.
+"""
+from django.conf import settings
+from django.db import OperationalError
+from django.db.models.functions import Collate, Upper
+
+from core.db import statement_timeout
+from core.invalidation import cached, evict, on_evict
+
+from .models import Asset
+
+TYPEAHEAD_NAMESPACE = "asset_typeahead"
+TYPEAHEAD_FIELDS = (
+    ("asset_tag_internal", "Internal"),
+    ("control_patrimonial", "Patrimonial"),
+    ("serial", "Serial"),
+    ("public_id", "Public ID"),
+)
+TYPEAHEAD_LIMIT = 10
+MIN_PREFIX_LENGTH = 2
+CACHED_PREFIXES = 500
+
+
+def normalize_prefix(raw: str) -> str:
+    return raw.strip().upper()[:50]
+
+
+def search_prefix(prefix: str, *, limit: int = TYPEAHEAD_LIMIT) -> list[dict]:
+    """Up to `limit` assets whose identifiers start with `prefix`, field by field in TYPEAHEAD_FIELDS order.
+
+    Raises django.db.OperationalError when the lookups exceed TYPEAHEAD_STATEMENT_TIMEOUT_MS.
+    """
+    matches = {}
+    with statement_timeout(settings.TYPEAHEAD_STATEMENT_TIMEOUT_MS):
+        for field, label in TYPEAHEAD_FIELDS:
+            rows = (
+                Asset.objects.annotate(match=Upper(field))
+                .filter(match__startswith=prefix)
+                # text_pattern_ops compares bytewise, so the index only serves an ORDER BY in the C collation.
+                .order_by(Collate("match", "C"))
+                .values("id", "asset_tag_internal", field)[:limit]
+            )
+            for row in rows:
+                matches.setdefault(row["id"], {"id": row["id"], "asset_tag_internal": row["asset_tag_internal"], "field": label, "value": row[field]})
+            if len(matches) >= limit:
+                break
+    return list(matches.values())[:limit]
+
+
+def typeahead(raw: str) -> dict:
+    """Suggestions for the raw query: {"prefix", "results", "timed_out"}. Timed-out lookups are not cached."""
+    prefix = normalize_prefix(raw)
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return {"prefix": prefix, "results": [], "timed_out": False}
+    try:
+        results = cached(TYPEAHEAD_NAMESPACE, prefix, lambda: search_prefix(prefix), max_entries=CACHED_PREFIXES)
+    except OperationalError:
+        return {"prefix": prefix, "results": [], "timed_out": True}
+    return {"prefix": prefix, "results": results, "timed_out": False}
+
+
+@on_evict
+def _assets_changed(namespace, key):
+    if namespace == "assets":
+        evict(TYPEAHEAD_NAMESPACE)
@@ -1,28 +1,56 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import (
     AssignmentCreateView,
     AssignmentListView,
+    AssetBulkEditView,
     AssetCreateView,
     AssetDetailView,
+    AssetLabelSheetView,
     AssetListView,
     AssetReportCSVView,
     AssetReportView,
+    AssetTypeaheadView,
     AssetUpdateView,
+    AssetWizardIdentifiersView,
     AssetWizardStep1View,
     AssetWizardStep2View,
     AssetWizardStep3View,
     AssetWizardStep4View,
+    AsyncAssetListView,
+    AsyncAssetReportCSVView,
+    AsyncAssetReportView,
+    AsyncConsumableKardexView,
     ConsumableCreateView,
     ConsumableKardexView,
     ConsumableListView,
     ConsumableMovementCreateView,
+    DashboardStreamView,
     DashboardView,
     DecommissionCreateView,
+    DiscoveryIngestView,
     MaintenanceCreateView,
     MaintenanceListView,
+    NetworkSearchView,
+    OffboardingHandoverView,
+    OffboardingView,
     ReassignmentCreateView,
+    ReliabilityReportCSVView,
+    ReliabilityReportView,
     ReplacementCreateView,
+    StationDetailView,
+    StationListView,
+    StationMoveView,
+    StationReassignView,
+    StocktakeApplyCorrectionsView,
+    StocktakeCampaignCreateView,
+    StocktakeCampaignDetailView,
+    StocktakeCampaignListView,
+    StocktakeScanIngestView,
+    StocktakeSessionCloseView,
+    StocktakeSessionCreateView,
+    StocktakeSessionDetailView,
     WizardRulesPanelView,
     WizardStep2FieldsPartialView,
     WizardStep3DetailsPartialView,
@@ -31,24 +59,41 @@ from .views import (
 
 app_name = "assets"
 
+
+def read_view(sync_view, async_view):
+    return (async_view if settings.ASYNC_READ_VIEWS else sync_view).as_view()
+
+
 urlpatterns = [
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
-    path("", AssetListView.as_view(), name="asset_list"),
+    path("dashboard/stream/", DashboardStreamView.as_view(), name="dashboard_stream"),
+    path("", read_view(AssetListView, AsyncAssetListView), name="asset_list"),
     path("create/", AssetCreateView.as_view(), name="asset_create"),
     path("new/step-1/", AssetWizardStep1View.as_view(), name="asset_new_step1"),
     path("new/step-2/", AssetWizardStep2View.as_view(), name="asset_new_step2"),
     path("new/step-3/", AssetWizardStep3View.as_view(), name="asset_new_step3"),
     path("new/step-4/", AssetWizardStep4View.as_view(), name="asset_new_step4"),
+    path("new/identifiers/", AssetWizardIdentifiersView.as_view(), name="asset_new_identifiers"),
     path("new/partials/step-2-fields/", WizardStep2FieldsPartialView.as_view(), name="asset_new_partial_step2"),
     path("new/partials/step-3-details/", WizardStep3DetailsPartialView.as_view(), name="asset_new_partial_step3"),
     path("new/partials/step-4-sensitive/", WizardStep4SensitivePartialView.as_view(), name="asset_new_partial_step4"),
     path("new/partials/rules-panel/", WizardRulesPanelView.as_view(), name="asset_new_partial_rules"),
+    path("typeahead/", AssetTypeaheadView.as_view(), name="asset_typeahead"),
+    path("labels.pdf", AssetLabelSheetView.as_view(), name="asset_labels"),
     path("<int:pk>/", AssetDetailView.as_view(), name="asset_detail"),
     path("<int:pk>/edit/", AssetUpdateView.as_view(), name="asset_edit"),
+    path("bulk-edit/", AssetBulkEditView.as_view(), name="asset_bulk_edit"),
 
     path("assignments/", AssignmentListView.as_view(), name="assignment_list"),
     path("assignments/create/", AssignmentCreateView.as_view(), name="assignment_create"),
     path("assignments/reassign/", ReassignmentCreateView.as_view(), name="reassignment_create"),
+    path("stations/", StationListView.as_view(), name="station_list"),
+    # Station codes may contain "/" (e.g. "PISO2/PC-01"); the actions come first so they match before the detail.
+    path("stations/<path:code>/move/", StationMoveView.as_view(), name="station_move"),
+    path("stations/<path:code>/reassign/", StationReassignView.as_view(), name="station_reassign"),
+    path("stations/<path:code>/", StationDetailView.as_view(), name="station_detail"),
+    path("offboarding/<int:pk>/", OffboardingView.as_view(), name="offboarding"),
+    path("offboarding/handover/", OffboardingHandoverView.as_view(), name="offboarding_handover"),
 
     path("maintenance/", MaintenanceListView.as_view(), name="maintenance_list"),
     path("maintenance/create/", MaintenanceCreateView.as_view(), name="maintenance_create"),
@@ -58,8 +103,22 @@ urlpatterns = [
     path("consumables/", ConsumableListView.as_view(), name="consumable_list"),
     path("consumables/create/", ConsumableCreateView.as_view(), name="consumable_create"),
     path("consumables/movement/create/", ConsumableMovementCreateView.as_view(), name="consumable_movement_create"),
-    path("consumables/<int:pk>/kardex/", ConsumableKardexView.as_view(), name="consumable_kardex"),
+    path("consumables/<int:pk>/kardex/", read_view(ConsumableKardexView, AsyncConsumableKardexView), name="consumable_kardex"),
+
+    path("reports/assets/", read_view(AssetReportView, AsyncAssetReportView), name="asset_report"),
+    path("reports/assets.csv", read_view(AssetReportCSVView, AsyncAssetReportCSVView), name="asset_report_csv"),
+    path("reports/reliability/", ReliabilityReportView.as_view(), name="reliability_report"),
+    path("reports/reliability.csv", ReliabilityReportCSVView.as_view(), name="reliability_report_csv"),
+
+    path("network/", NetworkSearchView.as_view(), name="network_search"),
+    path("discovery/ingest/", DiscoveryIngestView.as_view(), name="discovery_ingest"),
 
-    path("reports/assets/", AssetReportView.as_view(), name="asset_report"),
-    path("reports/assets.csv", AssetReportCSVView.as_view(), name="asset_report_csv"),
+    path("stocktake/", StocktakeCampaignListView.as_view(), name="stocktake_campaign_list"),
+    path("stocktake/create/", StocktakeCampaignCreateView.as_view(), name="stocktake_campaign_create"),
+    path("stocktake/<int:pk>/", StocktakeCampaignDetailView.as_view(), name="stocktake_campaign_detail"),
+    path("stocktake/<int:pk>/sessions/create/", StocktakeSessionCreateView.as_view(), name="stocktake_session_create"),
+    path("stocktake/sessions/<int:pk>/", StocktakeSessionDetailView.as_view(), name="stocktake_session_detail"),
+    path("stocktake/sessions/<int:pk>/scans/", StocktakeScanIngestView.as_view(), name="stocktake_scan_ingest"),
+    path("stocktake/sessions/<int:pk>/apply-corrections/", StocktakeApplyCorrectionsView.as_view(), name="stocktake_apply_corrections"),
+    path("stocktake/sessions/<int:pk>/close/", StocktakeSessionCloseView.as_view(), name="stocktake_session_close"),
 ]
@@ -1,61 +1,96 @@
+import asyncio
 import csv
+import json
+
+from asgiref.sync import sync_to_async
 
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
-from django.db.models import Count, Q
-from django.http import HttpResponse, HttpResponseRedirect
-from django.shortcuts import redirect
+from django.db.models import Count, F, Q
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseRedirect, JsonResponse, QueryDict, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.template.response import TemplateResponse
 from django.urls import reverse, reverse_lazy
-from django.views.generic import CreateView, DetailView, FormView, ListView, TemplateView, UpdateView
-
-from accounts.mixins import AssetManageRequiredMixin, AssetViewRequiredMixin
-from accounts.roles import can_manage_assets, is_admin
+from django.utils import timezone
+from django.views.generic import CreateView, DetailView, FormView, ListView, TemplateView, UpdateView, View
+
+from accounts.context_processors import role_flags
+from accounts.mixins import AssetManageRequiredMixin, AssetViewRequiredMixin, AsyncAssetViewRequiredMixin, IntegrationTokenRequiredMixin
+from accounts.models import IntegrationToken
+from accounts.roles import can_manage_assets, can_view_assets, is_admin
+from core.models import Category, Location, Status
+from core.pagination import keyset_after, paginate_keyset
+from core.replica import ReplicaReadMixin, use_replica
+from employees.models import Employee
 
 from .forms import (
     AssignmentForm,
+    AssetBulkEditForm,
     AssetForm,
     AssetWizardStep1Form,
     AssetWizardStep2Form,
+    AssetWizardIdentifiersForm,
     AssetWizardStep3Form,
     AssetWizardStep4SensitiveForm,
     ConsumableItemForm,
     ConsumableMovementForm,
     DecommissionForm,
     MaintenanceForm,
+    MaintenanceQueueFilterForm,
+    OffboardingForm,
     ReassignmentForm,
     ReplacementForm,
+    StocktakeCampaignForm,
+    StocktakeScanForm,
+    StationMoveForm,
+    StationReassignForm,
+    StocktakeSessionForm,
 )
 from .models import (
     Asset,
     AssetAssignment,
     AssetEvent,
     AssetSensitiveData,
-    CameraDetails,
-    ComputerSpecs,
     ConsumableItem,
     ConsumableMovement,
     DecommissionRecord,
     MaintenanceRecord,
-    NetworkDeviceDetails,
-    PeripheralDetails,
-    PrinterDetails,
+    ReliabilitySnapshot,
     ReplacementRecord,
-    TeleconferenceDetails,
+    StocktakeCampaign,
+    StocktakeSession,
 )
-from .reports import get_asset_safe_rows
-from .services import assign_asset, reassign_asset
+from .attributes import attribute_filter
+from .bulk import bulk_edit_assets, create_asset_batch
+from .detail import asset_detail
+from .discovery import ingest_hardware_reports
+from .fragments import ASSET_TABLES, ASSIGNMENT_TABLES, CONSUMABLE_TABLES, MAINTENANCE_TABLES, CachedTableMixin
+from .labels import iter_label_pdf, iter_labels, label_queryset
+from .lineage import asset_lineage
+from .live import broadcaster, compute_metrics, format_event
+from .maintenance import QUEUE_ORDERING, maintenance_queue, sla_metrics
+from .network import assets_by_mac, assets_in_subnet, duplicate_ips
+from .offboarding import holdings_queryset, offboard_employee
+from .outbox import enqueue
+from .reliability import CSV_FIELDS as RELIABILITY_CSV_FIELDS, csv_row, latest_snapshot
+from .reports import aiter_asset_safe_rows, get_asset_safe_rows
+from .services import assign_asset, build_detail_record, reassign_asset
+from .stations import incomplete_stations, move_station, normalize_station_code, reassign_station, station_components, station_summaries
+from .stocktake import MAX_CODE_LENGTH, apply_location_corrections, close_session, ingest_scans, reconcile_session
+from .typeahead import typeahead
 
 
 WIZARD_SESSION_KEY = "wizard.asset"
-COMPUTER_CATEGORIES = {"CPU", "Laptop", "Server"}
-NETWORK_CATEGORIES = {"Switch", "Access Point", "Router"}
+HANDOVER_SESSION_KEY = "offboarding.handover"
 CAMERA_CATEGORIES = {"Security Camera", "Webcam"}
 PATRIMONIAL_REQUIRED_CATEGORIES = Asset.PATRIMONIAL_REQUIRED_CATEGORIES
 SENSITIVE_STEP_CATEGORIES = {"CPU", "Laptop", "Server"}
 
 
-class DashboardView(AssetViewRequiredMixin, TemplateView):
+class DashboardView(ReplicaReadMixin, AssetViewRequiredMixin, TemplateView):
     template_name = "dashboard/index.html"
 
     def get_context_data(self, **kwargs):
@@ -66,11 +101,44 @@ class DashboardView(AssetViewRequiredMixin, TemplateView):
         ctx["open_maintenance"] = MaintenanceRecord.objects.exclude(status=MaintenanceRecord.MaintenanceStatus.CLOSED).count()
         ctx["decommissioned_assets"] = DecommissionRecord.objects.count()
         ctx["inoperative_assets"] = Asset.objects.filter(status__name="Inoperative").count()
-        ctx["low_stock_items"] = [i for i in ConsumableItem.objects.all() if i.is_low_stock]
+        ctx["low_stock_items"] = ConsumableItem.objects.with_stock().filter(stock__lte=F("min_stock"))
+        ctx["incomplete_stations"] = incomplete_stations().count()
+        ctx["maintenance_sla"] = sla_metrics()
         ctx["category_counts"] = Asset.objects.values("category__name").annotate(total=Count("id")).order_by("-total")[:8]
         return ctx
 
 
+class DashboardStreamView(View):
+    """Server-sent events with dashboard metric deltas, shared by every open dashboard of this worker."""
+
+    keepalive_seconds = 20
+
+    async def get(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated or not await sync_to_async(can_view_assets)(user):
+            return HttpResponse(status=403)
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        if not isinstance(request, ASGIRequest):
+            # A WSGI worker cannot hold the stream open: send one snapshot and let EventSource reconnect.
+            body = format_event("snapshot", await compute_metrics()) + "retry: 15000\n\n"
+            return HttpResponse(body, content_type="text/event-stream", headers=headers)
+        return StreamingHttpResponse(self.stream(), content_type="text/event-stream", headers=headers)
+
+    async def stream(self):
+        queue, snapshot = await broadcaster.subscribe()
+        try:
+            yield format_event("snapshot", snapshot)
+            while True:
+                try:
+                    delta = await asyncio.wait_for(queue.get(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event("delta", delta)
+        finally:
+            broadcaster.unsubscribe(queue)
+
+
 class WizardManageMixin(AssetManageRequiredMixin):
     def dispatch(self, request, *args, **kwargs):
         if not can_manage_assets(request.user):
@@ -89,10 +157,14 @@ class AssetWizardStep1View(WizardManageMixin, FormView):
     form_class = AssetWizardStep1Form
     template_name = "assets/wizard/step1.html"
 
-
     def get_initial(self):
         data = self.get_wizard_data()
-        return {"category": data.get("category_id"), "ownership_type": data.get("ownership_type"), "provider_name": data.get("provider_name")}
+        return {
+            "category": data.get("category_id"),
+            "ownership_type": data.get("ownership_type"),
+            "provider_name": data.get("provider_name"),
+            "quantity_mode": data.get("quantity_mode"),
+        }
 
     def form_valid(self, form):
         data = self.get_wizard_data()
@@ -103,6 +175,7 @@ class AssetWizardStep1View(WizardManageMixin, FormView):
                 "category_name": form.cleaned_data["category"].name,
                 "ownership_type": form.cleaned_data["ownership_type"],
                 "provider_name": form.cleaned_data.get("provider_name", ""),
+                "quantity_mode": form.cleaned_data["quantity_mode"],
             }
         )
         self.set_wizard_data(data)
@@ -122,6 +195,7 @@ class AssetWizardStep2View(WizardManageMixin, FormView):
         kwargs = super().get_form_kwargs()
         data = self.get_wizard_data()
         kwargs["ownership_type"] = data.get("ownership_type")
+        kwargs["quantity_mode"] = data.get("quantity_mode", False)
         return kwargs
 
     def get_initial(self):
@@ -171,12 +245,15 @@ class AssetWizardStep3View(WizardManageMixin, FormView):
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
-        kwargs["category_name"] = self.get_wizard_data().get("category_name")
+        data = self.get_wizard_data()
+        kwargs["category_name"] = data.get("category_name")
+        kwargs["quantity_mode"] = data.get("quantity_mode", False)
         return kwargs
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx["category_name"] = self.get_wizard_data().get("category_name")
+        ctx["quantity_mode"] = self.get_wizard_data().get("quantity_mode", False)
         return ctx
 
     def form_valid(self, form):
@@ -184,6 +261,8 @@ class AssetWizardStep3View(WizardManageMixin, FormView):
         data["step3_done"] = True
         data["step3"] = form.cleaned_data
         self.set_wizard_data(data)
+        if data.get("quantity_mode"):
+            return redirect("assets:asset_new_identifiers")
         if is_admin(self.request.user) and data.get("category_name") in SENSITIVE_STEP_CATEGORIES:
             return redirect("assets:asset_new_step4")
         try:
@@ -209,35 +288,29 @@ class AssetWizardStep3View(WizardManageMixin, FormView):
                 location_id=step2["location"],
                 status_id=step2["status"],
                 observations=step2.get("observations") or "",
+                attributes=data.get("step3", {}),
             )
             self._create_details(asset, data.get("step3", {}), data.get("category_name"))
             if sensitive_payload:
                 AssetSensitiveData.objects.update_or_create(asset=asset, defaults={**sensitive_payload, "updated_by": self.request.user})
             AssetEvent.objects.create(asset=asset, event_type=AssetEvent.EventType.CREATED, created_by=self.request.user, description=f"Created {asset.public_id}")
+            enqueue(
+                "asset.created",
+                asset=asset,
+                payload={
+                    "public_id": asset.public_id,
+                    "category": data.get("category_name"),
+                    "location_id": asset.location_id,
+                    "responsible_employee_id": asset.responsible_employee_id,
+                },
+            )
         self.request.session.pop(WIZARD_SESSION_KEY, None)
 
     @staticmethod
     def _create_details(asset, payload, category_name):
-        if category_name in COMPUTER_CATEGORIES:
-            ComputerSpecs.objects.create(
-                asset=asset,
-                cpu_model=payload.get("processor") or payload.get("model") or "N/A",
-                ram_gb=payload.get("ram_total_gb") or 0,
-                storage_gb=0,
-                os_name=payload.get("os_name") or "",
-                ip_address=payload.get("ip") or None,
-                mac_address=payload.get("mac") or "",
-            )
-        elif category_name in {"Monitor", "Keyboard", "Teclado", "Webcam", "Headphones", "Microphone", "PC Speaker", "Projector", "Interactive Whiteboard", "Air Conditioner", "Biometric Clock", "Tablet", "Sound Console"}:
-            PeripheralDetails.objects.create(asset=asset, brand=payload.get("brand") or "", model=payload.get("model") or "")
-        elif category_name == "Printer":
-            PrinterDetails.objects.create(asset=asset, print_technology=payload.get("brand") or "", ppm=0)
-        elif category_name in NETWORK_CATEGORIES:
-            NetworkDeviceDetails.objects.create(asset=asset, managed=bool(payload.get("managed_by_text")), wifi_standard="")
-        elif category_name == "Teleconference":
-            TeleconferenceDetails.objects.create(asset=asset)
-        elif category_name == "Security Camera":
-            CameraDetails.objects.create(asset=asset)
+        record = build_detail_record(asset, payload, category_name)
+        if record is not None:
+            record.save()
 
 
 class AssetWizardStep4View(AssetWizardStep3View):
@@ -273,6 +346,53 @@ class AssetWizardStep4View(AssetWizardStep3View):
         return redirect("assets:asset_list")
 
 
+class AssetWizardIdentifiersView(WizardManageMixin, FormView):
+    """Quantity mode: one asset per listed identifier, sharing the data of steps 1-3, created in bulk.
+
+    Sensitive data (step 4) is per device, so it is added on each asset afterwards.
+    """
+
+    form_class = AssetWizardIdentifiersForm
+    template_name = "assets/wizard/identifiers.html"
+
+    def dispatch(self, request, *args, **kwargs):
+        data = self.get_wizard_data()
+        if not data.get("quantity_mode"):
+            return redirect("assets:asset_new_step1")
+        if not data.get("step3_done"):
+            return redirect("assets:asset_new_step3")
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["category_name"] = self.get_wizard_data().get("category_name")
+        return ctx
+
+    def form_valid(self, form):
+        data = self.get_wizard_data()
+        step2 = data["step2"]
+        shared = {
+            "category": get_object_or_404(Category, pk=data["category_id"]),
+            "ownership_type": data["ownership_type"],
+            "provider_name": data.get("provider_name") or None,
+            "acquisition_date": step2.get("acquisition_date") or None,
+            "station_code": step2.get("station_code") or None,
+            "responsible_employee": get_object_or_404(Employee, pk=step2["responsible_employee"]),
+            "location": get_object_or_404(Location, pk=step2["location"]),
+            "status": get_object_or_404(Status, pk=step2["status"]),
+            "observations": step2.get("observations") or "",
+            "attributes": data.get("step3", {}),
+        }
+        try:
+            assets = create_asset_batch(shared=shared, identifiers=form.cleaned_data["rows"], details=data.get("step3", {}), actor=self.request.user)
+        except ValidationError as exc:
+            form.add_error(None, exc)
+            return self.form_invalid(form)
+        self.request.session.pop(WIZARD_SESSION_KEY, None)
+        messages.success(self.request, f"Created {len(assets)} assets: {assets[0].public_id} to {assets[-1].public_id}.")
+        return redirect("assets:asset_list")
+
+
 class WizardRulesPanelView(WizardManageMixin, TemplateView):
     template_name = "assets/wizard/partials/rules_panel.html"
 
@@ -307,50 +427,147 @@ class WizardStep4SensitivePartialView(WizardManageMixin, TemplateView):
         return super().dispatch(request, *args, **kwargs)
 
 
-class AssetListView(AssetViewRequiredMixin, ListView):
+def search_assets(params):
+    """Asset list queryset for the `q` and `attr.<key>` filters; raises ValidationError for a bad attribute filter."""
+    q = params.get("q", "").strip()
+    qs = Asset.objects.select_related("category", "location", "status", "responsible_employee").order_by("-created_at")
+    if q:
+        qs = qs.filter(
+            Q(asset_tag_internal__icontains=q)
+            | Q(control_patrimonial__icontains=q)
+            | Q(serial__icontains=q)
+            | Q(category__name__icontains=q)
+            | Q(location__exact_name__icontains=q)
+            | Q(public_id__icontains=q)
+        )
+    attribute_terms = {key[5:]: value for key, value in params.items() if key.startswith("attr.") and value}
+    if attribute_terms:
+        qs = qs.filter(attribute_filter(attribute_terms))
+    return qs
+
+
+def filter_query(params) -> str:
+    """The search part of the list query string, which the bulk edit form posts back for "all matching"."""
+    params = params.copy()
+    params.pop("page", None)
+    return params.urlencode()
+
+
+class AssetListView(AssetViewRequiredMixin, CachedTableMixin, ListView):
     model = Asset
     template_name = "assets/asset_list.html"
+    fragment_template_name = "assets/partials/asset_table.html"
+    fragment_namespace = ASSET_TABLES
     context_object_name = "assets"
     paginate_by = 20
 
     def get_queryset(self):
-        q = self.request.GET.get("q", "").strip()
-        qs = Asset.objects.select_related("category", "location", "status", "responsible_employee").order_by("-created_at")
-        if q:
-            qs = qs.filter(
-                Q(asset_tag_internal__icontains=q)
-                | Q(control_patrimonial__icontains=q)
-                | Q(serial__icontains=q)
-                | Q(category__name__icontains=q)
-                | Q(location__exact_name__icontains=q)
-                | Q(public_id__icontains=q)
+        try:
+            return search_assets(self.request.GET)
+        except ValidationError as exc:
+            messages.error(self.request, exc.messages[0])
+            return Asset.objects.none()
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["filter_query"] = filter_query(self.request.GET)
+        return ctx
+
+    def render_to_response(self, context, **response_kwargs):
+        context["bulk_form"] = AssetBulkEditForm()
+        return super().render_to_response(context, **response_kwargs)
+
+
+class AsyncAssetListView(AsyncAssetViewRequiredMixin, View):
+    """AssetListView on the async ORM: the worker thread is free while the search query runs."""
+
+    paginate_by = AssetListView.paginate_by
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            qs = search_assets(request.GET)
+        except ValidationError as exc:
+            messages.error(request, exc.messages[0])
+            qs = Asset.objects.none()
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+        offset = (page - 1) * self.paginate_by
+        assets = [asset async for asset in qs[offset : offset + self.paginate_by]]
+        count = await qs.acount()
+        context = {
+            "assets": assets,
+            "page_number": page,
+            "count": count,
+            "has_next": offset + len(assets) < count,
+            "filter_query": filter_query(request.GET),
+            **await sync_to_async(role_flags)(request),
+        }
+        table_html = await sync_to_async(render_to_string)(AssetListView.fragment_template_name, context)
+        if request.headers.get("HX-Request"):
+            return HttpResponse(table_html)
+        return TemplateResponse(request, AssetListView.template_name, {**context, "table_html": table_html, "bulk_form": AssetBulkEditForm()})
+
+
+class AssetBulkEditView(AssetManageRequiredMixin, View):
+    """Apply one status, location or responsible employee to the checked assets or to every asset matching the search."""
+
+    def post(self, request, *args, **kwargs):
+        form = AssetBulkEditForm(request.POST)
+        back = reverse("assets:asset_list")
+        if request.POST.get("filter"):
+            back += "?" + request.POST["filter"]
+        if not form.is_valid():
+            messages.error(request, next(iter(form.errors.values()))[0])
+            return redirect(back)
+        try:
+            if form.cleaned_data["scope"] == AssetBulkEditForm.SCOPE_FILTER:
+                queryset = search_assets(QueryDict(form.cleaned_data["filter"]))
+            else:
+                queryset = form.cleaned_data["ids"]
+            changed = bulk_edit_assets(
+                queryset=queryset,
+                changes={field: form.cleaned_data[field] for field in ("status", "location", "responsible_employee")},
+                actor=request.user,
             )
-        return qs
+        except ValidationError as exc:
+            messages.error(request, exc.messages[0])
+        else:
+            messages.success(request, f"{changed} assets updated.")
+        return redirect(back)
 
-    def get_template_names(self):
-        if self.request.headers.get("HX-Request"):
-            return ["assets/partials/asset_table.html"]
-        return [self.template_name]
 
+class AssetTypeaheadView(AssetViewRequiredMixin, TemplateView):
+    template_name = "assets/partials/asset_typeahead.html"
 
-class AssetDetailView(AssetViewRequiredMixin, DetailView):
-    model = Asset
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx.update(typeahead(self.request.GET.get("q", "")))
+        return ctx
+
+
+def asset_detail_context(payload, user) -> dict:
+    """The cached detail payload plus the parts that depend on who is looking."""
+    context = dict(payload)
+    sensitive = context.pop("sensitive_data")
+    if sensitive:
+        context["sensitive"] = sensitive.as_safe_dict(user)
+    else:
+        context["sensitive"] = {"cpu_padlock_key": None, "license_secret": None, "has_padlock_key": False, "has_license": False}
+    context["object"] = context["asset"]
+    context["is_admin"] = is_admin(user)
+    # Not cached: it shows other assets' status and codes, which change without touching this one.
+    context["lineage"] = asset_lineage(context["asset"].pk)
+    return context
+
+
+class AssetDetailView(AssetViewRequiredMixin, TemplateView):
     template_name = "assets/asset_detail.html"
-    context_object_name = "asset"
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        asset = self.object
-        sensitive = getattr(asset, "sensitive_data", None)
-        if sensitive:
-            ctx["sensitive"] = sensitive.as_safe_dict(self.request.user)
-        else:
-            ctx["sensitive"] = {"cpu_padlock_key": None, "license_secret": None, "has_padlock_key": False, "has_license": False}
-        ctx["is_admin"] = is_admin(self.request.user)
-        ctx["current_assignment"] = asset.assignments.filter(is_current=True).select_related("assigned_employee").first()
-        ctx["maintenance_records"] = asset.maintenance_records.order_by("-opened_at")[:5]
-        ctx["replacement_records"] = asset.replacement_records.order_by("-replacement_date")[:5]
-        ctx["decommission_record"] = getattr(asset, "decommission_record", None)
+        ctx.update(asset_detail_context(asset_detail(self.kwargs["pk"]), self.request.user))
         return ctx
 
 
@@ -368,9 +585,11 @@ class AssetUpdateView(AssetManageRequiredMixin, UpdateView):
     success_url = reverse_lazy("assets:asset_list")
 
 
-class AssignmentListView(AssetViewRequiredMixin, ListView):
+class AssignmentListView(AssetViewRequiredMixin, CachedTableMixin, ListView):
     model = AssetAssignment
     template_name = "assets/assignment_list.html"
+    fragment_template_name = "assets/partials/assignment_table.html"
+    fragment_namespace = ASSIGNMENT_TABLES
     context_object_name = "assignments"
 
     def get_queryset(self):
@@ -409,10 +628,167 @@ class ReassignmentCreateView(AssetManageRequiredMixin, CreateView):
         return HttpResponseRedirect(str(self.success_url))
 
 
-class MaintenanceListView(AssetViewRequiredMixin, ListView):
+class StationListView(AssetViewRequiredMixin, TemplateView):
+    """Workstations with their component counts; ?incomplete=1 keeps the ones missing a component."""
+
+    template_name = "assets/station_list.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        only_incomplete = bool(self.request.GET.get("incomplete"))
+        ctx["stations"] = list(incomplete_stations() if only_incomplete else station_summaries())
+        ctx["only_incomplete"] = only_incomplete
+        return ctx
+
+
+class StationDetailView(AssetViewRequiredMixin, TemplateView):
+    template_name = "assets/station_detail.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        components = station_components(kwargs["code"])
+        if not components:
+            raise Http404("No assets use this station code.")
+        ctx.update(
+            station=normalize_station_code(kwargs["code"]),
+            components=components,
+            move_form=StationMoveForm(),
+            reassign_form=StationReassignForm(),
+        )
+        return ctx
+
+
+class StationMoveView(AssetManageRequiredMixin, View):
+    def post(self, request, code):
+        form = StationMoveForm(request.POST)
+        if form.is_valid():
+            try:
+                moved = move_station(code, location=form.cleaned_data["location"], actor=request.user)
+            except ValidationError as exc:
+                messages.error(request, exc.messages[0])
+            else:
+                messages.success(request, f"{moved} components moved to {form.cleaned_data['location']}.")
+        else:
+            messages.error(request, "Choose a location.")
+        return redirect("assets:station_detail", code=normalize_station_code(code))
+
+
+class StationReassignView(AssetManageRequiredMixin, View):
+    def post(self, request, code):
+        form = StationReassignForm(request.POST)
+        if form.is_valid():
+            try:
+                count = reassign_station(
+                    code, reason=form.cleaned_data["reason"], assigned_employee=form.cleaned_data["assigned_employee"], actor=request.user
+                )
+            except ValidationError as exc:
+                messages.error(request, exc.messages[0])
+            else:
+                messages.success(request, f"{count} components reassigned to {form.cleaned_data['assigned_employee']}.")
+        else:
+            messages.error(request, "Choose an employee and a reason.")
+        return redirect("assets:station_detail", code=normalize_station_code(code))
+
+
+class OffboardingView(AssetManageRequiredMixin, FormView):
+    """Preview everything a departing employee holds, then hand it all to a successor in one transaction."""
+
+    form_class = OffboardingForm
+    template_name = "assets/offboarding_form.html"
+
+    def dispatch(self, request, *args, **kwargs):
+        self.employee = get_object_or_404(Employee, pk=kwargs["pk"])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), "employee": self.employee}
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx.update(employee=self.employee, holdings=list(holdings_queryset(self.employee)))
+        return ctx
+
+    def form_valid(self, form):
+        try:
+            handover = offboard_employee(
+                employee=self.employee,
+                target=form.cleaned_data["successor"],
+                reason=form.cleaned_data["reason"],
+                actor=self.request.user,
+                deactivate=form.cleaned_data["deactivate_employee"],
+            )
+        except ValidationError as exc:
+            form.add_error(None, exc)
+            return self.form_invalid(form)
+        self.request.session[HANDOVER_SESSION_KEY] = handover
+        messages.success(self.request, f"{len(handover['assets'])} assets handed over to {form.cleaned_data['successor']}.")
+        return redirect("assets:offboarding_handover")
+
+
+class OffboardingHandoverView(AssetManageRequiredMixin, TemplateView):
+    """The last signed handover summary of this session, as a page or as a JSON download (?format=json)."""
+
+    template_name = "assets/offboarding_handover.html"
+
+    def get(self, request, *args, **kwargs):
+        handover = request.session.get(HANDOVER_SESSION_KEY)
+        if handover is None:
+            raise Http404("No handover in this session.")
+        if request.GET.get("format") == "json":
+            response = JsonResponse(handover, json_dumps_params={"indent": 2})
+            dni = handover["employee"]["dni"]
+            response["Content-Disposition"] = f'attachment; filename="handover-{dni}.json"'
+            return response
+        return self.render_to_response(self.get_context_data(handover=handover))
+
+
+class MaintenanceListView(AssetViewRequiredMixin, CachedTableMixin, ListView):
+    """Technician work queue: status, type, location and age filters, oldest first, keyset pages."""
+
     model = MaintenanceRecord
     template_name = "assets/maintenance_list.html"
+    fragment_template_name = "assets/partials/maintenance_table.html"
+    fragment_namespace = MAINTENANCE_TABLES
     context_object_name = "records"
+    page_size = 50
+
+    def get_filter_form(self):
+        if not hasattr(self, "_filter_form"):
+            self._filter_form = MaintenanceQueueFilterForm(self.request.GET)
+        return self._filter_form
+
+    def get_fragment_key(self, flags) -> tuple:
+        # The age filter moves with the clock; a cached table is kept for the day at most.
+        return (*super().get_fragment_key(flags), timezone.localdate().isoformat())
+
+    def get_queryset(self):
+        form = self.get_filter_form()
+        if not form.is_valid():
+            return MaintenanceRecord.objects.none()
+        return maintenance_queue(**form.queue_filters())
+
+    def get(self, request, *args, **kwargs):
+        # Checked before the table cache: a message added while rendering would be lost on a hit.
+        self.cursor = request.GET.get("after", "")
+        if self.cursor:
+            try:
+                keyset_after(MaintenanceRecord.objects.all(), QUEUE_ORDERING, self.cursor)
+            except ValidationError as exc:
+                messages.error(request, exc.messages[0])
+                self.cursor = ""
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        records, next_cursor = paginate_keyset(self.object_list, ordering=QUEUE_ORDERING, cursor=self.cursor, limit=self.page_size)
+        params = self.request.GET.copy()
+        params.pop("after", None)
+        ctx = super().get_context_data(object_list=records, **kwargs)
+        ctx.update(next_cursor=next_cursor, filter_query=params.urlencode(), is_first_page=not self.cursor)
+        return ctx
+
+    def render_to_response(self, context, **response_kwargs):
+        context["filter_form"] = self.get_filter_form()
+        return super().render_to_response(context, **response_kwargs)
 
 
 class MaintenanceCreateView(AssetManageRequiredMixin, CreateView):
@@ -448,11 +824,16 @@ class DecommissionCreateView(AssetManageRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class ConsumableListView(AssetViewRequiredMixin, ListView):
+class ConsumableListView(AssetViewRequiredMixin, CachedTableMixin, ListView):
     model = ConsumableItem
     template_name = "assets/consumable_list.html"
+    fragment_template_name = "assets/partials/consumable_table.html"
+    fragment_namespace = CONSUMABLE_TABLES
     context_object_name = "items"
 
+    def get_queryset(self):
+        return ConsumableItem.objects.with_stock()
+
 
 class ConsumableCreateView(AssetManageRequiredMixin, CreateView):
     model = ConsumableItem
@@ -477,13 +858,29 @@ class ConsumableKardexView(AssetViewRequiredMixin, DetailView):
     template_name = "assets/consumable_kardex.html"
     context_object_name = "item"
 
+    def get_queryset(self):
+        return ConsumableItem.objects.with_stock()
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx["movements"] = self.object.movements.select_related("created_by")[:100]
         return ctx
 
 
-class AssetReportView(AssetViewRequiredMixin, TemplateView):
+class AsyncConsumableKardexView(AsyncAssetViewRequiredMixin, View):
+    async def get(self, request, pk, *args, **kwargs):
+        item = await aget_object_or_404(ConsumableItem.objects.with_stock(), pk=pk)
+        movements = [movement async for movement in item.movements.select_related("created_by")[:100]]
+        return TemplateResponse(request, "assets/consumable_kardex.html", {"item": item, "object": item, "movements": movements})
+
+
+REPORT_CSV_FIELDS = [
+    "id", "category", "location", "status", "responsible", "current_assigned", "asset_tag_internal",
+    "control_patrimonial", "serial", "ownership_type", "provider_name", "has_padlock_key", "has_license", "current_successor"
+]
+
+
+class AssetReportView(ReplicaReadMixin, AssetViewRequiredMixin, TemplateView):
     template_name = "assets/report_assets.html"
 
     def get_context_data(self, **kwargs):
@@ -492,16 +889,240 @@ class AssetReportView(AssetViewRequiredMixin, TemplateView):
         return ctx
 
 
-class AssetReportCSVView(AssetViewRequiredMixin, TemplateView):
+class AsyncAssetReportView(ReplicaReadMixin, AsyncAssetViewRequiredMixin, View):
+    async def get(self, request, *args, **kwargs):
+        rows = [row async for row in aiter_asset_safe_rows()]
+        return TemplateResponse(request, "assets/report_assets.html", {"rows": rows})
+
+
+class AssetReportCSVView(ReplicaReadMixin, AssetViewRequiredMixin, TemplateView):
     def get(self, request, *args, **kwargs):
         rows = get_asset_safe_rows()
         response = HttpResponse(content_type="text/csv")
         response["Content-Disposition"] = 'attachment; filename="asset_report_safe.csv"'
-        writer = csv.DictWriter(response, fieldnames=list(rows[0].keys()) if rows else [
-            "id", "category", "location", "status", "responsible", "current_assigned", "asset_tag_internal",
-            "control_patrimonial", "serial", "ownership_type", "provider_name", "has_padlock_key", "has_license"
-        ])
+        writer = csv.DictWriter(response, fieldnames=REPORT_CSV_FIELDS)
         writer.writeheader()
         for row in rows:
             writer.writerow(row)
         return response
+
+
+class ReliabilityReportView(ReplicaReadMixin, AssetViewRequiredMixin, TemplateView):
+    """The latest nightly reliability snapshot, optionally limited to one dimension (?dimension=MODEL)."""
+
+    template_name = "assets/report_reliability.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        dimension = self.request.GET.get("dimension", "")
+        if dimension not in ReliabilitySnapshot.Dimension.values:
+            dimension = ""
+        rows = list(latest_snapshot(dimension))
+        ctx.update(rows=rows, dimension=dimension, dimensions=ReliabilitySnapshot.Dimension.choices, computed_on=rows[0].computed_on if rows else None)
+        return ctx
+
+
+class ReliabilityReportCSVView(ReplicaReadMixin, AssetViewRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        dimension = request.GET.get("dimension", "")
+        rows = latest_snapshot(dimension if dimension in ReliabilitySnapshot.Dimension.values else "")
+        response = HttpResponse(content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="reliability_report.csv"'
+        writer = csv.DictWriter(response, fieldnames=RELIABILITY_CSV_FIELDS)
+        writer.writeheader()
+        for snapshot in rows:
+            writer.writerow(csv_row(snapshot))
+        return response
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class AsyncAssetReportCSVView(ReplicaReadMixin, AsyncAssetViewRequiredMixin, View):
+    """Stream the CSV while rows are still being fetched, in chunks from a server-side cursor."""
+
+    async def get(self, request, *args, **kwargs):
+        response = StreamingHttpResponse(self.stream(), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="asset_report_safe.csv"'
+        return response
+
+    async def stream(self):
+        writer = csv.DictWriter(_Echo(), fieldnames=REPORT_CSV_FIELDS)
+        yield writer.writeheader()
+        # The response body is iterated after dispatch returns, so re-enter the replica context here.
+        with use_replica(self.request):
+            async for row in aiter_asset_safe_rows():
+                yield writer.writerow(row)
+
+
+class StocktakeCampaignListView(AssetViewRequiredMixin, ListView):
+    model = StocktakeCampaign
+    template_name = "assets/stocktake_campaign_list.html"
+    context_object_name = "campaigns"
+
+    def get_queryset(self):
+        return StocktakeCampaign.objects.annotate(session_count=Count("sessions"))
+
+
+class StocktakeCampaignCreateView(AssetManageRequiredMixin, CreateView):
+    model = StocktakeCampaign
+    form_class = StocktakeCampaignForm
+    template_name = "assets/stocktake_campaign_form.html"
+
+    def form_valid(self, form):
+        form.instance.created_by = self.request.user
+        return super().form_valid(form)
+
+    def get_success_url(self):
+        return reverse("assets:stocktake_campaign_detail", args=[self.object.pk])
+
+
+class StocktakeCampaignDetailView(AssetViewRequiredMixin, DetailView):
+    model = StocktakeCampaign
+    template_name = "assets/stocktake_campaign_detail.html"
+    context_object_name = "campaign"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["sessions"] = self.object.sessions.select_related("location").annotate(scan_count=Count("scans"))
+        ctx["session_form"] = StocktakeSessionForm(campaign=self.object)
+        return ctx
+
+
+class StocktakeSessionCreateView(AssetManageRequiredMixin, View):
+    def post(self, request, pk):
+        campaign = get_object_or_404(StocktakeCampaign, pk=pk, status=StocktakeCampaign.CampaignStatus.OPEN)
+        form = StocktakeSessionForm(request.POST, campaign=campaign)
+        if not form.is_valid():
+            messages.error(request, "Select a location without a session in this campaign.")
+            return redirect("assets:stocktake_campaign_detail", pk=campaign.pk)
+        form.instance.campaign = campaign
+        form.instance.started_by = request.user
+        session = form.save()
+        return redirect("assets:stocktake_session_detail", pk=session.pk)
+
+
+class StocktakeSessionDetailView(AssetViewRequiredMixin, DetailView):
+    model = StocktakeSession
+    template_name = "assets/stocktake_session_detail.html"
+    context_object_name = "session"
+
+    def get_queryset(self):
+        return StocktakeSession.objects.select_related("campaign", "location")
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["reconciliation"] = reconcile_session(self.object)
+        ctx["scan_form"] = StocktakeScanForm()
+        return ctx
+
+
+class StocktakeScanIngestView(AssetManageRequiredMixin, View):
+    """Batch scan ingestion. Accepts JSON {"codes": [...]} from scanners or the textarea form."""
+
+    def post(self, request, pk):
+        session = get_object_or_404(StocktakeSession.objects.select_related("campaign"), pk=pk)
+        if request.content_type == "application/json":
+            try:
+                codes = json.loads(request.body).get("codes")
+            except (ValueError, AttributeError):
+                codes = None
+            if not isinstance(codes, list):
+                return JsonResponse({"error": "Expected a JSON object with a 'codes' list."}, status=400)
+            try:
+                result = ingest_scans(session=session, codes=codes, actor=request.user)
+            except ValidationError as exc:
+                return JsonResponse({"error": exc.messages[0]}, status=400)
+            return JsonResponse(result)
+
+        form = StocktakeScanForm(request.POST)
+        if form.is_valid():
+            try:
+                result = ingest_scans(session=session, codes=form.cleaned_data["codes"], actor=request.user)
+            except ValidationError as exc:
+                messages.error(request, exc.messages[0])
+            else:
+                messages.success(request, f"{result['accepted']} codes recorded, {result['duplicates']} already scanned.")
+                if result["rejected"]:
+                    messages.error(request, f"{len(result['rejected'])} codes longer than {MAX_CODE_LENGTH} characters were not recorded.")
+        return redirect("assets:stocktake_session_detail", pk=session.pk)
+
+
+class StocktakeApplyCorrectionsView(AssetManageRequiredMixin, View):
+    def post(self, request, pk):
+        session = get_object_or_404(StocktakeSession.objects.select_related("campaign", "location"), pk=pk)
+        try:
+            moved = apply_location_corrections(session=session, actor=request.user)
+        except ValidationError as exc:
+            messages.error(request, exc.messages[0])
+        else:
+            messages.success(request, f"{moved} assets moved to {session.location}.")
+        return redirect("assets:stocktake_session_detail", pk=session.pk)
+
+
+class StocktakeSessionCloseView(AssetManageRequiredMixin, View):
+    def post(self, request, pk):
+        session = get_object_or_404(StocktakeSession, pk=pk)
+        close_session(session=session)
+        messages.success(request, "Stocktake session closed.")
+        return redirect("assets:stocktake_campaign_detail", pk=session.campaign_id)
+
+
+class AssetLabelSheetView(AssetViewRequiredMixin, View):
+    """Stream a Code 128 label sheet for a location, a category or an explicit id list."""
+
+    def get(self, request, *args, **kwargs):
+        ids = [int(value) for value in request.GET.get("ids", "").split(",") if value.strip().isdigit()]
+        filters = {}
+        for param in ("location", "category"):
+            value = request.GET.get(param, "").strip()
+            if value and not value.isdigit():
+                return HttpResponseBadRequest(f"Invalid {param} id.")
+            filters[f"{param}_id"] = int(value) if value else None
+        queryset = label_queryset(**filters, asset_ids=ids)
+        response = StreamingHttpResponse(iter_label_pdf(iter_labels(queryset)), content_type="application/pdf")
+        response["Content-Disposition"] = 'inline; filename="asset_labels.pdf"'
+        return response
+
+
+class DiscoveryIngestView(IntegrationTokenRequiredMixin, View):
+    """Batched hardware inventories from discovery agents: POST {"hosts": [...]} with a bearer token."""
+
+    token_scope = IntegrationToken.Scope.DISCOVERY
+
+    def post(self, request, *args, **kwargs):
+        try:
+            hosts = json.loads(request.body).get("hosts")
+        except (ValueError, AttributeError):
+            hosts = None
+        if not isinstance(hosts, list):
+            return JsonResponse({"error": "Expected a JSON object with a 'hosts' list."}, status=400)
+        try:
+            result = ingest_hardware_reports(hosts, source=f"Discovery ({self.integration_token.name})")
+        except ValidationError as exc:
+            return JsonResponse({"error": exc.messages[0]}, status=400)
+        return JsonResponse(result)
+
+
+class NetworkSearchView(AssetViewRequiredMixin, TemplateView):
+    template_name = "assets/network_search.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        subnet = self.request.GET.get("subnet", "").strip()
+        mac = self.request.GET.get("mac", "").strip()
+        ctx["subnet"] = subnet
+        ctx["mac"] = mac
+        ctx["rows"] = []
+        if subnet:
+            try:
+                ctx["rows"] = assets_in_subnet(subnet)
+            except ValueError:
+                ctx["error"] = f"{subnet} is not a valid subnet."
+        elif mac:
+            ctx["rows"] = assets_by_mac(mac)
+        if self.request.GET.get("duplicates"):
+            ctx["duplicates"] = duplicate_ips()
+        return ctx
@@ -17,10 +17,12 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "accounts",
     "core",
     "employees",
     "assets",
+    "api",
 ]
 
 MIDDLEWARE = [
@@ -30,6 +32,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.replica.RecentWriteMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -66,6 +69,20 @@ DATABASES = {
     }
 }
 
+# Optional streaming replica for reports, dashboards and exports (see core/replica.py).
+# In tests it mirrors the default database, so replica-routed views still see test data.
+REPLICA_DATABASE = ""
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    REPLICA_DATABASE = "replica"
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.replica.ReplicaRouter"]
+REPLICA_LAG_SECONDS = float(os.getenv("REPLICA_LAG_SECONDS", "5"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -88,3 +105,18 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "login"
+
+# Change feed readers only see rows older than this, so transactions still committing
+# with an earlier updated_at cannot be skipped by a cursor that has moved past them.
+CHANGE_FEED_SAFETY_LAG_SECONDS = int(os.getenv("CHANGE_FEED_SAFETY_LAG_SECONDS", "5"))
+
+# How process-local caches learn about changes made by other workers (see core/invalidation.py):
+# "auto" uses LISTEN/NOTIFY on PostgreSQL and the polled CacheVersion table elsewhere.
+CACHE_INVALIDATION = os.getenv("CACHE_INVALIDATION", "auto")
+CACHE_INVALIDATION_POLL_SECONDS = float(os.getenv("CACHE_INVALIDATION_POLL_SECONDS", "2"))
+
+# Serve the asset list, detail, kardex and report pages with their async variants (for ASGI deployments).
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False") == "True"
+
+# Typeahead lookups slower than this are cancelled by PostgreSQL and answered with no suggestions.
+TYPEAHEAD_STATEMENT_TIMEOUT_MS = int(os.getenv("TYPEAHEAD_STATEMENT_TIMEOUT_MS", "300"))
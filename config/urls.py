@@ -11,4 +11,5 @@ urlpatterns = [
     path("locations/", include("core.urls")),
     path("employees/", include("employees.urls")),
     path("assets/", include("assets.urls")),
+    path("api/v1/", include("api.urls")),
 ]
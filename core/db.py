@@ -0,0 +1,53 @@
+"""Database helpers shared by the apps."""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Aggregate
+
+
+@contextmanager
+def statement_timeout(milliseconds: int, using: str = DEFAULT_DB_ALIAS):
+    """Run the block in a transaction (or savepoint) where PostgreSQL cancels any statement slower than `milliseconds`.
+
+    A cancelled statement raises django.db.OperationalError. The previous timeout is restored
+    on the way out, so an enclosing transaction keeps its own setting.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT current_setting('statement_timeout'), set_config('statement_timeout', %s, true)",
+                [f"{int(milliseconds)}ms"],
+            )
+            previous = cursor.fetchone()[0]
+        yield
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+
+
+def reserve_ids(model, count: int, using: str = DEFAULT_DB_ALIAS) -> list[int]:
+    """Draw `count` primary keys from the model's PostgreSQL sequence, ascending.
+
+    Lets callers build rows that refer to their own id (or to each other) before one bulk insert.
+    Ids drawn by a transaction that later rolls back are simply skipped, as with any sequence.
+    """
+    if count <= 0:
+        return []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL `percentile_cont(fraction) WITHIN GROUP (ORDER BY expression)`; FILTER works as on other aggregates."""
+
+    function = "percentile_cont"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, fraction: float, **extra):
+        if not 0 <= fraction <= 1:
+            raise ValueError("fraction must be between 0 and 1.")
+        super().__init__(expression, fraction=float(fraction), **extra)
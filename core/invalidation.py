@@ -0,0 +1,188 @@
+"""Process-local caches kept coherent across workers.
+
+`publish()` is called from model signals. Once the surrounding transaction commits it
+evicts the local entries and tells the other workers: on PostgreSQL with a NOTIFY that each
+worker's listener thread turns into evictions, elsewhere by bumping a CacheVersion row that
+workers poll. A process that can neither listen nor poll (PostgreSQL without a running
+listener, e.g. management commands) does not cache at all, so it never serves stale data.
+"""
+import json
+import logging
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "inventory_cache_invalidation"
+
+_store: dict[str, dict] = {}
+# Bumped on every eviction (None counts evict_all), so a load that raced one is not stored.
+_generations: dict[str | None, int] = {}
+_lock = threading.Lock()
+_listener_ready = threading.Event()
+_listener_stop = threading.Event()
+_listener_thread = None
+_poll_state = {"checked_at": 0.0, "versions": None}
+_handlers = []
+
+
+def mode() -> str:
+    """Effective mode for this process: "notify", "poll" or "off"."""
+    configured = settings.CACHE_INVALIDATION
+    if configured == "auto":
+        configured = "notify" if connection.vendor == "postgresql" else "poll"
+    if configured == "notify" and not _listener_ready.is_set():
+        return "off"
+    return configured
+
+
+def cached(namespace: str, key, loader, *, max_entries: int | None = None):
+    """Return the local value for (namespace, key), computing it with `loader()` on a miss.
+
+    With `max_entries`, the namespace keeps only that many entries, dropping the least recently used.
+    A value whose namespace was evicted while `loader()` ran is returned but not stored.
+    """
+    current = mode()
+    if current == "off":
+        return loader()
+    if current == "poll":
+        _poll_versions()
+    with _lock:
+        bucket = _store.get(namespace, {})
+        if key in bucket:
+            if max_entries is not None:
+                bucket[key] = bucket.pop(key)
+            return bucket[key]
+        generation = _generation(namespace)
+    value = loader()
+    with _lock:
+        if _generation(namespace) != generation:
+            return value
+        bucket = _store.setdefault(namespace, {})
+        bucket[key] = value
+        while max_entries is not None and len(bucket) > max_entries:
+            bucket.pop(next(iter(bucket)))
+    return value
+
+
+def _generation(namespace: str) -> tuple[int, int]:
+    return _generations.get(None, 0), _generations.get(namespace, 0)
+
+
+def evict(namespace: str, key=None) -> None:
+    with _lock:
+        _generations[namespace] = _generations.get(namespace, 0) + 1
+        if key is None:
+            _store.pop(namespace, None)
+        else:
+            _store.get(namespace, {}).pop(key, None)
+    for handler in _handlers:
+        handler(namespace, key)
+
+
+def evict_all() -> None:
+    with _lock:
+        _generations[None] = _generations.get(None, 0) + 1
+    for namespace in list(_store):
+        evict(namespace)
+
+
+def on_evict(handler):
+    """Register `handler(namespace, key)` to run on every eviction, local or remote."""
+    _handlers.append(handler)
+    return handler
+
+
+def publish(namespace: str, key=None) -> None:
+    """Invalidate (namespace, key) in every worker once the current transaction commits."""
+    transaction.on_commit(partial(_send, namespace, None if key is None else str(key)))
+
+
+def _send(namespace: str, key) -> None:
+    evict(namespace, key)
+    configured = settings.CACHE_INVALIDATION
+    if configured == "off":
+        return
+    if configured == "notify" or (configured == "auto" and connection.vendor == "postgresql"):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, json.dumps({"ns": namespace, "key": key})])
+        return
+    from .models import CacheVersion
+
+    if not CacheVersion.objects.filter(namespace=namespace).update(version=F("version") + 1):
+        CacheVersion.objects.get_or_create(namespace=namespace)
+
+
+def _handle_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        namespace, key = message["ns"], message.get("key")
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed invalidation message %r", payload)
+        return
+    evict(namespace, key)
+
+
+def _poll_versions() -> None:
+    now = time.monotonic()
+    if now - _poll_state["checked_at"] < settings.CACHE_INVALIDATION_POLL_SECONDS:
+        return
+    from .models import CacheVersion
+
+    versions = dict(CacheVersion.objects.values_list("namespace", "version"))
+    previous = _poll_state["versions"]
+    _poll_state.update(checked_at=now, versions=versions)
+    if previous is None:
+        evict_all()
+        return
+    for namespace in set(versions) | set(previous):
+        if versions.get(namespace) != previous.get(namespace):
+            evict(namespace)
+
+
+def _listen() -> None:
+    while not _listener_stop.is_set():
+        conn = None
+        try:
+            conn = connections["default"].get_new_connection(connections["default"].get_connection_params())
+            conn.autocommit = True
+            conn.execute(f"LISTEN {CHANNEL}")
+            # Anything published while we were not listening is unknown: start from empty caches.
+            evict_all()
+            _listener_ready.set()
+            while not _listener_stop.is_set():
+                for notify in conn.notifies(timeout=1.0):
+                    _handle_notification(notify.payload)
+        except Exception:
+            logger.exception("Cache invalidation listener lost its connection; retrying")
+            _listener_ready.clear()
+            _listener_stop.wait(5)
+        finally:
+            _listener_ready.clear()
+            if conn is not None:
+                conn.close()
+
+
+def start_listener() -> None:
+    """Start this worker's LISTEN thread (PostgreSQL only). Called from the WSGI/ASGI entry points."""
+    global _listener_thread
+    if connection.vendor != "postgresql" or settings.CACHE_INVALIDATION not in {"auto", "notify"}:
+        return
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+    _listener_stop.clear()
+    _listener_thread = threading.Thread(target=_listen, name="cache-invalidation-listener", daemon=True)
+    _listener_thread.start()
+
+
+def stop_listener(timeout: float = 5.0) -> None:
+    global _listener_thread
+    _listener_stop.set()
+    if _listener_thread is not None:
+        _listener_thread.join(timeout)
+    _listener_thread = None
@@ -0,0 +1,88 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+def fetch(url: str, headers: dict, timeout: float) -> tuple[float, int | str]:
+    """GET `url` and read the whole body; return (seconds, status code or error)."""
+    started = time.perf_counter()
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            while response.read(65536):
+                pass
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    except (urllib.error.URLError, OSError) as exc:
+        status = str(getattr(exc, "reason", exc))
+    return time.perf_counter() - started, status
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Fire concurrent GET requests at a running server and report latency percentiles and throughput per endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Paths to request, e.g. /assets/ /assets/reports/assets.csv")
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per path.")
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--user", help="Username to log in as; a session is created for the run and removed afterwards.")
+        parser.add_argument("--token", help="Bearer token for API paths.")
+
+    def handle(self, *args, **options):
+        headers = {}
+        session = None
+        if options["user"]:
+            session = self._login(options["user"])
+            headers["Cookie"] = f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+        try:
+            for path in options["paths"]:
+                self._run(options["base_url"].rstrip("/") + path, headers, options)
+        finally:
+            if session is not None:
+                session.delete()
+
+    def _login(self, username):
+        user = get_user_model().objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f"Unknown user {username!r}.")
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session
+
+    def _run(self, url, headers, options):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(lambda _: fetch(url, headers, options["timeout"]), range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        latencies = [seconds for seconds, status in results if status == 200]
+        errors = len(results) - len(latencies)
+        if not latencies:
+            self.stdout.write(f"{url}: all {errors} requests failed (first: {results[0][1]})")
+            return
+        self.stdout.write(
+            f"{url}: {len(results) / elapsed:.1f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f} ms, "
+            f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, "
+            f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms, "
+            f"errors {errors}"
+        )
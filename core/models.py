@@ -73,3 +73,13 @@ class LocationUsage(TimeStampedModel):
 
     location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name="usages")
     note = models.CharField(max_length=120, default="seed reference")
+
+
+class CacheVersion(models.Model):
+    """Per-namespace counter polled by workers when LISTEN/NOTIFY is not available."""
+
+    namespace = models.CharField(max_length=60, unique=True)
+    version = models.BigIntegerField(default=1)
+
+    def __str__(self) -> str:
+        return f"{self.namespace} v{self.version}"
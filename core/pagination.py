@@ -0,0 +1,77 @@
+"""Keyset (seek) pagination: pages are fetched with `WHERE (ordering) > (cursor)` instead of OFFSET."""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision; DjangoJSONEncoder rounds datetimes to milliseconds."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(list(values), cls=CursorEncoder, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as exc:
+        raise ValidationError("Invalid cursor.") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError("Invalid cursor.")
+    return values
+
+
+def keyset_filter(ordering, values) -> Q:
+    """Rows strictly after `values` for `ordering`, e.g. ("-opened_at", "id") -> opened_at < a OR (opened_at = a AND id > b)."""
+    q = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        op = "lt" if field.startswith("-") else "gt"
+        q |= equal & Q(**{f"{name}__{op}": value})
+        equal &= Q(**{name: value})
+    return q
+
+
+def keyset_after(queryset, ordering, cursor: str):
+    """`queryset` narrowed to the rows after `cursor`. Raises ValidationError when the cursor does not fit `ordering`."""
+    values = decode_cursor(cursor, len(ordering))
+    try:
+        return queryset.filter(keyset_filter(ordering, values))
+    except (ValueError, TypeError) as exc:
+        # Well-formed JSON with values of the wrong type, e.g. ["abc"] for an integer id.
+        raise ValidationError("Invalid cursor.") from exc
+
+
+def _key(row, ordering):
+    names = [field.lstrip("-") for field in ordering]
+    if isinstance(row, dict):
+        return [row[name] for name in names]
+    return [getattr(row, name) for name in names]
+
+
+def paginate_keyset(queryset, *, ordering, cursor: str = "", limit: int = 50):
+    """Return (rows, next_cursor). `ordering` must end with a unique field so the order is total.
+
+    Works for model and `values()` querysets; the ordering fields must be present in each row.
+    """
+    ordering = tuple(ordering)
+    qs = queryset.order_by(*ordering)
+    if cursor:
+        qs = keyset_after(qs, ordering, cursor)
+    rows = list(qs[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(_key(rows[-1], ordering))
@@ -0,0 +1,106 @@
+"""Opt-in routing of read-only views to a replica database.
+
+Views wrapped with `ReplicaReadMixin` / `replica_view` send their reads to
+settings.REPLICA_DATABASE. A session that wrote something within the last
+REPLICA_LAG_SECONDS keeps reading from the primary, so users always see their own changes.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+LAST_WRITE_SESSION_KEY = "db_last_write_at"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
+# Sessions, users and roles must never lag behind a login or a permission change.
+PRIMARY_ONLY_APPS = {"auth", "sessions", "contenttypes"}
+
+_reading_from_replica = contextvars.ContextVar("reading_from_replica", default=False)
+
+
+def replica_alias() -> str:
+    return settings.REPLICA_DATABASE
+
+
+def wrote_recently(request) -> bool:
+    session = getattr(request, "session", None)
+    last_write = session.get(LAST_WRITE_SESSION_KEY) if session is not None else None
+    return last_write is not None and time.time() - last_write < settings.REPLICA_LAG_SECONDS
+
+
+@contextmanager
+def use_replica(request=None):
+    enabled = bool(replica_alias()) and not (request is not None and wrote_recently(request))
+    token = _reading_from_replica.set(enabled)
+    try:
+        yield enabled
+    finally:
+        _reading_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if alias and _reading_from_replica.get() and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin:
+    """Run the view, including template rendering, with reads routed to the replica. Only for views that do not write."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch(request, *args, **kwargs)
+        with use_replica(request):
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return response
+
+    async def _adispatch(self, request, *args, **kwargs):
+        session = getattr(request, "session", None)
+        if session is not None:
+            # Load the session up front; wrote_recently() then reads it without touching the database.
+            await session.aget(LAST_WRITE_SESSION_KEY)
+        with use_replica(request):
+            response = await super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                await sync_to_async(response.render)()
+        return response
+
+
+def replica_view(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with use_replica(request):
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return response
+
+    return wrapper
+
+
+class RecentWriteMiddleware:
+    """Stamp the session after a successful unsafe request so the lag window applies to it."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if replica_alias() and request.method not in SAFE_METHODS and response.status_code < 400 and hasattr(request, "session"):
+            request.session[LAST_WRITE_SESSION_KEY] = time.time()
+        return response
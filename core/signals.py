@@ -0,0 +1,52 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .invalidation import publish
+from .models import AssignmentReason, Category, Location, Status
+
+CATALOG_MODELS = (Category, Location, Status, AssignmentReason)
+
+
+def _catalog_changed(sender, **kwargs):
+    publish("catalogs", sender._meta.label_lower)
+
+
+def _employee_changed(sender, instance, **kwargs):
+    publish("employees", instance.pk)
+
+
+def _asset_changed(sender, instance, **kwargs):
+    publish("assets", instance.pk)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(_catalog_changed, sender=model, dispatch_uid=f"invalidate_{model._meta.label_lower}_save")
+    post_delete.connect(_catalog_changed, sender=model, dispatch_uid=f"invalidate_{model._meta.label_lower}_delete")
+for signal in (post_save, post_delete):
+    signal.connect(_employee_changed, sender="employees.Employee", dispatch_uid=f"invalidate_employee_{signal is post_save}")
+    signal.connect(_asset_changed, sender="assets.Asset", dispatch_uid=f"invalidate_asset_{signal is post_save}")
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def _group_membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        publish("roles", instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            publish("roles", user_id)
+    else:
+        publish("roles")
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Group)
+def _group_changed(sender, **kwargs):
+    publish("roles")
+
+
+@receiver(post_delete, sender=User)
+def _user_deleted(sender, instance, **kwargs):
+    publish("roles", instance.pk)
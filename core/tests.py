@@ -1,9 +1,30 @@
-from django.test import TestCase
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth.models import Group, User
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import skipUnless
 
 from employees.models import Employee
 
 from assets.models import Asset
-from .models import Category, Location, LocationUsage, Status
+from accounts.roles import is_admin
+
+from . import invalidation
+from .db import statement_timeout
+from .models import CacheVersion, Category, Location, LocationUsage, Status
+from .replica import LAST_WRITE_SESSION_KEY, RecentWriteMiddleware, ReplicaRouter, use_replica
+from .pagination import encode_cursor, paginate_keyset
 
 
 class LocationDeleteSafetyTests(TestCase):
@@ -41,3 +62,177 @@ class LocationDeleteSafetyTests(TestCase):
 
         self.assertFalse(was_deleted)
         self.assertFalse(self.location.is_active)
+
+
+class KeysetPaginationTests(TestCase):
+    def test_descending_pages_cover_every_row_once(self):
+        for index, site in enumerate(["B", "A", "B", "C", "A"]):
+            Location.objects.create(site=site, type="ROOM", exact_name=f"Room {index}")
+        seen, cursor = [], ""
+        while True:
+            rows, cursor = paginate_keyset(Location.objects.values("id", "site"), ordering=("-site", "id"), cursor=cursor, limit=2)
+            seen += [(row["site"], row["id"]) for row in rows]
+            if cursor is None:
+                break
+        self.assertEqual(seen, sorted(seen, key=lambda pair: (-ord(pair[0]), pair[1])))
+        self.assertEqual(len(seen), 5)
+
+    def test_cursor_values_of_the_wrong_type_are_invalid(self):
+        for values in (["abc"], [None], [[1]]):
+            cursor = encode_cursor(values)
+            with self.assertRaisesMessage(ValidationError, "Invalid cursor."):
+                paginate_keyset(Location.objects.all(), ordering=("id",), cursor=cursor)
+
+
+def reset_local_caches():
+    invalidation._store.clear()
+    invalidation._poll_state.update(checked_at=0.0, versions=None)
+
+
+@override_settings(CACHE_INVALIDATION="poll", CACHE_INVALIDATION_POLL_SECONDS=0)
+class InvalidationBusTests(TestCase):
+    def setUp(self):
+        reset_local_caches()
+        self.addCleanup(reset_local_caches)
+
+    def test_committed_group_change_reaches_polling_workers(self):
+        user = User.objects.create_user("tech", password="x")
+        admins = Group.objects.create(name="ADMIN")
+        self.assertFalse(is_admin(user))
+        with self.captureOnCommitCallbacks(execute=True):
+            user.groups.add(admins)
+        self.assertTrue(CacheVersion.objects.filter(namespace="roles").exists())
+        self.assertTrue(is_admin(user))
+
+    def test_bounded_namespace_drops_least_recently_used(self):
+        for key in ("a", "b", "c"):
+            invalidation.cached("typeahead", key, lambda k=key: k, max_entries=2)
+            if key == "b":
+                invalidation.cached("typeahead", "a", lambda: "reloaded", max_entries=2)
+        self.assertEqual(invalidation._store["typeahead"], {"a": "a", "c": "c"})
+
+    def test_notification_evicts_only_the_named_key(self):
+        loads = []
+        for key in ("1", "2"):
+            invalidation.cached("employees", key, lambda k=key: loads.append(k))
+        invalidation._handle_notification(json.dumps({"ns": "employees", "key": "1"}))
+        with self.settings(CACHE_INVALIDATION_POLL_SECONDS=3600):
+            for key in ("1", "2"):
+                invalidation.cached("employees", key, lambda k=key: loads.append(k))
+        self.assertEqual(loads, ["1", "2", "1"])
+
+    def test_value_loaded_across_an_eviction_is_not_stored(self):
+        def load_while_evicted():
+            invalidation.evict("employees")
+            return "stale"
+
+        with self.settings(CACHE_INVALIDATION_POLL_SECONDS=3600):
+            self.assertEqual(invalidation.cached("employees", "1", load_while_evicted), "stale")
+            self.assertEqual(invalidation.cached("employees", "1", lambda: "fresh"), "fresh")
+            self.assertEqual(invalidation.cached("employees", "1", lambda: "unused"), "fresh")
+
+
+@override_settings(CACHE_INVALIDATION="notify")
+class InvalidationListenerTests(TransactionTestCase):
+    def test_listener_evicts_on_notify(self):
+        reset_local_caches()
+        evicted = threading.Event()
+        handler = invalidation.on_evict(lambda namespace, key: namespace == "catalogs" and evicted.set())
+        self.addCleanup(invalidation._handlers.remove, handler)
+        invalidation.start_listener()
+        self.addCleanup(invalidation.stop_listener)
+        self.assertTrue(invalidation._listener_ready.wait(5))
+
+        invalidation.cached("catalogs", "core.category", lambda: ["CPU"])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [invalidation.CHANNEL, json.dumps({"ns": "catalogs", "key": "core.category"})])
+        self.assertTrue(evicted.wait(5))
+        self.assertNotIn("core.category", invalidation._store.get("catalogs", {}))
+
+
+class StatementTimeoutTests(TestCase):
+    def _current(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            return cursor.fetchone()[0]
+
+    def test_slow_statement_is_cancelled_and_setting_restored(self):
+        before = self._current()
+        with self.assertRaises(OperationalError):
+            with statement_timeout(50):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_sleep(2)")
+        with statement_timeout(1000):
+            self.assertEqual(self._current(), "1s")
+        self.assertEqual(self._current(), before)
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class ReplicaRoutingTests(TestCase):
+    def _request(self, method="get", last_write=None):
+        request = getattr(RequestFactory(), method)("/")
+        request.session = {} if last_write is None else {LAST_WRITE_SESSION_KEY: last_write}
+        return request
+
+    def test_reads_go_to_replica_only_inside_opt_in_block(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Location))
+        with use_replica(self._request()):
+            self.assertEqual(router.db_for_read(Location), "replica")
+            self.assertEqual(router.db_for_write(Location), "default")
+            self.assertIsNone(router.db_for_read(User))
+
+    def test_recent_write_pins_session_to_primary(self):
+        request = self._request("post")
+        RecentWriteMiddleware(lambda r: HttpResponse(status=302))(request)
+        with use_replica(request):
+            self.assertIsNone(ReplicaRouter().db_for_read(Location))
+        with use_replica(self._request(last_write=time.time() - settings.REPLICA_LAG_SECONDS - 1)):
+            self.assertEqual(ReplicaRouter().db_for_read(Location), "replica")
+
+
+@skipUnless(settings.REPLICA_DATABASE, "Set POSTGRES_REPLICA_HOST to run against a replica alias.")
+class ReplicaDatabaseTests(TestCase):
+    databases = {"default", settings.REPLICA_DATABASE or "default"}
+
+    def test_dashboard_reads_from_replica(self):
+        admin = User.objects.create_superuser("root", password="x")
+        self.client.force_login(admin)
+        with CaptureQueriesContext(connections[settings.REPLICA_DATABASE]) as replica_queries:
+            self.assertEqual(self.client.get("/assets/dashboard/").status_code, 200)
+        self.assertTrue(replica_queries.captured_queries)
+
+
+class BenchmarkEndpointsTests(TestCase):
+    def test_reports_latency_with_a_temporary_session(self):
+        User.objects.create_user("bench", password="x")
+        cookies = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                cookies.append(self.headers.get("Cookie", ""))
+                self.send_response(200 if self.path == "/ok/" else 500)
+                self.end_headers()
+                self.wfile.write(b"body")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        out = io.StringIO()
+        try:
+            call_command(
+                "benchmark_endpoints", "/ok/", "/broken/",
+                base_url=f"http://127.0.0.1:{server.server_port}", concurrency=4, requests=8, user="bench", stdout=out,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        lines = out.getvalue().splitlines()
+        self.assertIn("/ok/: ", lines[0])
+        self.assertTrue(lines[0].endswith("errors 0"))
+        self.assertIn("all 8 requests failed", lines[1])
+        self.assertEqual(len(cookies), 16)
+        self.assertTrue(all(cookie.startswith(f"{settings.SESSION_COOKIE_NAME}=") for cookie in cookies))
+        self.assertFalse(Session.objects.exists())
@@ -0,0 +1,37 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.sync import sync_employees
+
+
+class Command(BaseCommand):
+    help = "Sync employees from the HR staff CSV (dni, first_name, last_name, worker_type, email, phone), deactivating missing DNIs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV export with a header row.")
+        parser.add_argument("--dry-run", action="store_true", help="Report the changes without writing them.")
+        parser.add_argument(
+            "--max-deactivation-ratio",
+            type=float,
+            default=0.1,
+            help="Refuse to run when more than this fraction of active employees would be deactivated (default 0.1).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as fh:
+                result = sync_employees(fh, dry_run=options["dry_run"], max_deactivation_ratio=options["max_deactivation_ratio"])
+        except ValidationError as exc:
+            raise CommandError(exc.messages[0])
+        for error in result["errors"]:
+            self.stderr.write(error)
+        for asset in result["orphaned_assets"]:
+            code = asset["control_patrimonial"] or asset["asset_tag_internal"] or f"Asset-{asset['id']}"
+            self.stdout.write(f"INACTIVE RESPONSIBLE {asset['responsible_employee__dni']}: asset {asset['id']} {code}")
+        prefix = "Dry run: " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}created {result['created']}, updated {result['updated']}, deactivated {result['deactivated']}, "
+                f"unchanged {result['unchanged']}, rejected rows {len(result['errors'])}"
+            )
+        )
@@ -1,4 +1,32 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Upper
+
+
+class EmployeeQuerySet(models.QuerySet):
+    def search(self, text: str):
+        """Digits match a DNI prefix; words must each appear in the first or last name."""
+        text = text.strip()
+        if not text:
+            return self
+        if text.isdigit():
+            return self.filter(dni__startswith=text)
+        qs = self.annotate(first_upper=Upper("first_name"), last_upper=Upper("last_name"))
+        for word in text.upper().split():
+            qs = qs.filter(Q(first_upper__contains=word) | Q(last_upper__contains=word))
+        return qs
+
+    def with_holding_counts(self):
+        """Annotate responsible_count and assigned_count with correlated subqueries, in the same query."""
+        Asset = apps.get_model("assets", "Asset")
+        AssetAssignment = apps.get_model("assets", "AssetAssignment")
+        responsible = Asset.objects.filter(responsible_employee=OuterRef("pk")).order_by().values("responsible_employee")
+        assigned = AssetAssignment.objects.filter(assigned_employee=OuterRef("pk"), is_current=True).order_by().values("assigned_employee")
+        return self.annotate(
+            responsible_count=Coalesce(Subquery(responsible.annotate(n=Count("*")).values("n"), output_field=IntegerField()), 0),
+            assigned_count=Coalesce(Subquery(assigned.annotate(n=Count("*")).values("n"), output_field=IntegerField()), 0),
+        )
 
 
 class Employee(models.Model):
@@ -18,8 +46,16 @@ class Employee(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EmployeeQuerySet.as_manager()
+
     class Meta:
         ordering = ["last_name", "first_name"]
+        # Name search is backed by trigram indexes on UPPER(first_name) / UPPER(last_name),
+        # created in migration 0002 only where the pg_trgm extension is available.
+        indexes = [
+            models.Index(fields=["dni"], opclasses=["varchar_pattern_ops"], name="employee_dni_prefix_idx"),
+            models.Index(fields=["last_name", "first_name", "id"], name="employee_name_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}".strip()
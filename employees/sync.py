@@ -0,0 +1,127 @@
+"""Bulk employee sync from the HR staff export, keyed by DNI.
+
+Incoming rows are compared with the stored ones through a hash of the synced fields, so only
+new, changed, reactivated and missing employees are written, in batches. Bulk writes skip
+model signals, so the "employees" cache namespace is invalidated explicitly.
+"""
+import csv
+import hashlib
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+
+from core.invalidation import publish
+
+from .models import Employee
+
+SYNC_FIELDS = ("first_name", "last_name", "worker_type", "email", "phone")
+REQUIRED_COLUMNS = {"dni", "first_name", "last_name", "worker_type"}
+BATCH_SIZE = 1000
+WORKER_TYPES = set(Employee.WorkerType.values)
+MAX_LENGTHS = {field: Employee._meta.get_field(field).max_length for field in ("first_name", "last_name", "email", "phone")}
+
+
+def row_hash(values: dict) -> str:
+    return hashlib.sha1("\x1f".join(values[field] for field in SYNC_FIELDS).encode()).hexdigest()
+
+
+def _field_error(row: dict) -> str:
+    """Why the row would not fit the Employee columns, or "" when it does; bulk writes skip model validation."""
+    for field, max_length in MAX_LENGTHS.items():
+        if len(row[field]) > max_length:
+            return f"{field} longer than {max_length} characters"
+    if row["email"]:
+        try:
+            validate_email(row["email"])
+        except ValidationError:
+            return f"invalid email {row['email']!r}"
+    return ""
+
+
+def read_staff_csv(lines):
+    """Yield (line_number, row, error) for each data row of the export; row is None when invalid."""
+    reader = csv.DictReader(lines)
+    missing = REQUIRED_COLUMNS - set(reader.fieldnames or ())
+    if missing:
+        raise ValidationError(f"Missing columns: {', '.join(sorted(missing))}.")
+    for raw in reader:
+        line = reader.line_num
+        dni = (raw.get("dni") or "").strip()
+        row = {field: (raw.get(field) or "").strip() for field in SYNC_FIELDS}
+        row["worker_type"] = row["worker_type"].upper()
+        if not (dni.isdigit() and len(dni) == 8):
+            yield line, None, f"invalid DNI {dni!r}"
+        elif not row["first_name"] or not row["last_name"]:
+            yield line, None, "first and last name are required"
+        elif row["worker_type"] not in WORKER_TYPES:
+            yield line, None, f"unknown worker type {row['worker_type']!r}"
+        elif error := _field_error(row):
+            yield line, None, error
+        else:
+            yield line, {"dni": dni, **row}, ""
+
+
+def sync_employees(lines, *, dry_run: bool = False, max_deactivation_ratio: float = 0.1) -> dict:
+    """Apply the export to Employee and return counts, row errors and assets left with an inactive responsible.
+
+    Employees missing from the export are deactivated, never deleted. A run that would
+    deactivate more than `max_deactivation_ratio` of the active staff is refused, since that
+    usually means a truncated export.
+    """
+    incoming = {}
+    errors = []
+    for line, row, error in read_staff_csv(lines):
+        if row is None:
+            errors.append(f"line {line}: {error}")
+        elif row["dni"] in incoming:
+            errors.append(f"line {line}: duplicate DNI {row['dni']}")
+        else:
+            incoming[row["dni"]] = row
+
+    to_update, to_deactivate = [], []
+    unchanged = 0
+    now = timezone.now()
+    for pk, dni, is_active, *values in Employee.objects.order_by().values_list("id", "dni", "is_active", *SYNC_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        row = incoming.pop(dni, None)
+        if row is None:
+            if is_active:
+                to_deactivate.append(pk)
+            continue
+        if is_active and row_hash(row) == row_hash(dict(zip(SYNC_FIELDS, values))):
+            unchanged += 1
+            continue
+        to_update.append(Employee(pk=pk, is_active=True, updated_at=now, **{field: row[field] for field in SYNC_FIELDS}))
+    to_create = [Employee(**row) for row in incoming.values()]
+
+    active_count = unchanged + len(to_update) + len(to_deactivate)
+    if to_deactivate and len(to_deactivate) > max_deactivation_ratio * active_count:
+        raise ValidationError(
+            f"Refusing to deactivate {len(to_deactivate)} of {active_count} employees; check the export or raise the limit."
+        )
+
+    if not dry_run:
+        with transaction.atomic():
+            Employee.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+            Employee.objects.bulk_update(to_update, [*SYNC_FIELDS, "is_active", "updated_at"], batch_size=BATCH_SIZE)
+            for start in range(0, len(to_deactivate), BATCH_SIZE):
+                Employee.objects.filter(pk__in=to_deactivate[start : start + BATCH_SIZE]).update(is_active=False, updated_at=now)
+            if to_create or to_update or to_deactivate:
+                publish("employees")
+
+    Asset = apps.get_model("assets", "Asset")
+    orphaned = list(
+        Asset.objects.filter(responsible_employee_id__in=to_deactivate)
+        .order_by("responsible_employee__dni", "id")
+        .values("id", "asset_tag_internal", "control_patrimonial", "responsible_employee__dni")
+    )
+    return {
+        "created": len(to_create),
+        "updated": len(to_update),
+        "deactivated": len(to_deactivate),
+        "unchanged": unchanged,
+        "errors": errors,
+        "orphaned_assets": orphaned,
+    }
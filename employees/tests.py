@@ -1,7 +1,22 @@
-from django.db import IntegrityError
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from assets.models import Asset
+from assets.services import assign_asset
+from core.models import AssignmentReason, Category, Location, Status
 
 from .models import Employee
+from .sync import sync_employees
+from .views import EmployeeListView
 
 
 class EmployeeModelTests(TestCase):
@@ -9,3 +24,107 @@ class EmployeeModelTests(TestCase):
         Employee.objects.create(dni="12345678", first_name="A", last_name="B", worker_type="CAS")
         with self.assertRaises(IntegrityError):
             Employee.objects.create(dni="12345678", first_name="C", last_name="D", worker_type="NOMBRADO")
+
+
+class EmployeeDirectoryTests(TestCase):
+    def setUp(self):
+        self.ana = Employee.objects.create(dni="40112233", first_name="Ana", last_name="Rios", worker_type="CAS")
+        self.juan = Employee.objects.create(dni="40119999", first_name="Juan", last_name="Riofrio", worker_type="NOMBRADO")
+        self.luz = Employee.objects.create(dni="70000001", first_name="Luz", last_name="Ana", worker_type="CAS")
+        category = Category.objects.create(name="Laptop")
+        location = Location.objects.create(site="Main", floor="1", type="OFFICE", exact_name="HR")
+        status = Status.objects.create(name="Operational")
+        self.assets = [
+            Asset.objects.create(category=category, location=location, status=status, responsible_employee=self.ana, asset_tag_internal=f"INT-EMP-{index}")
+            for index in range(2)
+        ]
+        assign_asset(asset=self.assets[1], assigned_employee=self.juan, reason=AssignmentReason.objects.create(name="New hire"))
+        admin = User.objects.create_user("hr", password="x")
+        admin.groups.add(Group.objects.create(name="ADMIN"))
+        self.client.force_login(admin)
+
+    def test_search_by_dni_prefix_and_name_words(self):
+        self.assertEqual(list(Employee.objects.search("4011")), [self.juan, self.ana])
+        self.assertEqual(list(Employee.objects.search("rio")), [self.juan, self.ana])
+        self.assertEqual(list(Employee.objects.search("ana RIOS")), [self.ana])
+        self.assertEqual(list(Employee.objects.search("ana")), [self.luz, self.ana])
+
+    def test_directory_pages_with_holding_counts(self):
+        with mock.patch.object(EmployeeListView, "page_size", 2):
+            first = self.client.get("/employees/")
+            self.assertEqual([(e.dni, e.responsible_count, e.assigned_count) for e in first.context["employees"]], [("70000001", 0, 0), ("40119999", 0, 1)])
+            second = self.client.get(f"/employees/?after={first.context['next_cursor']}")
+        self.assertEqual([(e.dni, e.responsible_count) for e in second.context["employees"]], [("40112233", 2)])
+        self.assertIsNone(second.context["next_cursor"])
+        self.assertEqual(self.client.get("/employees/?after=bogus").context["employees"], [])
+
+    def test_holdings_page_reads_assets_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/employees/{self.juan.pk}/holdings/")
+        self.assertEqual([asset.pk for asset in response.context["assigned_assets"]], [self.assets[1].pk])
+        self.assertEqual(response.context["responsible_assets"], [])
+        self.assertEqual(len([q for q in queries.captured_queries if 'FROM "assets_asset"' in q["sql"]]), 1)
+        ana = self.client.get(f"/employees/{self.ana.pk}/holdings/")
+        self.assertEqual(len(ana.context["responsible_assets"]), 2)
+
+
+class EmployeeSyncTests(TestCase):
+    header = "dni,first_name,last_name,worker_type,email,phone\n"
+
+    def _csv(self, *rows):
+        return io.StringIO(self.header + "".join(row + "\n" for row in rows))
+
+    def test_only_differences_are_written(self):
+        staff = [f"5000000{index},Name{index},Last{index},CAS,," for index in range(10)]
+        result = sync_employees(self._csv(*staff))
+        self.assertEqual((result["created"], result["updated"], result["deactivated"]), (10, 0, 0))
+
+        leaving = Employee.objects.get(dni="50000009")
+        asset = Asset.objects.create(
+            category=Category.objects.create(name="CPU"),
+            location=Location.objects.create(site="Main", floor="1", type="ROOM", exact_name="Ops"),
+            status=Status.objects.create(name="Operational"),
+            responsible_employee=leaving,
+            asset_tag_internal="INT-SYNC-1",
+        )
+        staff[0] = "50000000,Name0,Changed,nombrado,,"
+        with self.assertNumQueries(7):
+            result = sync_employees(self._csv(*staff[:9], "50000010,New,Hire,LOCADOR,new@example.com,", "123,Bad,Row,CAS,,"))
+        self.assertEqual((result["created"], result["updated"], result["deactivated"], result["unchanged"]), (1, 1, 1, 8))
+        self.assertEqual(result["errors"], ["line 12: invalid DNI '123'"])
+        self.assertEqual([row["id"] for row in result["orphaned_assets"]], [asset.id])
+        self.assertEqual(Employee.objects.get(dni="50000000").worker_type, Employee.WorkerType.NOMBRADO)
+        self.assertFalse(Employee.objects.get(dni="50000009").is_active)
+
+    def test_rows_that_do_not_fit_the_columns_are_reported(self):
+        result = sync_employees(
+            self._csv(
+                "70000000,Ana,Ok,CAS,ana@example.com,999111222",
+                f"70000001,{'N' * 101},Long,CAS,,",
+                "70000002,Luis,Phone,CAS,,+51 999 111 222 333 444",
+                "70000003,Rosa,Mail,CAS,not-an-email,",
+            )
+        )
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(
+            result["errors"],
+            [
+                "line 3: first_name longer than 100 characters",
+                "line 4: phone longer than 20 characters",
+                "line 5: invalid email 'not-an-email'",
+            ],
+        )
+        self.assertEqual(list(Employee.objects.values_list("dni", flat=True)), ["70000000"])
+
+    def test_command_refuses_truncated_export(self):
+        for index in range(5):
+            Employee.objects.create(dni=f"6000000{index}", first_name="A", last_name="B", worker_type="CAS")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "staff.csv"
+            path.write_text(self.header + "60000000,A,B,CAS,,\n", encoding="utf-8")
+            with self.assertRaises(CommandError):
+                call_command("sync_employees", str(path), stdout=io.StringIO())
+            out = io.StringIO()
+            call_command("sync_employees", str(path), "--max-deactivation-ratio=1", "--dry-run", stdout=out)
+        self.assertIn("Dry run: created 0, updated 0, deactivated 4, unchanged 1", out.getvalue())
+        self.assertEqual(Employee.objects.filter(is_active=True).count(), 5)
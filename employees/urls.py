@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import EmployeeCreateView, EmployeeListView, EmployeeUpdateView
+from .views import EmployeeCreateView, EmployeeHoldingsView, EmployeeListView, EmployeeUpdateView
 
 app_name = "employees"
 
@@ -8,4 +8,5 @@ urlpatterns = [
     path("", EmployeeListView.as_view(), name="employee_list"),
     path("create/", EmployeeCreateView.as_view(), name="employee_create"),
     path("<int:pk>/edit/", EmployeeUpdateView.as_view(), name="employee_edit"),
+    path("<int:pk>/holdings/", EmployeeHoldingsView.as_view(), name="employee_holdings"),
 ]
@@ -1,16 +1,51 @@
+from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, ListView, UpdateView
+from django.views.generic import CreateView, DetailView, TemplateView, UpdateView
 
 from accounts.mixins import AdminRequiredMixin
+from assets.offboarding import holdings_queryset
+from core.pagination import paginate_keyset
 
 from .forms import EmployeeForm
 from .models import Employee
 
+DIRECTORY_ORDERING = ("last_name", "first_name", "id")
+
+
+class EmployeeListView(AdminRequiredMixin, TemplateView):
+    """Employee directory: DNI-prefix or name search, keyset pages, holdings counted in the same query."""
 
-class EmployeeListView(AdminRequiredMixin, ListView):
-    model = Employee
     template_name = "employees/employee_list.html"
-    context_object_name = "employees"
+    page_size = 50
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        query = self.request.GET.get("q", "").strip()
+        qs = Employee.objects.search(query).with_holding_counts()
+        try:
+            employees, next_cursor = paginate_keyset(qs, ordering=DIRECTORY_ORDERING, cursor=self.request.GET.get("after", ""), limit=self.page_size)
+        except ValidationError as exc:
+            messages.error(self.request, exc.messages[0])
+            employees, next_cursor = [], None
+        ctx.update(employees=employees, next_cursor=next_cursor, query=query, is_first_page=not self.request.GET.get("after"))
+        return ctx
+
+
+class EmployeeHoldingsView(AdminRequiredMixin, DetailView):
+    """Everything an employee is responsible for or currently holds: one query for the employee, one for the assets."""
+
+    model = Employee
+    template_name = "employees/employee_holdings.html"
+    context_object_name = "employee"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        employee = self.object
+        holdings = list(holdings_queryset(employee))
+        ctx["responsible_assets"] = [asset for asset in holdings if asset.responsible_employee_id == employee.pk]
+        ctx["assigned_assets"] = [asset for asset in holdings if asset.assigned_since is not None]
+        return ctx
 
 
 class EmployeeCreateView(AdminRequiredMixin, CreateView):